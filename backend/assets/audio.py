@@ -0,0 +1,483 @@
+"""
+Armado de pistas de audio (MP3) para las cards.
+
+Una pista se arma con las partes en MEDIA_SOURCE_ROOT/<perfil>/<codigo>/
+ordenadas por nombre (ej: 00_voice.mp3, 01_example_0.mp3) y se escribe en
+MEDIA_ROOT/<perfil>/<codigo>.mp3, la misma ruta que usa `voice_url`.
+
+Cuando las partes son compatibles (mismo MPEG, layer, sample rate y canales)
+se copian sus frames uno detras de otro, sin decodificar: el costo es
+lineal en el tamano total. Si no lo son y pydub esta instalado, se
+decodifican y se vuelven a codificar una sola vez.
+
+El manifest 'tracks' guarda el hash de las partes y la duracion de cada
+pista; las pistas cuyas partes no cambiaron se omiten.
+
+El manifest 'audio' es el indice de todos los MP3 publicados en MEDIA_ROOT
+(duracion, frames, bitrate), leido de los headers y cacheado por hash.
+"""
+
+import hashlib
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+from assets.manifests import file_hash, load_manifest, save_manifest
+
+try:
+    # Opcional: solo se usa cuando las partes no se pueden unir por frames
+    from pydub import AudioSegment
+except ImportError:
+    AudioSegment = None
+
+
+# Directorios relativos con pistas armadas a partir de partes
+TRACK_PROFILES = (
+    'cards/basic_cards/audios',
+)
+
+# Directorios de MEDIA_ROOT que se indexan
+AUDIO_DIRS = (
+    'cards/basic_cards/audios',
+)
+
+# Solo MPEG Layer III
+BITRATES = {
+    'mpeg1': (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    'mpeg2': (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+SAMPLE_RATES = {
+    3: ('mpeg1', (44100, 48000, 32000)),
+    2: ('mpeg2', (22050, 24000, 16000)),
+    0: ('mpeg2.5', (11025, 12000, 8000)),
+}
+
+Frame = namedtuple('Frame', ['offset', 'length', 'version', 'bitrate', 'sample_rate', 'channels', 'samples'])
+
+
+def parse_frame_header(data, offset):
+    """
+    Lee el header de 4 bytes de un frame MPEG Layer III.
+
+    Returns:
+    Frame: o None si en `offset` no hay un header valido.
+    """
+    if offset + 4 > len(data):
+        return None
+
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or b1 & 0xE0 != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+
+    if version_bits not in SAMPLE_RATES or layer_bits != 1:
+        return None
+    if bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    version, rates = SAMPLE_RATES[version_bits]
+    sample_rate = rates[rate_index]
+    bitrate = BITRATES['mpeg1' if version == 'mpeg1' else 'mpeg2'][bitrate_index]
+    samples = 1152 if version == 'mpeg1' else 576
+    padding = (b2 >> 1) & 0x01
+    length = samples // 8 * bitrate * 1000 // sample_rate + padding
+    channels = 1 if b3 >> 6 == 3 else 2
+
+    return Frame(offset, length, version, bitrate, sample_rate, channels, samples)
+
+
+def audio_start(data):
+    # Salta el tag ID3v2 (10 bytes de header + tamano synchsafe + footer)
+    if data[:3] != b'ID3' or len(data) < 10:
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def audio_end(data):
+    # El tag ID3v1 ocupa los ultimos 128 bytes
+    if len(data) >= 128 and data[-128:-125] == b'TAG':
+        return len(data) - 128
+    return len(data)
+
+
+def vbr_header(data, frame):
+    """
+    Busca un header Xing/Info (o VBRI) dentro del primer frame.
+
+    Returns:
+    tuple: (tag, frames totales o None), o None si el frame es audio.
+    """
+    if frame.version == 'mpeg1':
+        side_info = 17 if frame.channels == 1 else 32
+    else:
+        side_info = 9 if frame.channels == 1 else 17
+
+    start = frame.offset + 4 + side_info
+    tag = bytes(data[start:start + 4])
+    if tag in (b'Xing', b'Info'):
+        flags = int.from_bytes(data[start + 4:start + 8], 'big')
+        total = int.from_bytes(data[start + 8:start + 12], 'big') if flags & 0x01 else None
+        return tag.decode(), total
+
+    start = frame.offset + 36
+    if bytes(data[start:start + 4]) == b'VBRI':
+        return 'VBRI', int.from_bytes(data[start + 14:start + 18], 'big')
+
+    return None
+
+
+def iter_frames(data):
+    """
+    Recorre los frames de audio de un MP3 leyendo solo sus headers. Omite
+    los tags ID3 y el frame Xing/Info/VBRI, y se resincroniza si encuentra
+    basura entre frames.
+    """
+    offset = audio_start(data)
+    end = audio_end(data)
+    first = True
+
+    while offset < end:
+        frame = parse_frame_header(data, offset)
+        if frame is None or frame.offset + frame.length > end:
+            offset = data.find(b'\xff', offset + 1, end)
+            if offset < 0:
+                return
+            continue
+
+        if first:
+            first = False
+            if vbr_header(data, frame):
+                offset += frame.length
+                continue
+
+        yield frame
+        offset += frame.length
+
+
+def first_frame(data):
+    offset = audio_start(data)
+    end = audio_end(data)
+    while 0 <= offset < end:
+        frame = parse_frame_header(data, offset)
+        if frame is not None and frame.offset + frame.length <= end:
+            return frame
+        offset = data.find(b'\xff', offset + 1, end)
+    return None
+
+
+def probe_mp3(path):
+    """
+    Lee la metadata de un MP3 sin decodificarlo. Si el primer frame trae la
+    cantidad de frames (Xing/Info/VBRI) no hace falta recorrer el archivo;
+    si no, se cuentan los frames leyendo solo sus headers.
+
+    Returns:
+    dict: frames, duration (segundos), bitrate (kbps promedio), sample_rate
+    y channels, o None si no es un MP3 valido.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    first = first_frame(data)
+    if first is None:
+        return None
+
+    vbr = vbr_header(data, first)
+    if vbr and vbr[1]:
+        frames = vbr[1]
+        samples = frames * first.samples
+        audio_bytes = audio_end(data) - first.offset - first.length
+    else:
+        frames = samples = audio_bytes = 0
+        for frame in iter_frames(data):
+            frames += 1
+            samples += frame.samples
+            audio_bytes += frame.length
+        if not frames:
+            return None
+
+    duration = samples / first.sample_rate
+    return {
+        'frames': frames,
+        'duration': round(duration, 3),
+        'bitrate': round(audio_bytes * 8 / duration / 1000),
+        'sample_rate': first.sample_rate,
+        'channels': first.channels,
+    }
+
+
+def stream_format(frame):
+    return (frame.version, frame.sample_rate, frame.channels)
+
+
+def concat_frames(parts, output):
+    """
+    Une los frames de `parts` en `output` sin decodificar.
+
+    Returns:
+    dict: frames y duration, o None si las partes no son compatibles.
+    """
+    streams = []
+    formats = set()
+    for path in parts:
+        with open(path, 'rb') as file:
+            data = file.read()
+        frames = list(iter_frames(data))
+        if not frames:
+            return None
+        formats.update(stream_format(frame) for frame in frames)
+        streams.append((data, frames))
+
+    if len(formats) != 1:
+        return None
+
+    total_frames = 0
+    total_samples = 0
+    sample_rate = next(iter(formats))[1]
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    tmp_path = f'{output}.tmp'
+    with open(tmp_path, 'wb') as file:
+        for data, frames in streams:
+            view = memoryview(data)
+            # Los frames contiguos se escriben en un solo bloque; solo se
+            # corta donde hubo basura entre frames
+            start = stop = frames[0].offset
+            for frame in frames:
+                if frame.offset != stop:
+                    file.write(view[start:stop])
+                    start = frame.offset
+                stop = frame.offset + frame.length
+            file.write(view[start:stop])
+            total_frames += len(frames)
+            total_samples += sum(frame.samples for frame in frames)
+    os.replace(tmp_path, output)
+
+    return {
+        'frames': total_frames,
+        'duration': round(total_samples / sample_rate, 3),
+    }
+
+
+def concat_decoded(parts, output):
+    """
+    Une las partes decodificandolas con pydub. Las muestras se juntan en un
+    solo buffer en vez de sumar segmentos (cada suma copia todo lo anterior).
+    """
+    if AudioSegment is None:
+        raise ValueError('Incompatible MP3 parts and pydub is not installed')
+
+    segments = [AudioSegment.from_file(path) for path in parts]
+    reference = segments[0]
+    segments = [
+        segment.set_frame_rate(reference.frame_rate)
+               .set_channels(reference.channels)
+               .set_sample_width(reference.sample_width)
+        for segment in segments
+    ]
+    combined = reference._spawn(b''.join(segment.raw_data for segment in segments))
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    tmp_path = f'{output}.tmp'
+    combined.export(tmp_path, format='mp3')
+    os.replace(tmp_path, output)
+
+    return {
+        'frames': None,
+        'duration': round(len(combined) / 1000, 3),
+    }
+
+
+def build_track(job):
+    """
+    Arma una pista. Corre en un proceso del pool, por eso recibe y devuelve
+    solo datos serializables.
+    """
+    relpath, parts, source_root, output_root, parts_hash = job
+    paths = [os.path.join(source_root, part) for part in parts]
+    output = os.path.join(output_root, relpath)
+
+    try:
+        result = concat_frames(paths, output)
+        method = 'frames'
+        if result is None:
+            result = concat_decoded(paths, output)
+            method = 'decoded'
+    except (OSError, ValueError) as e:
+        # Una pista rota no debe frenar el resto del build
+        return {'path': relpath, 'error': str(e)}
+
+    result.update({
+        'path': relpath,
+        'parts': parts,
+        'parts_hash': parts_hash,
+        'method': method,
+        'bytes': os.path.getsize(output),
+    })
+    return result
+
+
+def find_tracks(source_root, only=None):
+    """
+    Devuelve [(ruta relativa de la pista, [partes])] de todos los
+    directorios de partes de los perfiles conocidos.
+    """
+    tracks = []
+    for profile in TRACK_PROFILES:
+        directory = os.path.join(source_root, profile)
+        if not os.path.isdir(directory):
+            continue
+        for code in sorted(os.listdir(directory)):
+            if only and code != only:
+                continue
+            track_dir = os.path.join(directory, code)
+            if not os.path.isdir(track_dir):
+                continue
+            parts = [
+                f'{profile}/{code}/{name}'
+                for name in sorted(os.listdir(track_dir))
+                if name.lower().endswith('.mp3')
+            ]
+            if parts:
+                tracks.append((f'{profile}/{code}.mp3', parts))
+    return tracks
+
+
+def parts_digest(source_root, parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(file_hash(os.path.join(source_root, part)).encode())
+    return digest.hexdigest()
+
+
+def build_tracks(source_root=None, output_root=None, workers=None, force=False, only=None, log=None):
+    """
+    Arma las pistas cuyas partes cambiaron desde el ultimo build, en
+    paralelo entre los nucleos disponibles.
+
+    Returns:
+    dict: built, skipped y failed (rutas de las pistas).
+    """
+    source_root = source_root or settings.MEDIA_SOURCE_ROOT
+    output_root = output_root or settings.MEDIA_ROOT
+    log = log or (lambda msg: None)
+
+    manifest = load_manifest('tracks')
+
+    jobs, skipped = [], []
+    for relpath, parts in find_tracks(source_root, only):
+        digest = parts_digest(source_root, parts)
+        previous = manifest.get(relpath)
+        if not force and previous and previous['parts_hash'] == digest \
+                and os.path.exists(os.path.join(output_root, relpath)):
+            skipped.append(relpath)
+            continue
+        jobs.append((relpath, parts, source_root, output_root, digest))
+
+    built, failed = [], []
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for record in executor.map(build_track, jobs, chunksize=8):
+                if 'error' in record:
+                    failed.append(record['path'])
+                    log(f"{record['path']} failed: {record['error']}")
+                    continue
+                manifest[record['path']] = record
+                built.append(record['path'])
+                log(f"{record['path']} ({len(record['parts'])} parts, "
+                    f"{record['duration']}s, {record['method']})")
+
+    save_manifest('tracks', manifest)
+
+    return {'built': built, 'skipped': skipped, 'failed': failed}
+
+
+def index_entry(job):
+    relpath, media_root, digest = job
+    metadata = probe_mp3(os.path.join(media_root, relpath))
+    return relpath, digest, metadata
+
+
+def index_audio(media_root=None, workers=None, force=False, log=None):
+    """
+    Indexa los MP3 de AUDIO_DIRS. Un archivo con el mismo tamano y mtime
+    no se vuelve a leer; si cambio el mtime pero no el contenido solo se
+    recalcula el hash.
+
+    Returns:
+    dict: indexed, cached, invalid y removed (rutas relativas).
+    """
+    media_root = media_root or settings.MEDIA_ROOT
+    log = log or (lambda msg: None)
+
+    manifest = load_manifest('audio')
+    found = set()
+
+    jobs, cached = [], []
+    for directory in AUDIO_DIRS:
+        path = os.path.join(media_root, directory)
+        if not os.path.isdir(path):
+            continue
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.lower().endswith('.mp3'):
+                    continue
+                relpath = f'{directory}/{entry.name}'
+                found.add(relpath)
+
+                stat = entry.stat()
+                key = [stat.st_size, stat.st_mtime_ns]
+                previous = manifest.get(relpath)
+                if not force and previous and previous['stat'] == key:
+                    cached.append(relpath)
+                    continue
+
+                digest = file_hash(entry.path)
+                if not force and previous and previous['hash'] == digest:
+                    previous['stat'] = key
+                    cached.append(relpath)
+                    continue
+
+                jobs.append((relpath, media_root, digest))
+                # El stat se guarda junto con el resultado
+                manifest[relpath] = {'stat': key}
+
+    indexed, invalid = [], []
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for relpath, digest, metadata in executor.map(index_entry, jobs, chunksize=16):
+                if metadata is None:
+                    del manifest[relpath]
+                    invalid.append(relpath)
+                    log(f'{relpath} is not a valid MP3')
+                    continue
+                manifest[relpath].update(metadata, hash=digest)
+                indexed.append(relpath)
+
+    removed = [path for path in manifest if path not in found]
+    for path in removed:
+        del manifest[path]
+
+    save_manifest('audio', manifest)
+
+    return {'indexed': indexed, 'cached': cached, 'invalid': invalid, 'removed': removed}
+
+
+def get_audio_duration(manifest, relpath):
+    """
+    Duracion indexada del MP3 `relpath`, o None si no esta en el indice.
+    """
+    record = manifest.get(relpath)
+    if not record:
+        return None
+    return record['duration']
@@ -0,0 +1,213 @@
+"""
+Derivados de imagenes para las cards (mini, cover, full) en JPEG, WebP y
+AVIF (si el plugin esta disponible).
+
+Cada imagen fuente en MEDIA_SOURCE_ROOT/<perfil>/<nombre>.<ext> genera en
+MEDIA_ROOT:
+    <perfil>/<nombre>.jpg              ancho mayor del perfil (URL historica)
+    <perfil>/<nombre>_<ancho>w.<fmt>   un archivo por ancho y formato
+
+El manifest 'images' guarda el hash de cada fuente y el ancho, alto y peso
+de cada derivado; las fuentes que no cambiaron se omiten.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+from assets.manifests import file_hash, load_manifest, save_manifest
+
+try:
+    # Plugin opcional: Pillow 9 no trae soporte AVIF
+    import pillow_avif  # noqa
+except ImportError:
+    pass
+
+
+# Directorio relativo -> anchos a generar (el mayor es el canonico)
+IMAGE_PROFILES = {
+    'cards/basic_cards/imgs': (540, 1080),
+    'cards/basic_cards/covers': (240, 480),
+    'cards/basic_cards/ex_imgs': (540, 1080),
+    'cards/basic_cards/sce_imgs': (540, 1080),
+    'cards/cluster_cards/imgs': (540, 1080),
+    'cards/cluster_cards/covers': (240, 480),
+    'mini': (96, 192),
+    'stickers': (256, 512),
+}
+
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+SAVE_OPTIONS = {
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'avif': ('AVIF', {'quality': 60}),
+}
+
+
+def available_formats():
+    # Registra los plugins de formatos de Pillow
+    Image.init()
+    formats = ['jpg']
+    if 'WEBP' in Image.SAVE:
+        formats.append('webp')
+    if 'AVIF' in Image.SAVE:
+        formats.append('avif')
+    return formats
+
+
+def find_sources(source_root, only=None):
+    """
+    Devuelve [(perfil, ruta relativa de la fuente)] de todas las imagenes
+    fuente de los perfiles conocidos.
+    """
+    sources = []
+    for profile in IMAGE_PROFILES:
+        if only and not profile.startswith(only):
+            continue
+        directory = os.path.join(source_root, profile)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            if name.lower().endswith(SOURCE_EXTENSIONS):
+                sources.append((profile, f'{profile}/{name}'))
+    return sources
+
+
+def canonical_path(source_relpath):
+    stem = os.path.splitext(source_relpath)[0]
+    return f'{stem}.jpg'
+
+
+def prepare(image, fmt):
+    if fmt == 'jpg' and image.mode != 'RGB':
+        # JPEG no tiene canal alfa: se aplana sobre blanco
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        if image.mode in ('RGBA', 'LA'):
+            background.paste(image, mask=image.getchannel('A'))
+        else:
+            background.paste(image.convert('RGB'))
+        return background
+    if image.mode not in ('RGB', 'RGBA'):
+        return image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    return image
+
+
+def save_variant(image, output_root, relpath, fmt):
+    path = os.path.join(output_root, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pil_format, options = SAVE_OPTIONS[fmt]
+    prepare(image, fmt).save(path, pil_format, **options)
+    return {
+        'path': relpath,
+        'format': fmt,
+        'width': image.width,
+        'height': image.height,
+        'bytes': os.path.getsize(path),
+    }
+
+
+def build_derivatives(job):
+    """
+    Genera todos los derivados de una fuente. Corre en un proceso del pool,
+    por eso recibe y devuelve solo datos serializables.
+    """
+    profile, source_relpath, source_root, output_root, source_hash, formats = job
+    target = max(IMAGE_PROFILES[profile])
+    stem = os.path.splitext(source_relpath)[0]
+
+    with Image.open(os.path.join(source_root, source_relpath)) as original:
+        # Con JPEG, draft() decodifica directo a una escala menor
+        original.draft('RGB', (target, target))
+        original = ImageOps.exif_transpose(original)
+        original.load()
+
+        # Nunca se agranda la fuente
+        widths = sorted({min(w, original.width) for w in IMAGE_PROFILES[profile]})
+
+        variants = []
+        canonical = None
+        for width in widths:
+            height = round(original.height * width / original.width)
+            resized = original.resize(
+                (width, height), Image.Resampling.LANCZOS)
+
+            for fmt in formats:
+                variants.append(save_variant(
+                    resized, output_root, f'{stem}_{width}w.{fmt}', fmt))
+
+            canonical = resized
+
+        # La URL historica <nombre>.jpg apunta al ancho mayor
+        record = save_variant(
+            canonical, output_root, canonical_path(source_relpath), 'jpg')
+
+    record['source'] = source_relpath
+    record['source_hash'] = source_hash
+    record['variants'] = variants
+    return record
+
+
+def build_images(source_root=None, output_root=None, workers=None, force=False, only=None, log=None):
+    """
+    Construye los derivados de todas las fuentes que cambiaron desde el
+    ultimo build, en paralelo entre los nucleos disponibles.
+
+    Returns:
+    dict: built, skipped y removed (rutas canonicas).
+    """
+    source_root = source_root or settings.MEDIA_SOURCE_ROOT
+    output_root = output_root or settings.MEDIA_ROOT
+    log = log or (lambda msg: None)
+
+    if os.path.abspath(source_root) == os.path.abspath(output_root):
+        # El canonico <nombre>.jpg pisaria la fuente
+        raise ValueError('MEDIA_SOURCE_ROOT must be different from MEDIA_ROOT')
+
+    manifest = load_manifest('images')
+    formats = available_formats()
+    sources = find_sources(source_root, only)
+
+    jobs, skipped = [], []
+    for profile, relpath in sources:
+        source_hash = file_hash(os.path.join(source_root, relpath))
+        previous = manifest.get(canonical_path(relpath))
+        if not force and previous and previous['source_hash'] == source_hash \
+                and {v['format'] for v in previous['variants']} == set(formats):
+            skipped.append(relpath)
+            continue
+        jobs.append((profile, relpath, source_root, output_root, source_hash, formats))
+
+    built = []
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for record in executor.map(build_derivatives, jobs, chunksize=4):
+                manifest[record['path']] = record
+                built.append(record['path'])
+                log(f"{record['path']} ({len(record['variants'])} variants)")
+
+    # Entradas cuya fuente ya no existe (solo dentro de lo procesado)
+    current = {canonical_path(relpath) for _, relpath in sources}
+    removed = [
+        path for path, record in manifest.items()
+        if path not in current and (not only or path.startswith(only))
+    ]
+    for path in removed:
+        del manifest[path]
+
+    save_manifest('images', manifest)
+
+    return {'built': built, 'skipped': skipped, 'removed': removed}
+
+
+def get_image_variants(manifest, relpath):
+    """
+    Variantes registradas para la ruta canonica `relpath` (la que usan las
+    URLs de las cards), o None si la imagen no paso por el pipeline.
+    """
+    record = manifest.get(relpath)
+    if not record:
+        return None
+    return record['variants']
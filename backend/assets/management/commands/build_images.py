@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from common.helpers import console
+from assets.images import available_formats, build_images
+import time
+import traceback
+
+
+class Command(BaseCommand):
+    help = 'Genera los derivados (tamanos y formatos) de las imagenes de las cards'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Procesos en paralelo (por defecto, uno por nucleo).',
+        )
+        parser.add_argument(
+            '--only',
+            default=None,
+            help='Procesa solo un perfil, ej: cards/basic_cards/covers',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Regenera todo aunque la fuente no haya cambiado.',
+        )
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    BUILD IMAGES                ')
+        console.info('--------------------------------')
+
+        console.info(f'Source: {settings.MEDIA_SOURCE_ROOT}')
+        console.info(f'Formats: {available_formats()}')
+
+        try:
+            start = time.perf_counter()
+            result = build_images(
+                workers=options['workers'],
+                force=options['rebuild'],
+                only=options['only'],
+                log=console.info,
+            )
+            elapsed = time.perf_counter() - start
+
+            console.info(
+                f"Built: {len(result['built'])}, skipped: {len(result['skipped'])}, "
+                f"removed: {len(result['removed'])} ({elapsed:.1f}s)")
+            console.info('Done')
+
+        except Exception as e:
+            traceback.print_exc()
+            console.error('Process Failed!')
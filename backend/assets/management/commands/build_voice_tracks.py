@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.db import transaction
+from cards.models import BasicCard
+from common.helpers import console
+from assets.audio import build_tracks
+from assets.manifests import load_manifest
+from assets.versioning import VersionedMediaURLs
+import os
+import time
+import traceback
+
+
+class Command(BaseCommand):
+    help = 'Arma las pistas de voz de las cards uniendo sus partes MP3'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Procesos en paralelo (por defecto, uno por nucleo).',
+        )
+        parser.add_argument(
+            '--code',
+            default=None,
+            help='Arma solo la pista de una card.',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Regenera todo aunque las partes no hayan cambiado.',
+        )
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    BUILD VOICE TRACKS          ')
+        console.info('--------------------------------')
+
+        console.info(f'Source: {settings.MEDIA_SOURCE_ROOT}')
+
+        try:
+            start = time.perf_counter()
+            result = build_tracks(
+                workers=options['workers'],
+                force=options['rebuild'],
+                only=options['code'],
+                log=console.info,
+            )
+            elapsed = time.perf_counter() - start
+
+            console.info(
+                f"Built: {len(result['built'])}, skipped: {len(result['skipped'])}, "
+                f"failed: {len(result['failed'])} "
+                f"({elapsed:.1f}s)")
+
+            updated = self.update_durations(result['built'])
+            console.info(f'Cards updated: {updated}')
+            console.info('Done')
+
+        except Exception as e:
+            traceback.print_exc()
+            console.error('Process Failed!')
+
+    def update_durations(self, built):
+        # Las cards ya cargadas toman la duracion real y la URL versionada de
+        # la pista nueva
+        manifest = load_manifest('tracks')
+        tracks = {
+            os.path.splitext(os.path.basename(path))[0]: manifest[path]
+            for path in built
+        }
+        if not tracks:
+            return 0
+
+        media_urls = VersionedMediaURLs()
+        updated = 0
+        with transaction.atomic():
+            for card in BasicCard.objects.filter(code__in=tracks).exclude(voice=None):
+                track = tracks[card.code]
+                card.voice['voice_url'] = media_urls.url(track['path'])
+                card.voice['duration'] = track['duration']
+                card.save(update_fields=['voice'])
+                updated += 1
+        media_urls.save()
+        return updated
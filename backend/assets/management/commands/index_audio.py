@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from common.helpers import console
+from assets.audio import index_audio
+import time
+import traceback
+
+
+class Command(BaseCommand):
+    help = 'Indexa duracion, frames y bitrate de los MP3 publicados en media'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Procesos en paralelo (por defecto, uno por nucleo).',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Vuelve a leer todos los archivos aunque no hayan cambiado.',
+        )
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    INDEX AUDIO                 ')
+        console.info('--------------------------------')
+
+        console.info(f'Media: {settings.MEDIA_ROOT}')
+
+        try:
+            start = time.perf_counter()
+            result = index_audio(
+                workers=options['workers'],
+                force=options['rebuild'],
+                log=console.info,
+            )
+            elapsed = time.perf_counter() - start
+
+            console.info(
+                f"Indexed: {len(result['indexed'])}, cached: {len(result['cached'])}, "
+                f"invalid: {len(result['invalid'])}, removed: {len(result['removed'])} "
+                f"({elapsed:.1f}s)")
+            console.info('Done')
+
+        except Exception as e:
+            traceback.print_exc()
+            console.error('Process Failed!')
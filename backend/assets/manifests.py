@@ -0,0 +1,38 @@
+import hashlib
+import json
+import os
+
+from django.conf import settings
+
+
+def manifest_path(name):
+    return os.path.join(settings.MEDIA_ROOT, 'manifests', f'{name}.json')
+
+
+def load_manifest(name):
+    path = manifest_path(name)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_manifest(name, data):
+    """
+    Escribe el manifest de forma atomica: los procesos que lo leen nunca
+    ven un archivo a medio escribir.
+    """
+    path = manifest_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as file:
+        json.dump(data, file, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
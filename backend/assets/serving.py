@@ -0,0 +1,141 @@
+"""
+Respuestas de archivos de media con soporte de rangos (HTTP 206).
+
+En produccion nginx hace el trabajo pesado: la vista solo valida el acceso
+y responde con X-Accel-Redirect hacia la location interna
+/protected-media/. Sin nginx (runserver, tests) el archivo se sirve desde
+Python con los mismos headers.
+"""
+
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.http import http_date
+
+from common.payloads import etag_matches
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header, size):
+    """
+    Interpreta un header Range de un solo rango.
+
+    Returns:
+    tuple: (inicio, fin inclusive), None si no hay rango utilizable (se
+    responde el archivo completo) o False si no se puede satisfacer.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # bytes=-N: los ultimos N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def file_etag(stat):
+    # Mismo formato que nginx, asi el validador no cambia entre ambos caminos
+    return f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+
+
+class RangeFileWrapper:
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.remaining <= 0:
+            raise StopIteration
+        data = self.file.read(min(CHUNK_SIZE, self.remaining))
+        if not data:
+            raise StopIteration
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def media_file_response(request, relpath, cache_control='public, max-age=3600'):
+    """
+    Sirve `relpath` (relativo a MEDIA_ROOT) respetando Range, If-Range e
+    If-None-Match.
+    """
+    path = os.path.join(settings.MEDIA_ROOT, relpath)
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+    if settings.MEDIA_ACCEL_REDIRECT:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = f'/protected-media/{relpath}'
+        response['Cache-Control'] = cache_control
+        return response
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return HttpResponse(status=404)
+
+    etag = file_etag(stat)
+    headers = {
+        'Accept-Ranges': 'bytes',
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': cache_control,
+    }
+
+    if etag_matches(request, etag):
+        response = HttpResponse(status=304)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    byte_range = parse_range(request.headers.get('Range'), stat.st_size)
+    if_range = request.headers.get('If-Range')
+    if if_range and if_range != etag:
+        # El cliente tiene otra version: se ignora Range, tambien si no se
+        # podia satisfacer, y recibe el archivo completo (RFC 9110 13.1.5)
+        byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+
+    file = open(path, 'rb')
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(
+            RangeFileWrapper(file, start, length), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    else:
+        length = stat.st_size
+        response = FileResponse(file, content_type=content_type)
+
+    response['Content-Length'] = length
+    for name, value in headers.items():
+        response[name] = value
+    return response
@@ -0,0 +1,66 @@
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+
+SIGNING_SALT = 'assets.media'
+
+
+def media_signature(relpath, expires):
+    return salted_hmac(SIGNING_SALT, f'{relpath}:{expires}').hexdigest()[:32]
+
+
+def sign_media_path(relpath, ttl=None):
+    """
+    Firma el acceso a un archivo de media por un tiempo limitado.
+
+    El vencimiento se redondea a un multiplo de `ttl` (queda entre `ttl` y
+    2 * `ttl` segundos), asi la URL no cambia en cada request y se puede
+    guardar en los payloads cacheados (ver PAYLOAD_CACHE).
+
+    Args:
+    relpath (str): Ruta relativa a MEDIA_ROOT.
+    ttl (int): Segundos de validez (por defecto MEDIA_SIGNATURE_TTL).
+
+    Returns:
+    dict: Parametros `exp` y `sig` para agregar a la URL.
+    """
+    ttl = ttl or settings.MEDIA_SIGNATURE_TTL
+    expires = (int(time.time()) // ttl + 2) * ttl
+    return {'exp': expires, 'sig': media_signature(relpath, expires)}
+
+
+def verify_media_signature(relpath, expires, signature):
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return False
+
+    if expires < time.time():
+        return False
+
+    return constant_time_compare(media_signature(relpath, expires), signature or '')
+
+
+def signed_audio_url(relpath, ttl=None):
+    params = sign_media_path(relpath, ttl)
+    return f"{settings.SITE_DOMAIN}/assets/audio/{relpath}?exp={params['exp']}&sig={params['sig']}"
+
+
+def sign_voice(voice):
+    """
+    Con MEDIA_SIGNED_AUDIO cambia `voice_url` (una URL de /media/) por la
+    URL firmada de /assets/audio/. Sin la opcion, o si la URL no es de un
+    archivo de MEDIA_ROOT, devuelve `voice` tal cual.
+    """
+    if not settings.MEDIA_SIGNED_AUDIO or not voice or not voice.get('voice_url'):
+        return voice
+
+    path = urlsplit(voice['voice_url']).path
+    prefix = f'/{settings.MEDIA_URL}'
+    if not path.startswith(prefix):
+        return voice
+
+    return dict(voice, voice_url=signed_audio_url(path[len(prefix):]))
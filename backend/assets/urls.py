@@ -0,0 +1,8 @@
+from django.urls import re_path
+from .views import audio_view
+
+app_name = 'assets'
+
+urlpatterns = [
+    re_path(r'^audio\/(?P<relpath>.+)$', audio_view, name='audio'),
+]
@@ -0,0 +1,51 @@
+import os
+
+from django.conf import settings
+
+from assets.manifests import file_hash, load_manifest, save_manifest
+
+
+class VersionedMediaURLs:
+    """
+    Arma URLs absolutas de media con `?v=<hash del contenido>`.
+
+    La URL cambia cada vez que cambia el archivo, asi nginx y la app la
+    pueden cachear como inmutable. Los hashes se recuerdan en el manifest
+    'hashes' junto al tamano y mtime, para no releer archivos que no
+    cambiaron.
+    """
+
+    def __init__(self, media_root=None):
+        self.media_root = media_root or settings.MEDIA_ROOT
+        self.hashes = load_manifest('hashes')
+        self.dirty = False
+
+    def version(self, chunk):
+        path = os.path.join(self.media_root, chunk)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        key = [stat.st_size, stat.st_mtime_ns]
+        cached = self.hashes.get(chunk)
+        if cached and cached[:2] == key:
+            return cached[2]
+
+        digest = file_hash(path)[:12]
+        self.hashes[chunk] = key + [digest]
+        self.dirty = True
+        return digest
+
+    def url(self, chunk):
+        if not chunk:
+            return None
+
+        url = f'{settings.SITE_DOMAIN}/media/{chunk}'
+        version = self.version(chunk)
+        return f'{url}?v={version}' if version else url
+
+    def save(self):
+        if self.dirty:
+            save_manifest('hashes', self.hashes)
+            self.dirty = False
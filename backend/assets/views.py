@@ -0,0 +1,21 @@
+import posixpath
+
+from django.http import HttpResponse, HttpResponseForbidden
+
+from assets.audio import AUDIO_DIRS
+from assets.serving import media_file_response
+from assets.signing import verify_media_signature
+
+
+def audio_view(request, relpath):
+    # Solo audios publicados, sin salir de MEDIA_ROOT
+    normalized = posixpath.normpath(relpath)
+    if normalized != relpath or not relpath.endswith('.mp3') \
+            or posixpath.dirname(relpath) not in AUDIO_DIRS:
+        return HttpResponse(status=404)
+
+    if not verify_media_signature(relpath, request.GET.get('exp'), request.GET.get('sig')):
+        return HttpResponseForbidden()
+
+    # La firma vence, asi que la respuesta no se comparte entre clientes
+    return media_file_response(request, relpath, cache_control='private, max-age=3600')
@@ -0,0 +1,50 @@
+import json
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import RequestFactory
+
+
+class WSGIClient:
+    """
+    Ejecuta requests in-process a traves del WSGIHandler real.
+
+    A diferencia de django.test.Client, emite request_started y
+    request_finished con close_old_connections conectado, asi que
+    CONN_MAX_AGE y los health checks se comportan igual que en gunicorn.
+    """
+
+    def __init__(self, app_version='1.0.0'):
+        self.handler = WSGIHandler()
+        self.factory = RequestFactory(HTTP_APP_VERSION=app_version)
+
+    def request(self, method, path, data=None, **extra):
+        if data is not None:
+            extra.setdefault('content_type', 'application/json')
+            data = json.dumps(data)
+
+        builder = getattr(self.factory, method.lower())
+        if data is None:
+            environ = builder(path, **extra).environ
+        else:
+            environ = builder(path, data, **extra).environ
+
+        captured = {}
+
+        def start_response(status, headers, exc_info=None):
+            captured['status'] = int(status.split(' ', 1)[0])
+            captured['headers'] = dict(headers)
+
+        start = time.perf_counter()
+        response = self.handler(environ, start_response)
+        try:
+            content = b''.join(response)
+        finally:
+            # Igual que un servidor WSGI: dispara request_finished
+            response.close()
+        elapsed = time.perf_counter() - start
+
+        return captured['status'], captured['headers'], content, elapsed
+
+    def get(self, path, **extra):
+        return self.request('GET', path, **extra)
@@ -0,0 +1,180 @@
+"""
+Prueba de carga local para los endpoints principales.
+
+Levanta N hilos con sesiones keep-alive contra un servidor ya corriendo
+(runserver, gunicorn o nginx) y reporta throughput y percentiles por
+endpoint. El resultado se puede guardar en JSON y comparar con un run
+anterior para medir el efecto de un cambio de configuracion.
+
+Uso (desde /app):
+    python -m benchmarks.load_test --base-url http://localhost:8000
+    python -m benchmarks.load_test --output after.json --baseline before.json
+"""
+
+import argparse
+import threading
+import time
+
+import requests
+
+from benchmarks.stats import (
+    compare_results,
+    load_results,
+    save_results,
+    summarize,
+)
+
+
+ENDPOINTS = {
+    'category-cards': lambda ctx: f"/cards/category-cards?device_id={ctx['device_id']}",
+    'detail': lambda ctx: f"/cards/detail/{ctx['card_code']}?card_type=basic&lang={ctx['lang']}",
+    'stickers': lambda ctx: '/cards/stickers',
+    'check-app-update': lambda ctx: '/global-settings/check-app-update',
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Load test de la API.')
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10,
+                        help='Segundos de medicion por endpoint.')
+    parser.add_argument('--warmup', type=float, default=2,
+                        help='Segundos de calentamiento (no se miden).')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                        help='Lista separada por comas.')
+    parser.add_argument('--app-version', default='1.0.0')
+    parser.add_argument('--device-id', default=None,
+                        help='Si no se indica se crea un device nuevo.')
+    parser.add_argument('--card-code', default=None,
+                        help='Si no se indica se toma la primera basic card del feed.')
+    parser.add_argument('--lang', default='es')
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--baseline', default=None)
+    return parser.parse_args()
+
+
+def new_session(args):
+    session = requests.Session()
+    session.headers['App-Version'] = args.app_version
+    return session
+
+
+def build_context(args):
+    session = new_session(args)
+    device_id = args.device_id
+    if not device_id:
+        response = session.post(f'{args.base_url}/devices/create')
+        response.raise_for_status()
+        device_id = response.json()['device_id']
+
+    card_code = args.card_code
+    if not card_code:
+        response = session.get(
+            f'{args.base_url}/cards/category-cards',
+            params={'device_id': device_id})
+        response.raise_for_status()
+        for category in response.json():
+            for block in category['blocks']:
+                for card in block.get('basic_cards', []):
+                    if card:
+                        card_code = card['code']
+                        break
+                if card_code:
+                    break
+            if card_code:
+                break
+
+    return {
+        'device_id': device_id,
+        'card_code': card_code,
+        'lang': args.lang,
+    }
+
+
+def hammer(args, url, deadline, latencies, errors, lock):
+    session = new_session(args)
+    local_latencies = []
+    local_errors = 0
+
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = session.get(url)
+            # Forzar la lectura completa del body
+            response.content
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - start
+
+        if ok:
+            local_latencies.append(elapsed)
+        else:
+            local_errors += 1
+
+    with lock:
+        latencies.extend(local_latencies)
+        errors.append(local_errors)
+
+
+def run_endpoint(args, url, seconds):
+    latencies, errors = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    threads = [
+        threading.Thread(
+            target=hammer,
+            args=(args, url, deadline, latencies, errors, lock))
+        for _ in range(args.concurrency)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(latencies, elapsed)
+    summary['errors'] = sum(errors)
+    return summary
+
+
+def main():
+    args = parse_args()
+    context = build_context(args)
+    names = [name.strip() for name in args.endpoints.split(',') if name.strip()]
+
+    print(f'base_url={args.base_url} concurrency={args.concurrency} '
+          f'duration={args.duration}s context={context}')
+
+    results = {}
+    for name in names:
+        if name == 'detail' and not context['card_code']:
+            print('detail: sin card_code, se omite')
+            continue
+
+        url = args.base_url + ENDPOINTS[name](context)
+
+        if args.warmup:
+            run_endpoint(args, url, args.warmup)
+
+        summary = run_endpoint(args, url, args.duration)
+        results[name] = summary
+        print(f"{name:<18} rps={summary.get('rps')} p50={summary['p50']}ms "
+              f"p90={summary['p90']}ms p99={summary['p99']}ms "
+              f"errors={summary['errors']}")
+
+    if args.baseline:
+        for line in compare_results(results, load_results(args.baseline)):
+            print(line)
+
+    if args.output:
+        save_results(args.output, results)
+        print(f'Resultados guardados en {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from benchmarks.stats import (
+    compare_results,
+    load_results,
+    save_results,
+    summarize,
+)
+from cards.models import BasicCard, BasicCardText
+from cards.services import (
+    deferred_sections,
+    format_basic_card,
+    get_basic_cards_from_texts,
+    parse_sections,
+)
+from cards.translations import NEUTRAL_LANG
+from common.helpers import console
+from common.models import Status as StatusModel
+from global_settings.services import get_languages_info
+
+
+class Command(BaseCommand):
+    help = 'Compara bytes leidos y latencia del detalle de basic cards: columnas JSON vs BasicCardText'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=200,
+                            help='Cantidad de lecturas (una card al azar cada una).')
+        parser.add_argument('--sections', default=None,
+                            help='Secciones pedidas, como en ?sections= (por defecto, todas).')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', default=None)
+        parser.add_argument('--baseline', default=None)
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    BENCH CARD STORAGE          ')
+        console.info('--------------------------------')
+
+        codes = list(BasicCard.objects.filter(
+            status=StatusModel.ACTIVE).values_list('code', flat=True))
+        if not codes:
+            console.warning('No hay datos, ejecuta populate_cards o seed_benchmark primero')
+            return
+        if not BasicCardText.objects.exists():
+            console.warning('BasicCardText esta vacia, ejecuta build_card_texts primero')
+            return
+
+        rand = random.Random(options['seed'])
+        languages = [lang['code'] for lang in get_languages_info()['languages'] if lang['code'] != 'en']
+        sections = parse_sections(options['sections'])
+        reads = [(rand.choice(codes), rand.choice(languages or ['en'])) for _ in range(options['cards'])]
+
+        layouts = {
+            'blob': (self.blob_query, self.read_blob),
+            'normalized': (self.texts_query, self.read_texts),
+        }
+
+        results = {}
+        for name, (build_query, read) in layouts.items():
+            # Mismo resultado en los dos: si no, la comparacion no sirve
+            code, lang_code = reads[0]
+            if read(code, lang_code, sections) != self.read_blob(code, lang_code, sections):
+                console.error(f'{name}: el documento no coincide con el de las columnas JSON')
+
+            transferred = [self.raw_bytes(build_query(code, lang_code, sections)) for code, lang_code in reads]
+            latencies = []
+            for code, lang_code in reads:
+                started = time.perf_counter()
+                read(code, lang_code, sections)
+                latencies.append(time.perf_counter() - started)
+
+            summary = summarize(latencies)
+            summary['bytes'] = round(sum(transferred) / len(transferred))
+            results[name] = summary
+            console.info(
+                f"{name:<11} bytes/card={summary['bytes']} p50={summary['p50']}ms "
+                f"p90={summary['p90']}ms p99={summary['p99']}ms")
+
+        if options['baseline']:
+            baseline = load_results(options['baseline'])
+            for line in compare_results(results, baseline, ('bytes', 'p50', 'p99')):
+                console.info(line)
+
+        if options['output']:
+            save_results(options['output'], results)
+
+    def blob_query(self, code, lang_code, sections):
+        return BasicCard.objects.filter(
+            code=code, status=StatusModel.ACTIVE).defer(*deferred_sections(sections))
+
+    def read_blob(self, code, lang_code, sections):
+        card = self.blob_query(code, lang_code, sections).first()
+        return format_basic_card(card, lang_code, sections)
+
+    def texts_query(self, code, lang_code, sections):
+        return BasicCardText.objects.filter(
+            card__code=code,
+            card__status=StatusModel.ACTIVE,
+            lang__in={NEUTRAL_LANG, 'en', lang_code},
+        ).values_list('card__code', 'lang', 'content')
+
+    def read_texts(self, code, lang_code, sections):
+        return get_basic_cards_from_texts([code], lang_code, sections).get(code)
+
+    def raw_bytes(self, queryset):
+        # Tamano de lo que devuelve la base de datos, antes de decodificar el JSON
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return sum(
+                len(value.encode('utf-8')) if isinstance(value, str) else len(str(value))
+                for row in cursor.fetchall() for value in row if value is not None)
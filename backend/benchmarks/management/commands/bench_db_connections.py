@@ -0,0 +1,122 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from benchmarks.client import WSGIClient
+from benchmarks.stats import (
+    compare_results,
+    load_results,
+    save_results,
+    summarize,
+)
+from cards.models import BasicCard
+from common.helpers import console
+from common.models import Status as StatusModel
+from devices.models import Device
+
+
+MODES = {
+    # nombre: (CONN_MAX_AGE, CONN_HEALTH_CHECKS)
+    'per-request': (0, False),
+    'persistent': (60, False),
+    'persistent+health': (60, True),
+}
+
+
+class Command(BaseCommand):
+    help = 'Mide el costo de abrir conexiones a la base de datos por request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--card-code', default=None)
+        parser.add_argument('--device-id', default=None)
+        parser.add_argument('--lang', default='es')
+        parser.add_argument('--output', default=None)
+        parser.add_argument('--baseline', default=None)
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    BENCH DB CONNECTIONS        ')
+        console.info('--------------------------------')
+
+        self.connects = 0
+        connection_created.connect(self.count_connect)
+
+        card_code = options['card_code'] or BasicCard.objects.values_list(
+            'code', flat=True).first()
+
+        device_id = options['device_id'] or Device.objects.filter(
+            status=StatusModel.ACTIVE).values_list('id', flat=True).first()
+
+        # Endpoints que hacen al menos un query por request; /health/ready
+        # no sirve porque responde desde el snapshot del HealthMonitor
+        endpoints = {}
+        if device_id:
+            endpoints['device'] = f'/devices/{device_id}'
+        else:
+            console.warning('No hay devices activos, se omite device')
+        if card_code:
+            endpoints['detail'] = f"/cards/detail/{card_code}?card_type=basic&lang={options['lang']}"
+        else:
+            console.warning('No hay basic cards, se omite detail')
+
+        results = {
+            'raw-connect': self.bench_raw_connect(options['requests']),
+        }
+
+        client = WSGIClient()
+        db = connections['default']
+        original = (db.settings_dict['CONN_MAX_AGE'],
+                    db.settings_dict.get('CONN_HEALTH_CHECKS', False))
+
+        try:
+            for mode, (max_age, health_checks) in MODES.items():
+                db.settings_dict['CONN_MAX_AGE'] = max_age
+                db.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+
+                for name, path in endpoints.items():
+                    db.close()
+                    self.connects = 0
+                    latencies = []
+
+                    for _ in range(options['requests']):
+                        status, _, _, elapsed = client.get(path)
+                        if status >= 400:
+                            console.warning(f'{name} respondio {status}')
+                        latencies.append(elapsed)
+
+                    summary = summarize(latencies)
+                    summary['connects'] = self.connects
+                    results[f'{mode}:{name}'] = summary
+        finally:
+            db.settings_dict['CONN_MAX_AGE'], db.settings_dict['CONN_HEALTH_CHECKS'] = original
+            db.close()
+            connection_created.disconnect(self.count_connect)
+
+        for name, summary in results.items():
+            console.info(
+                f"{name:<28} p50={summary['p50']}ms p99={summary['p99']}ms "
+                f"mean={summary['mean']}ms connects={summary.get('connects', '-')}")
+
+        if options['baseline']:
+            for line in compare_results(results, load_results(options['baseline']), ('p50', 'p99')):
+                console.info(line)
+
+        if options['output']:
+            save_results(options['output'], results)
+
+    def bench_raw_connect(self, total):
+        db = connections['default']
+        latencies = []
+        for _ in range(total):
+            db.close()
+            start = time.perf_counter()
+            db.ensure_connection()
+            latencies.append(time.perf_counter() - start)
+        db.close()
+        return summarize(latencies)
+
+    def count_connect(self, sender, connection, **kwargs):
+        self.connects += 1
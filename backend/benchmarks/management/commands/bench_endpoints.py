@@ -0,0 +1,211 @@
+import json
+import logging
+import random
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from benchmarks.client import WSGIClient
+from benchmarks.stats import (
+    compare_results,
+    load_results,
+    save_results,
+    summarize,
+)
+from cards.models import BasicCard, ClusterCard, CustomCard, Sticker
+from common.cache import get_cache_stats
+from common.helpers import console
+from devices.models import Device
+from global_settings.services import get_languages_info
+
+
+class QueryCounter:
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = 'Mide latencia, queries y memoria de los endpoints principales (in-process)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--endpoints', default=None,
+                            help='Lista separada por comas (por defecto, todos).')
+        parser.add_argument('--tracemalloc', action='store_true',
+                            help='Mide el pico de memoria por request (mas lento).')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--keep-logs', action='store_true',
+                            help='No silencia los logs de las vistas durante la medicion.')
+        parser.add_argument('--output', default=None)
+        parser.add_argument('--baseline', default=None)
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    BENCH ENDPOINTS             ')
+        console.info('--------------------------------')
+
+        self.random = random.Random(options['seed'])
+        self.client = WSGIClient()
+
+        self.ctx = self.build_context()
+        if self.ctx is None:
+            console.warning('No hay datos, ejecuta seed_benchmark primero')
+            return
+
+        scenarios = self.scenarios(self.ctx)
+        names = options['endpoints'].split(',') if options['endpoints'] else list(scenarios)
+
+        if not options['keep_logs']:
+            # Los logs por request escriben a archivo y distorsionan la medicion
+            logging.disable(logging.INFO)
+
+        results = {}
+        try:
+            for name in names:
+                results[name] = self.run(name, scenarios[name], options)
+                summary = results[name]
+                console.info(
+                    f"{name:<16} p50={summary['p50']}ms p90={summary['p90']}ms "
+                    f"p99={summary['p99']}ms queries={summary['queries']} "
+                    f"errors={summary['errors']}"
+                    + (f" alloc={summary['alloc_peak_kb']}KB" if 'alloc_peak_kb' in summary else ''))
+        finally:
+            logging.disable(logging.NOTSET)
+
+        console.info(f'Cache: {get_cache_stats()}')
+
+        if options['baseline']:
+            baseline = load_results(options['baseline'])
+            for line in compare_results(results, baseline, ('p50', 'p99', 'queries', 'alloc_peak_kb')):
+                console.info(line)
+
+        if options['output']:
+            save_results(options['output'], results)
+
+    def build_context(self):
+        device = Device.objects.filter(status=1).order_by('created').first()
+        basic_codes = list(BasicCard.objects.values_list('code', flat=True)[:1000])
+        if device is None or not basic_codes:
+            return None
+
+        languages = [lang['code'] for lang in get_languages_info()['languages']]
+        return {
+            'device_id': str(device.id),
+            'basic_codes': basic_codes,
+            'cluster_codes': list(ClusterCard.objects.values_list('code', flat=True)[:1000]),
+            'custom_ids': list(CustomCard.objects.filter(
+                device=device, status=1).values_list('id', flat=True)[:1000]),
+            'sticker_codes': list(Sticker.objects.values_list('code', flat=True)),
+            'languages': languages or ['en'],
+            # Cards creadas por 'create' para usar en 'update' y 'delete'
+            'created_ids': [],
+        }
+
+    def scenarios(self, ctx):
+        pick = self.random.choice
+
+        def created_card():
+            if not ctx['created_ids']:
+                return pick(ctx['custom_ids'])
+            return ctx['created_ids'].pop()
+
+        def create():
+            return ('POST', '/cards/create', {
+                'device_id': ctx['device_id'],
+                'phrase': 'benchmark phrase',
+                'meaning': 'benchmark meaning',
+                'sticker_code': pick(ctx['sticker_codes']),
+            })
+
+        return {
+            'category-cards': lambda: ('GET', f"/cards/category-cards?device_id={ctx['device_id']}", None),
+            'detail-basic': lambda: (
+                'GET', f"/cards/detail/{pick(ctx['basic_codes'])}?card_type=basic&lang={pick(ctx['languages'])}", None),
+            'detail-cluster': lambda: (
+                'GET', f"/cards/detail/{pick(ctx['cluster_codes'])}?card_type=cluster&lang={pick(ctx['languages'])}", None),
+            'detail-custom': lambda: ('GET', f"/cards/detail/{pick(ctx['custom_ids'])}", None),
+            'detail-batch': lambda: (
+                'GET', '/cards/detail-batch?basic={}&cluster={}&custom={}&lang={}&device_id={}'.format(
+                    ','.join(self.random.sample(ctx['basic_codes'], min(20, len(ctx['basic_codes'])))),
+                    ','.join(self.random.sample(ctx['cluster_codes'], min(5, len(ctx['cluster_codes'])))),
+                    ','.join(str(card_id) for card_id in self.random.sample(
+                        ctx['custom_ids'], min(5, len(ctx['custom_ids'])))),
+                    pick(ctx['languages']), ctx['device_id']), None),
+            'stickers': lambda: ('GET', '/cards/stickers', None),
+            # Exacta, prefijo, typo y varias palabras
+            'search': lambda: ('GET', '/cards/search?q={}&lang={}&device_id={}'.format(
+                pick(('take', 'ta', 'tkae off', 'plan idea', 'brek')),
+                pick(ctx['languages']), ctx['device_id']), None),
+            'related': lambda: ('GET', f"/cards/related/{pick(ctx['basic_codes'])}", None),
+            'create': create,
+            'update': lambda: ('PUT', '/cards/update', {
+                'card_id': pick(ctx['custom_ids']),
+                'device_id': ctx['device_id'],
+                'phrase': 'updated phrase',
+                'meaning': 'updated meaning',
+                'sticker_code': pick(ctx['sticker_codes']),
+            }),
+            'delete': lambda: ('DELETE', '/cards/delete', {
+                'card_id': created_card(),
+                'device_id': ctx['device_id'],
+            }),
+            'screen-flow': lambda: ('POST', '/devices/screen-flow', {
+                'device_id': ctx['device_id'],
+                'value': 'benchmark',
+                'time': '1',
+            }),
+        }
+
+    def call(self, build):
+        method, path, data = build()
+        status, _, content, elapsed = self.client.request(
+            method, path, data, HTTP_ACCEPT_ENCODING='identity')
+        if method == 'POST' and path == '/cards/create' and status == 201:
+            self.ctx['created_ids'].append(json.loads(content)['card_id'])
+        return status, elapsed
+
+    def run(self, name, build, options):
+        for _ in range(options['warmup']):
+            self.call(build)
+
+        counter = QueryCounter()
+        latencies, queries, errors = [], [], 0
+        with connection.execute_wrapper(counter):
+            for _ in range(options['requests']):
+                before = counter.count
+                status, elapsed = self.call(build)
+                if status >= 400:
+                    errors += 1
+                    continue
+                latencies.append(elapsed)
+                queries.append(counter.count - before)
+
+        summary = summarize(latencies)
+        summary['errors'] = errors
+        summary['queries'] = round(sum(queries) / len(queries), 2) if queries else None
+
+        if options['tracemalloc']:
+            summary['alloc_peak_kb'] = self.measure_allocations(build, min(options['requests'], 50))
+
+        return summary
+
+    def measure_allocations(self, build, total):
+        peaks = []
+        tracemalloc.start()
+        try:
+            for _ in range(total):
+                tracemalloc.reset_peak()
+                start, _ = tracemalloc.get_traced_memory()
+                self.call(build)
+                _, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - start)
+        finally:
+            tracemalloc.stop()
+        return round(sum(peaks) / len(peaks) / 1024, 1)
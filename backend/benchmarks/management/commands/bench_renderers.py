@@ -0,0 +1,116 @@
+import io
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from benchmarks.client import WSGIClient
+from benchmarks.stats import (
+    compare_results,
+    load_results,
+    save_results,
+    summarize,
+)
+from cards.models import BasicCard
+from cards.services import get_basic_card_by_code
+from common.helpers import console
+from common.renderers import FastJSONParser, FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    help = 'Compara el renderer/parser JSON de DRF con los de common.renderers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500)
+        parser.add_argument('--cards', type=int, default=20,
+                            help='Cantidad de basic cards a renderizar.')
+        parser.add_argument('--lang', default='es')
+        parser.add_argument('--output', default=None)
+        parser.add_argument('--baseline', default=None)
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    BENCH RENDERERS             ')
+        console.info('--------------------------------')
+
+        if orjson is None:
+            console.warning('orjson no esta instalado: se mide el fallback')
+
+        payloads = self.load_payloads(options)
+        if not payloads:
+            console.warning('No hay datos, ejecuta populate_cards primero')
+            return
+
+        renderers = {'drf': JSONRenderer(), 'fast': FastJSONRenderer()}
+        parsers = {'drf': JSONParser(), 'fast': FastJSONParser()}
+
+        results = {}
+        for name, data in payloads.items():
+            rendered = {key: renderer.render(data) for key, renderer in renderers.items()}
+            if json.loads(rendered['drf']) != json.loads(rendered['fast']):
+                console.error(f'{name}: la salida no coincide con la de DRF')
+            elif rendered['drf'] != rendered['fast']:
+                console.warning(f'{name}: mismo JSON, distinto formato de bytes')
+
+            for key, renderer in renderers.items():
+                results[f'render:{name}:{key}'] = self.measure(
+                    lambda: renderer.render(data), options['iterations'])
+
+            body = rendered['drf']
+            for key, parser in parsers.items():
+                results[f'parse:{name}:{key}'] = self.measure(
+                    lambda: parser.parse(io.BytesIO(body)), options['iterations'])
+
+            console.info(f'{name}: {len(body)} bytes')
+
+        for name, summary in results.items():
+            console.info(f"{name:<32} mean={summary['mean']}ms p99={summary['p99']}ms")
+
+        for name in payloads:
+            for op in ('render', 'parse'):
+                drf = results[f'{op}:{name}:drf']['mean']
+                fast = results[f'{op}:{name}:fast']['mean']
+                if fast:
+                    console.info(f'{op}:{name} speedup x{drf / fast:.1f}')
+
+        if options['baseline']:
+            for line in compare_results(results, load_results(options['baseline']), ('mean', 'p99')):
+                console.info(line)
+
+        if options['output']:
+            save_results(options['output'], results)
+
+    def load_payloads(self, options):
+        payloads = {}
+
+        codes = BasicCard.objects.order_by('id').values_list(
+            'code', flat=True)[:options['cards']]
+        details = [get_basic_card_by_code(code, options['lang']) for code in codes]
+        if details:
+            payloads['detail'] = details[0]
+            payloads['details'] = details
+
+        # El feed se arma con la vista real, para medir el mismo dato que
+        # se responde
+        client = WSGIClient()
+        status, _, content, _ = client.request('POST', '/devices/create')
+        if status < 400:
+            device_id = json.loads(content)['device_id']
+            status, _, content, _ = client.get(
+                f'/cards/category-cards?device_id={device_id}', HTTP_ACCEPT_ENCODING='identity')
+            if status == 200:
+                payloads['feed'] = json.loads(content)
+
+        return payloads
+
+    def measure(self, func, iterations):
+        # Una vuelta de calentamiento fuera de la medicion
+        func()
+        latencies = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - start)
+        return summarize(latencies)
@@ -0,0 +1,280 @@
+import random
+import traceback
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cards.models import BasicCard, Category, ClusterCard, CustomCard, Sticker
+from cards.translations import rebuild_card_texts
+from common.content import bump_content_version
+from common.helpers import console
+from devices.models import Device, Profile, ScreenFlow
+from global_settings.models import GlobalSetting
+from sync.services import suspend_tracking, sync_changes
+
+
+LANGUAGES = (
+    'en', 'es', 'pt', 'fr', 'de', 'it', 'nl', 'sv', 'no', 'da',
+    'fi', 'pl', 'cs', 'sk', 'hu', 'ro', 'bg', 'el', 'tr', 'ru',
+    'uk', 'ar', 'he', 'hi', 'bn', 'th', 'vi', 'id', 'ja', 'ko',
+    'zh', 'ms', 'tl', 'fa', 'sw', 'hr', 'sr', 'sl', 'lt', 'lv',
+)
+
+WORDS = (
+    'take', 'make', 'get', 'go', 'come', 'look', 'turn', 'put', 'break', 'run',
+    'off', 'up', 'down', 'over', 'out', 'through', 'into', 'away', 'back', 'around',
+    'time', 'work', 'home', 'day', 'way', 'thing', 'idea', 'plan', 'deal', 'point',
+)
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Carga un catalogo sintetico de tamano configurable para los benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--basic-cards', type=int, default=3000)
+        parser.add_argument('--cluster-cards', type=int, default=300)
+        parser.add_argument('--languages', type=int, default=30)
+        parser.add_argument('--stickers', type=int, default=60)
+        parser.add_argument('--devices', type=int, default=20)
+        parser.add_argument('--custom-cards', type=int, default=200,
+                            help='Custom cards por device.')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Fuerza la ejecución del comando.',
+        )
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    SEED BENCHMARK              ')
+        console.info('--------------------------------')
+
+        if not settings.DEBUG and not options['force']:
+            self.stdout.write(self.style.ERROR(
+                'Proceso abortado. Debes incluir --force para ejecutar este comando.'))
+            return
+
+        try:
+            self.random = random.Random(options['seed'])
+            self.languages = LANGUAGES[:options['languages']]
+
+            with transaction.atomic(), suspend_tracking():
+                self.delete_all()
+                stickers = self.seed_stickers(options['stickers'])
+                basic_codes = self.seed_basic_cards(options['basic_cards'])
+                cluster_codes = self.seed_cluster_cards(options['cluster_cards'], basic_codes)
+                category_codes = self.seed_categories(options['categories'], basic_codes, cluster_codes)
+                self.seed_settings(category_codes)
+                self.seed_devices(options['devices'], options['custom_cards'], stickers)
+                # bulk_create no pasa por el signal que arma BasicCardText
+                rebuild_card_texts()
+
+            # bulk_create no dispara signals
+            for scope in ('cards', 'stickers', 'settings'):
+                bump_content_version(scope)
+            sync_changes()
+
+            console.info('Done')
+
+        except Exception as e:
+            traceback.print_exc()
+            console.error('Process Failed!')
+
+    def delete_all(self):
+        ScreenFlow.objects.all().delete()
+        CustomCard.objects.all().delete()
+        Profile.objects.all().delete()
+        Device.objects.all().delete()
+        Category.objects.all().delete()
+        BasicCard.objects.all().delete()
+        ClusterCard.objects.all().delete()
+        Sticker.objects.all().delete()
+        console.info('[x] Deleted existing catalogue and devices')
+
+    def phrase(self, length=4):
+        return ' '.join(self.random.choice(WORDS) for _ in range(length))
+
+    def translated(self, length=4):
+        text = self.phrase(length)
+        return [{'code': lang, 'text': f'{text} [{lang}]'} for lang in self.languages]
+
+    def media_url(self, chunk):
+        return f'{settings.SITE_DOMAIN}/media/{chunk}'
+
+    def seed_stickers(self, total):
+        stickers = [
+            Sticker(
+                code=f's{i:05d}',
+                visible=True,
+                image_url=self.media_url(f'stickers/s{i:05d}.png'),
+                cover_url=self.media_url(f'stickers/covers/s{i:05d}.png'),
+            )
+            for i in range(total)
+        ]
+        Sticker.objects.bulk_create(stickers, batch_size=BATCH_SIZE)
+        console.info(f'[x] {total} stickers')
+        return [sticker.code for sticker in stickers]
+
+    def seed_basic_cards(self, total):
+        media = 'cards/basic_cards'
+        codes = []
+        cards = []
+        for i in range(total):
+            code = f'b{i:06d}'
+            codes.append(code)
+            cards.append(BasicCard(
+                code=code,
+                phrase=self.translated(),
+                meaning=self.translated(12),
+                image_url=self.media_url(f'{media}/imgs/{code}.jpg'),
+                cover_url=self.media_url(f'{media}/covers/{code}.jpg'),
+                voice={
+                    'voice_url': self.media_url(f'{media}/audios/{code}.mp3'),
+                    'duration': round(self.random.uniform(2, 20), 3),
+                    'voice_script': self.phrase(20),
+                },
+                examples=[{
+                    'example': self.translated(10),
+                    'image_url': self.media_url(f'{media}/ex_imgs/{code}_{j}.jpg'),
+                    'image_variants': None,
+                } for j in range(3)],
+                scenarios=[{
+                    'allowed_answers': 3,
+                    'title': self.translated(8),
+                    'answers': [self.translated(6) for _ in range(3)],
+                    'image_url': self.media_url(f'{media}/sce_imgs/{code}_{j}.jpg'),
+                    'image_variants': None,
+                } for j in range(2)],
+                explanations=[self.translated(25) for _ in range(2)],
+                vocabs=[{
+                    'phrase': self.translated(2),
+                    'matches': [self.phrase(2)],
+                    'meaning': self.phrase(8),
+                    'examples': [self.phrase(8) for _ in range(2)],
+                } for _ in range(2)],
+                compare=[{
+                    'text': self.translated(10),
+                    'bold': [self.phrase(1)],
+                } for _ in range(2)],
+                images=None,
+                visible=True,
+                status=1,
+            ))
+
+            if len(cards) == BATCH_SIZE:
+                BasicCard.objects.bulk_create(cards)
+                cards = []
+
+        BasicCard.objects.bulk_create(cards)
+        console.info(f'[x] {total} basic cards x {len(self.languages)} languages')
+        return codes
+
+    def seed_cluster_cards(self, total, basic_codes):
+        media = 'cards/cluster_cards'
+        codes = []
+        cards = []
+        for i in range(total):
+            code = f'c{i:06d}'
+            codes.append(code)
+            members = self.random.sample(basic_codes, min(8, len(basic_codes)))
+            cards.append(ClusterCard(
+                code=code,
+                title=self.phrase(3)[:50],
+                image_url=self.media_url(f'{media}/imgs/{code}.jpg'),
+                cover_url=self.media_url(f'{media}/covers/{code}.jpg'),
+                cluster=[{'code': member, 'title': self.phrase(3)} for member in members],
+                status=1,
+            ))
+        ClusterCard.objects.bulk_create(cards, batch_size=BATCH_SIZE)
+        console.info(f'[x] {total} cluster cards')
+        return codes
+
+    def seed_categories(self, total, basic_codes, cluster_codes):
+        codes = []
+        basic_links, cluster_links = [], []
+        for i in range(total):
+            code = f'cat{i:03d}'
+            codes.append(code)
+            basic = self.random.sample(basic_codes, min(30, len(basic_codes)))
+            cluster = self.random.sample(cluster_codes, min(6, len(cluster_codes)))
+            collection_items = self.random.sample(basic_codes, min(10, len(basic_codes)))
+
+            category = Category.objects.create(
+                name=f'Category {i}',
+                code=code,
+                tab_height=1,
+                cards=[
+                    {'type': 'basic_cards', 'card_codes': basic[:15]},
+                    {'type': 'collections', 'collections': [{
+                        'title': self.phrase(2),
+                        'items': [{
+                            'mini_url': self.media_url(f'mini/{item}.jpg'),
+                            'mini_variants': None,
+                            'phrase': self.phrase(3),
+                            'code': item,
+                        } for item in collection_items],
+                    }]},
+                    {'type': 'cluster_cards', 'card_codes': cluster},
+                    {'type': 'basic_cards', 'card_codes': basic[15:]},
+                ],
+            )
+            basic_links.append((category.id, basic))
+            cluster_links.append((category.id, cluster))
+
+        basic_ids = dict(BasicCard.objects.values_list('code', 'id'))
+        cluster_ids = dict(ClusterCard.objects.values_list('code', 'id'))
+        BasicThrough = Category.basic_cards.through
+        ClusterThrough = Category.cluster_cards.through
+        BasicThrough.objects.bulk_create([
+            BasicThrough(category_id=category_id, basiccard_id=basic_ids[code])
+            for category_id, members in basic_links for code in members
+        ], batch_size=BATCH_SIZE)
+        ClusterThrough.objects.bulk_create([
+            ClusterThrough(category_id=category_id, clustercard_id=cluster_ids[code])
+            for category_id, members in cluster_links for code in members
+        ], batch_size=BATCH_SIZE)
+
+        console.info(f'[x] {total} categories')
+        return codes
+
+    def seed_settings(self, category_codes):
+        values = {
+            'cards_settings': {'category_order': category_codes},
+            'languages_settings': {
+                'language_version': '1',
+                'languages': [{
+                    'code': lang,
+                    'name': lang.upper(),
+                    'image_url': self.media_url(f'langs/{lang}.png'),
+                } for lang in self.languages],
+            },
+            'mobile_settings': {'current_version': '1.0.0', 'min_version': '1.0.0'},
+        }
+        for setting_type, extras in values.items():
+            GlobalSetting.objects.filter(type=setting_type).delete()
+            GlobalSetting.objects.create(type=setting_type, extras=extras)
+        console.info('[x] Global settings')
+
+    def seed_devices(self, total, custom_cards, stickers):
+        devices = [Device() for _ in range(total)]
+        Device.objects.bulk_create(devices, batch_size=BATCH_SIZE)
+        Profile.objects.bulk_create(
+            [Profile(device=device) for device in devices], batch_size=BATCH_SIZE)
+
+        cards = []
+        for device in devices:
+            for _ in range(custom_cards):
+                cards.append(CustomCard(
+                    device=device,
+                    phrase=self.phrase(4),
+                    meaning=self.phrase(10),
+                    sticker_code=self.random.choice(stickers),
+                    status=1,
+                ))
+        CustomCard.objects.bulk_create(cards, batch_size=BATCH_SIZE)
+        console.info(f'[x] {total} devices with {custom_cards} custom cards each')
@@ -0,0 +1,138 @@
+"""
+Benchmark de descargas parciales (Range) de los audios de las cards.
+
+Simula reproductores que adelantan o retoman el audio: N hilos piden
+rangos aleatorios del mismo archivo y se compara contra bajar el archivo
+completo en cada pedido. Verifica que cada respuesta sea 206 con el largo
+pedido.
+
+Uso (desde /app):
+    python -m benchmarks.range_test --url http://localhost/media/cards/basic_cards/audios/card0.mp3
+    python -m benchmarks.range_test --url ... --output after.json --baseline before.json
+"""
+
+import argparse
+import random
+import threading
+import time
+
+import requests
+
+from benchmarks.stats import (
+    compare_results,
+    load_results,
+    save_results,
+    summarize,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark de pedidos Range.')
+    parser.add_argument('--url', required=True)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='Pedidos por modo, repartidos entre los hilos.')
+    parser.add_argument('--chunk', type=int, default=64 * 1024,
+                        help='Bytes por rango.')
+    parser.add_argument('--app-version', default='1.0.0')
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--baseline', default=None)
+    return parser.parse_args()
+
+
+def new_session(args):
+    session = requests.Session()
+    session.headers['App-Version'] = args.app_version
+    return session
+
+
+def probe(args):
+    response = new_session(args).head(args.url)
+    response.raise_for_status()
+    if response.headers.get('Accept-Ranges') != 'bytes':
+        print(f"Accept-Ranges: {response.headers.get('Accept-Ranges')!r}")
+    return int(response.headers['Content-Length'])
+
+
+def fetch(args, size, total, ranged, results, lock):
+    session = new_session(args)
+    latencies, transferred, errors = [], 0, 0
+
+    for _ in range(total):
+        headers = {}
+        expected_status, expected_length = 200, size
+        if ranged:
+            start = random.randrange(0, max(size - args.chunk, 1))
+            end = min(start + args.chunk, size) - 1
+            headers['Range'] = f'bytes={start}-{end}'
+            expected_status, expected_length = 206, end - start + 1
+
+        begin = time.perf_counter()
+        try:
+            response = session.get(args.url, headers=headers)
+            body = response.content
+            ok = response.status_code == expected_status and len(body) == expected_length
+        except requests.RequestException:
+            ok, body = False, b''
+        elapsed = time.perf_counter() - begin
+
+        if ok:
+            latencies.append(elapsed)
+            transferred += len(body)
+        else:
+            errors += 1
+
+    with lock:
+        results['latencies'].extend(latencies)
+        results['bytes'] += transferred
+        results['errors'] += errors
+
+
+def run_mode(args, size, ranged):
+    results = {'latencies': [], 'bytes': 0, 'errors': 0}
+    lock = threading.Lock()
+    per_thread = max(args.requests // args.concurrency, 1)
+
+    threads = [
+        threading.Thread(target=fetch, args=(args, size, per_thread, ranged, results, lock))
+        for _ in range(args.concurrency)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results['latencies'], elapsed)
+    summary['errors'] = results['errors']
+    summary['mb'] = round(results['bytes'] / 1024 / 1024, 2)
+    return summary
+
+
+def main():
+    args = parse_args()
+    size = probe(args)
+    print(f'url={args.url} size={size} concurrency={args.concurrency} chunk={args.chunk}')
+
+    results = {
+        'range': run_mode(args, size, ranged=True),
+        'full': run_mode(args, size, ranged=False),
+    }
+
+    for name, summary in results.items():
+        print(f"{name:<6} rps={summary.get('rps')} p50={summary['p50']}ms "
+              f"p99={summary['p99']}ms mb={summary['mb']} errors={summary['errors']}")
+
+    if args.baseline:
+        for line in compare_results(results, load_results(args.baseline)):
+            print(line)
+
+    if args.output:
+        save_results(args.output, results)
+        print(f'Resultados guardados en {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import json
+import os
+
+
+def percentile(sorted_values, pct):
+    """
+    Percentil por rango mas cercano sobre una lista ya ordenada.
+    """
+    if not sorted_values:
+        return None
+    index = max(0, int(round(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def summarize(latencies, elapsed=None):
+    """
+    Resume una lista de latencias (en segundos) en milisegundos.
+
+    Args:
+    latencies (list): Latencias de cada request.
+    elapsed (float): Duracion total del run, para calcular el throughput.
+
+    Returns:
+    dict: count, rps, p50, p90, p99, max y mean.
+    """
+    values = sorted(latencies)
+    count = len(values)
+
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    summary = {
+        'count': count,
+        'mean': ms(sum(values) / count) if count else None,
+        'p50': ms(percentile(values, 50)),
+        'p90': ms(percentile(values, 90)),
+        'p99': ms(percentile(values, 99)),
+        'max': ms(values[-1]) if count else None,
+    }
+
+    if elapsed:
+        summary['rps'] = round(count / elapsed, 1)
+
+    return summary
+
+
+def save_results(path, results):
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_results(current, baseline, metrics=('rps', 'p99')):
+    """
+    Compara dos resultados {nombre: resumen} y devuelve lineas legibles
+    con la variacion porcentual de cada metrica.
+    """
+    lines = []
+    for name, summary in current.items():
+        previous = (baseline or {}).get(name)
+        if not previous:
+            lines.append(f'{name}: no baseline')
+            continue
+
+        parts = []
+        for metric in metrics:
+            new, old = summary.get(metric), previous.get(metric)
+            if new is None or not old:
+                continue
+            delta = (new - old) / old * 100
+            parts.append(f'{metric} {old} -> {new} ({delta:+.1f}%)')
+
+        lines.append(f'{name}: ' + ', '.join(parts))
+    return lines
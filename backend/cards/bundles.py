@@ -0,0 +1,207 @@
+"""
+Bundles offline de cards para la app.
+
+Un bundle junta el detalle de todas las cards de una categoria (o de todo
+el catalogo) en un idioma, mas la lista de URLs de media que usan, para
+que la app lo baje de una vez y funcione sin conexion. Se escriben en
+MEDIA_ROOT/bundles/<lang>/<nombre>.json (y .json.gz, que nginx sirve con
+gzip_static) y se listan en el manifest 'bundles'.
+
+La version de cada bundle es el hash de su contenido: un bundle que no
+cambio no se reescribe y mantiene su URL.
+"""
+
+import gzip
+import hashlib
+import os
+from datetime import datetime
+
+from django.conf import settings
+
+from assets.manifests import load_manifest, save_manifest
+from cards.models import BasicCard, Category, ClusterCard
+from cards.services import format_basic_card, format_cluster_card
+from common.content import ContentMemo, bump_content_version
+from common.models import Status as StatusModel
+from common.renderers import dumps
+
+
+def collect_media(value, urls):
+    # Todas las URLs (claves *_url y 'url') dentro del documento
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, str) and (key == 'url' or key.endswith('_url')):
+                urls.add(item)
+            else:
+                collect_media(item, urls)
+    elif isinstance(value, list):
+        for item in value:
+            collect_media(item, urls)
+    return urls
+
+
+def category_card_codes(category, cluster_cards):
+    """
+    Codigos de las basic y cluster cards que se ven desde una categoria,
+    incluyendo las colecciones y los miembros de sus clusters.
+    """
+    basic, cluster = [], []
+    for block in category.cards or []:
+        if block['type'] == 'basic_cards':
+            basic.extend(block['card_codes'])
+        if block['type'] == 'cluster_cards':
+            cluster.extend(block['card_codes'])
+        if block['type'] == 'collections':
+            for collection in block['collections']:
+                basic.extend(item['code'] for item in collection['items'])
+
+    for code in cluster:
+        card = cluster_cards.get(code)
+        if card:
+            basic.extend(item['code'] for item in card.cluster or [] if 'code' in item)
+
+    return list(dict.fromkeys(basic)), list(dict.fromkeys(cluster))
+
+
+def bundle_document(lang_code, name, basic_codes, cluster_codes, basic_cards, cluster_cards):
+    cards = {
+        'basic': {
+            code: format_basic_card(basic_cards[code], lang_code)
+            for code in basic_codes if code in basic_cards
+        },
+        'cluster': {
+            code: format_cluster_card(cluster_cards[code], lang_code)
+            for code in cluster_codes if code in cluster_cards
+        },
+    }
+    return {
+        'lang': lang_code,
+        'bundle': name,
+        'cards': cards,
+        'media': sorted(collect_media(cards, set())),
+    }
+
+
+def write_bundle(relpath, body):
+    path = os.path.join(settings.MEDIA_ROOT, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    for target, content in ((path, body), (f'{path}.gz', gzip.compress(body, compresslevel=9, mtime=0))):
+        tmp_path = f'{target}.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(content)
+        os.replace(tmp_path, target)
+
+
+def bundle_url(relpath, version):
+    return f'{settings.SITE_DOMAIN}/media/{relpath}?v={version}'
+
+
+def build_bundles(languages, category_codes=None, force=False, log=None):
+    """
+    Arma el bundle 'all' y uno por categoria para cada idioma.
+
+    Args:
+    languages (list): Codigos de idioma.
+    category_codes (list): Solo estas categorias (y sin 'all').
+    force (bool): Reescribe aunque el contenido no haya cambiado.
+    log (callable): Recibe una linea por bundle escrito.
+
+    Returns:
+    dict: built, unchanged y removed (claves '<lang>/<nombre>').
+    """
+    log = log or (lambda msg: None)
+
+    # Todo el catalogo en dos queries; el resto es formatear en memoria
+    basic_cards = {
+        card.code: card for card in BasicCard.objects.filter(status=StatusModel.ACTIVE)}
+    cluster_cards = {
+        card.code: card for card in ClusterCard.objects.filter(status=StatusModel.ACTIVE)}
+    categories = Category.objects.filter(status=StatusModel.ACTIVE).order_by('id')
+    if category_codes:
+        categories = categories.filter(code__in=category_codes)
+
+    scopes = []
+    if not category_codes:
+        scopes.append(('all', list(basic_cards), list(cluster_cards)))
+    for category in categories:
+        basic, cluster = category_card_codes(category, cluster_cards)
+        scopes.append((f'category-{category.code}', basic, cluster))
+
+    index = load_manifest('bundles')
+    built, unchanged, produced = [], [], set()
+
+    for lang_code in languages:
+        for name, basic, cluster in scopes:
+            key = f'{lang_code}/{name}'
+            relpath = f'bundles/{key}.json'
+            produced.add(key)
+
+            document = bundle_document(lang_code, name, basic, cluster, basic_cards, cluster_cards)
+            body = dumps(document)
+            version = hashlib.sha1(body).hexdigest()[:12]
+
+            previous = index.get(key)
+            if not force and previous and previous['version'] == version \
+                    and os.path.exists(os.path.join(settings.MEDIA_ROOT, relpath)):
+                unchanged.append(key)
+                continue
+
+            write_bundle(relpath, body)
+            index[key] = {
+                'lang': lang_code,
+                'name': name,
+                'path': relpath,
+                'version': version,
+                'bytes': len(body),
+                'gzip_bytes': os.path.getsize(os.path.join(settings.MEDIA_ROOT, f'{relpath}.gz')),
+                'cards': len(document['cards']['basic']) + len(document['cards']['cluster']),
+                'media': len(document['media']),
+                'built': datetime.now().isoformat(timespec='seconds'),
+            }
+            built.append(key)
+            log(f"{key} ({index[key]['cards']} cards, {index[key]['gzip_bytes']} bytes gz)")
+
+    removed = []
+    if not category_codes:
+        # Bundles de idiomas o categorias que ya no existen
+        removed = [key for key in index if key not in produced]
+        for key in removed:
+            relpath = index.pop(key)['path']
+            for path in (relpath, f'{relpath}.gz'):
+                try:
+                    os.remove(os.path.join(settings.MEDIA_ROOT, path))
+                except FileNotFoundError:
+                    pass
+
+    save_manifest('bundles', index)
+    if built or removed:
+        bump_content_version('bundles')
+
+    return {'built': built, 'unchanged': unchanged, 'removed': removed}
+
+
+def load_bundle_index():
+    """
+    Bundles publicados agrupados por idioma, tal como los lista la API.
+    """
+    by_lang = {}
+    for entry in load_manifest('bundles').values():
+        by_lang.setdefault(entry['lang'], []).append({
+            'name': entry['name'],
+            'url': bundle_url(entry['path'], entry['version']),
+            'version': entry['version'],
+            'bytes': entry['bytes'],
+            'gzip_bytes': entry['gzip_bytes'],
+            'cards': entry['cards'],
+        })
+    for bundles in by_lang.values():
+        bundles.sort(key=lambda bundle: (bundle['name'] != 'all', bundle['name']))
+    return by_lang
+
+
+_bundle_index = ContentMemo('bundles', load_bundle_index)
+
+
+def get_bundles(lang_code):
+    return _bundle_index.get().get(lang_code)
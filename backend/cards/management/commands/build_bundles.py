@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from cards.bundles import build_bundles
+from common.helpers import console
+from global_settings.services import get_languages_info
+import time
+import traceback
+
+
+class Command(BaseCommand):
+    help = 'Arma los bundles offline (detalle de cards + media) por idioma y categoria'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lang',
+            default=None,
+            help='Idiomas separados por coma (por defecto, todos los configurados).',
+        )
+        parser.add_argument(
+            '--category',
+            default=None,
+            help='Categorias separadas por coma (por defecto, todas y el bundle completo).',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Reescribe todo aunque el contenido no haya cambiado.',
+        )
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    BUILD BUNDLES               ')
+        console.info('--------------------------------')
+
+        try:
+            if options['lang']:
+                languages = options['lang'].split(',')
+            else:
+                languages = [lang['code'] for lang in get_languages_info()['languages']]
+
+            category_codes = options['category'].split(',') if options['category'] else None
+
+            start = time.perf_counter()
+            result = build_bundles(
+                languages,
+                category_codes=category_codes,
+                force=options['rebuild'],
+                log=console.info,
+            )
+            elapsed = time.perf_counter() - start
+
+            console.info(
+                f"Built: {len(result['built'])}, unchanged: {len(result['unchanged'])}, "
+                f"removed: {len(result['removed'])} ({elapsed:.1f}s)")
+            console.info('Done')
+
+        except Exception as e:
+            traceback.print_exc()
+            console.error('Process Failed!')
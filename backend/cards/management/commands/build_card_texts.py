@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from cards.translations import rebuild_card_texts
+from common.helpers import console
+import time
+import traceback
+
+
+class Command(BaseCommand):
+    help = 'Rearma BasicCardText (contenido por idioma) desde las columnas JSON de BasicCard'
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    BUILD CARD TEXTS            ')
+        console.info('--------------------------------')
+
+        try:
+            started = time.monotonic()
+            total = rebuild_card_texts()
+            console.info(f'{total} cards ({time.monotonic() - started:.1f}s)')
+            console.info('Done')
+
+        except Exception as e:
+            traceback.print_exc()
+            console.error('Process Failed!')
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from cards.memberships import rebuild_category_memberships
+from common.helpers import console
+import time
+import traceback
+
+
+class Command(BaseCommand):
+    help = 'Rearma CategoryMembership (orden de las cards de cada categoria) desde Category.cards'
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    BUILD CATEGORY MEMBERSHIPS  ')
+        console.info('--------------------------------')
+
+        try:
+            started = time.monotonic()
+            total = rebuild_category_memberships()
+            console.info(f'{total} memberships ({time.monotonic() - started:.1f}s)')
+            console.info('Done')
+
+        except Exception as e:
+            traceback.print_exc()
+            console.error('Process Failed!')
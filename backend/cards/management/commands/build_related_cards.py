@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from cards.related import NLTK_CORPORA, build_related_cards
+from common.helpers import console
+import nltk
+import time
+import traceback
+
+
+class Command(BaseCommand):
+    help = 'Rearma RelatedCard (cards parecidas por TF-IDF sobre el texto en ingles)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=None,
+                            help='Cards relacionadas por card (por defecto RELATED_CARDS TOP_K).')
+        parser.add_argument('--min-score', type=float, default=None)
+        parser.add_argument('--max-df', type=float, default=None,
+                            help='Descarta los terminos presentes en mas de esta fraccion de cards.')
+        parser.add_argument(
+            '--download',
+            action='store_true',
+            help='Descarga antes los corpus de nltk que usa (wordnet, stopwords).',
+        )
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    BUILD RELATED CARDS         ')
+        console.info('--------------------------------')
+
+        try:
+            if options['download']:
+                for corpus in NLTK_CORPORA:
+                    nltk.download(corpus, quiet=True)
+
+            started = time.monotonic()
+            result = build_related_cards(
+                top_k=options['top_k'],
+                min_score=options['min_score'],
+                max_df=options['max_df'],
+                log=console.info,
+            )
+            console.info(
+                f"{result['rows']} related cards for {result['cards']} cards, "
+                f"{result['terms']} terms ({time.monotonic() - started:.1f}s)")
+            console.info('Done')
+
+        except Exception as e:
+            traceback.print_exc()
+            console.error('Process Failed!')
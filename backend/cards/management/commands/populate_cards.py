@@ -1,8 +1,14 @@
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from django.db import transaction
+from cards.memberships import rebuild_category_memberships, suspend_card_sync
 from cards.models import BasicCard, ClusterCard, Category
 from common.helpers import console, read_JSON_file as read_JSON
+from assets.audio import get_audio_duration
+from assets.images import get_image_variants
+from assets.manifests import load_manifest
+from assets.versioning import VersionedMediaURLs
+from sync.services import suspend_tracking, sync_changes
 import traceback
 from django.db import connection
 
@@ -29,9 +35,18 @@ class Command(BaseCommand):
         try:
             self.work_dir = 'data/populate'
             self.IMG_EXTENSION = 'jpg'
-            self.delete_all()
-            self.populate_categories()
-            self.populate_cards()
+            self.image_manifest = load_manifest('images')
+            self.audio_manifest = load_manifest('audio')
+            self.media_urls = VersionedMediaURLs()
+            # El change log se compara al final: borrar y recrear una card
+            # igual no es un cambio para la app
+            with suspend_tracking(), suspend_card_sync():
+                self.delete_all()
+                self.populate_categories()
+                self.populate_cards()
+                self.populate_memberships()
+            self.media_urls.save()
+            self.log_changes(sync_changes(['basic_card', 'cluster_card', 'category']))
             console.info('Done')
 
         except Exception as e:
@@ -52,6 +67,11 @@ class Command(BaseCommand):
             for category_data in categories:
                 self.create_cards(category_data)
 
+    def populate_memberships(self):
+        # Las categorias se crean antes que sus cards: el orden se arma al final
+        total = rebuild_category_memberships()
+        console.info(f'[x] Category memberships: {total}')
+
     def create_category(self, category_data):
         console.info('Creating category: ' + category_data['name'])
 
@@ -76,6 +96,7 @@ class Command(BaseCommand):
                         mini_url = self.create_url(f'mini/{item_code}.{self.IMG_EXTENSION}')
                         collec_items.append({
                             "mini_url": mini_url,
+                            "mini_variants": self.image_variants(f'mini/{item_code}.{self.IMG_EXTENSION}'),
                             "phrase": item['phrase'],
                             "code": item_code,
                         })
@@ -145,7 +166,8 @@ class Command(BaseCommand):
             for i in range(ex_length):
                 examples.append({
                     'example': read_JSON(f'{transl}/examples/{code}_{i}.json'),
-                    'image_url': self.create_url(f'{media}/ex_imgs/{code}_{i}.{self.IMG_EXTENSION}')
+                    'image_url': self.create_url(f'{media}/ex_imgs/{code}_{i}.{self.IMG_EXTENSION}'),
+                    'image_variants': self.image_variants(f'{media}/ex_imgs/{code}_{i}.{self.IMG_EXTENSION}'),
                 })
 
         # --------------- Scenarios ---------------------
@@ -166,6 +188,7 @@ class Command(BaseCommand):
                 scenario['title'] = title_obj
                 scenario['answers'] = answers
                 scenario['image_url'] = self.create_url(f'{media}/sce_imgs/{code}_{i}.{self.IMG_EXTENSION}')
+                scenario['image_variants'] = self.image_variants(f'{media}/sce_imgs/{code}_{i}.{self.IMG_EXTENSION}')
                 scenarios.append(scenario)
 
         # --------------- Explanation ---------------------
@@ -182,9 +205,12 @@ class Command(BaseCommand):
         voice = None;
         voice_json = read_JSON(f'{content}/voices/{code}.json')
         if voice_json:
+            # La duracion sale del indice de audio (`index_audio`); el valor
+            # del JSON queda solo para archivos que no se indexaron
+            duration = get_audio_duration(self.audio_manifest, f'{media}/audios/{code}.mp3')
             voice = {
                 "voice_url": self.create_url(f'{media}/audios/{code}.mp3'),
-                "duration": voice_json['duration'],
+                "duration": duration if duration is not None else voice_json.get('duration'),
                 "voice_script": voice_json['voice_script']
             }
 
@@ -225,6 +251,10 @@ class Command(BaseCommand):
             explanations=self.return_list_or_none(explanations),
             vocabs=self.return_list_or_none(vocab_list),
             compare=self.return_list_or_none(compare_list),
+            images={
+                'image': self.image_variants(f'{media}/imgs/{code}.{self.IMG_EXTENSION}'),
+                'cover': self.image_variants(f'{media}/covers/{code}.{self.IMG_EXTENSION}'),
+            },
             visible=card_data['visible'],
             status=1,
         )
@@ -244,6 +274,10 @@ class Command(BaseCommand):
             image_url=self.create_url(f'{media}/imgs/{card_code}.{self.IMG_EXTENSION}'),
             cover_url=self.create_url(f'{media}/covers/{card_code}.{self.IMG_EXTENSION}'),
             cluster=cluster,
+            images={
+                'image': self.image_variants(f'{media}/imgs/{card_code}.{self.IMG_EXTENSION}'),
+                'cover': self.image_variants(f'{media}/covers/{card_code}.{self.IMG_EXTENSION}'),
+            },
             status=1
         )
         card.save()
@@ -262,9 +296,27 @@ class Command(BaseCommand):
             
         console.info('[x] Deleted existing cards')
 
+    def log_changes(self, changes):
+        for kind, changed in changes.items():
+            console.info(f'[x] Change log ({kind}): {changed} changed')
+
     def create_url(self, chunk):
-        media = settings.SITE_DOMAIN + '/media'
-        return f"{media}/{chunk}" if chunk else None
+        # URL con ?v=<hash> para que se pueda cachear como inmutable
+        return self.media_urls.url(chunk)
     
+    def image_variants(self, chunk):
+        # Tamanos y formatos generados por `build_images` para esta imagen
+        variants = get_image_variants(self.image_manifest, chunk)
+        if not variants:
+            return None
+
+        return [{
+            'url': self.create_url(variant['path']),
+            'format': variant['format'],
+            'width': variant['width'],
+            'height': variant['height'],
+            'bytes': variant['bytes'],
+        } for variant in variants]
+
     def return_list_or_none(self, lst):
         return lst if lst else None
@@ -3,6 +3,8 @@ from django.conf import settings
 from django.db import transaction
 from cards.models import Sticker
 from common.helpers import console, read_JSON_file as read_JSON
+from assets.versioning import VersionedMediaURLs
+from sync.services import suspend_tracking, sync_changes
 import traceback
 from django.db import connection
 
@@ -28,8 +30,13 @@ class Command(BaseCommand):
 
         try:
             self.work_dir = 'data/populate'
-            self.delete_all_stikers()
-            self.populate_stickers()
+            self.media_urls = VersionedMediaURLs()
+            with suspend_tracking():
+                self.delete_all_stikers()
+                self.populate_stickers()
+            self.media_urls.save()
+            changed = sync_changes(['sticker'])['sticker']
+            console.info(f'[x] Change log (sticker): {changed} changed')
             console.info('Done')
         except Exception as e:
             traceback.print_exc()
@@ -69,6 +76,5 @@ class Command(BaseCommand):
         console.info('[x] Deleted existing stickers')
 
     def create_url(self, chunk):
-        media = settings.SITE_DOMAIN + '/media'
-        return f"{media}/{chunk}" if chunk else None
+        return self.media_urls.url(chunk)
         
@@ -0,0 +1,230 @@
+"""
+Membresia ordenada de cards por categoria.
+
+Category.cards guarda los bloques del feed con listas de codigos
+(card_codes). CategoryMembership tiene una fila por cada card de esos
+bloques, con el id de la card y su posicion, para que el feed salga de un
+solo join ordenado en vez de buscar cada codigo por separado.
+
+Las filas se comparan con Category.cards en cada save de la categoria y
+solo se escriben las posiciones que cambiaron, asi reordenar un bloque es
+un UPDATE de esas filas. Crear, borrar o cambiar el codigo de una card
+vuelve a comparar las categorias que la nombran (ver cards.signals).
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from cards.models import BasicCard, Category, CategoryMembership, ClusterCard
+from common.models import Status as StatusModel
+
+
+CARD_BLOCKS = {
+    'basic_cards': 'basic',
+    'cluster_cards': 'cluster',
+}
+
+_state = threading.local()
+
+
+def card_ids(model, codes=None):
+    """
+    code -> id; si un codigo esta repetido gana la card activa.
+    """
+    rows = model.objects.order_by('status', 'id').values_list('code', 'id')
+    if codes is not None:
+        rows = rows.filter(code__in=codes)
+    return dict(rows)
+
+
+def category_slots(category, basic_ids, cluster_ids):
+    """
+    (block, position) -> (card_type, card_id) segun Category.cards. Los
+    codigos que no existen no tienen fila.
+    """
+    ids = {'basic': basic_ids, 'cluster': cluster_ids}
+    slots = {}
+    for block, item in enumerate(category.cards or []):
+        card_type = CARD_BLOCKS.get(item['type'])
+        if card_type is None:
+            continue
+        for position, code in enumerate(item['card_codes']):
+            card_id = ids[card_type].get(code)
+            if card_id is not None:
+                slots[(block, position)] = (card_type, card_id)
+    return slots
+
+
+def block_codes(category):
+    codes = {'basic': set(), 'cluster': set()}
+    for item in category.cards or []:
+        card_type = CARD_BLOCKS.get(item['type'])
+        if card_type is not None:
+            codes[card_type].update(item['card_codes'])
+    return codes
+
+
+def membership(category, block, position, card_type, card_id, model=CategoryMembership):
+    return model(
+        category=category,
+        block=block,
+        position=position,
+        card_type=card_type,
+        basic_card_id=card_id if card_type == 'basic' else None,
+        cluster_card_id=card_id if card_type == 'cluster' else None,
+    )
+
+
+def sync_category_memberships(category):
+    """
+    Ajusta las filas de una categoria a su Category.cards escribiendo solo
+    las diferencias.
+
+    Returns:
+    tuple: (creadas, actualizadas, borradas).
+    """
+    codes = block_codes(category)
+    slots = category_slots(
+        category,
+        card_ids(BasicCard, codes['basic']) if codes['basic'] else {},
+        card_ids(ClusterCard, codes['cluster']) if codes['cluster'] else {},
+    )
+
+    with transaction.atomic():
+        existing = {
+            (row.block, row.position): row
+            for row in CategoryMembership.objects.filter(category=category)
+        }
+
+        created, updated = [], []
+        for slot, (card_type, card_id) in slots.items():
+            row = existing.pop(slot, None)
+            if row is None:
+                created.append(membership(category, *slot, card_type, card_id))
+            elif (row.card_type, row.basic_card_id or row.cluster_card_id) != (card_type, card_id):
+                row.card_type = card_type
+                row.basic_card_id = card_id if card_type == 'basic' else None
+                row.cluster_card_id = card_id if card_type == 'cluster' else None
+                updated.append(row)
+
+        if existing:
+            CategoryMembership.objects.filter(pk__in=[row.pk for row in existing.values()]).delete()
+        CategoryMembership.objects.bulk_create(created)
+        CategoryMembership.objects.bulk_update(updated, ['card_type', 'basic_card', 'cluster_card'])
+
+    return len(created), len(updated), len(existing)
+
+
+@contextmanager
+def suspend_card_sync():
+    """
+    Apaga la sincronizacion por card en este hilo. Lo usan los populate,
+    que crean las cards una por una y al final llaman a
+    `rebuild_category_memberships`.
+    """
+    previous = getattr(_state, 'suspended', False)
+    _state.suspended = True
+    try:
+        yield
+    finally:
+        _state.suspended = previous
+
+
+def sync_card_memberships(card):
+    """
+    Vuelve a comparar las categorias afectadas por un cambio de `card`
+    (BasicCard o ClusterCard): las que tienen su codigo en Category.cards
+    y las que ya tenian una fila con su id (ej. si cambio el codigo).
+
+    Returns:
+    int: Cantidad de categorias comparadas.
+    """
+    if getattr(_state, 'suspended', False):
+        return 0
+
+    card_type = 'basic' if isinstance(card, BasicCard) else 'cluster'
+    block_type = next(block for block, value in CARD_BLOCKS.items() if value == card_type)
+
+    category_ids = set(Category.objects.filter(
+        cards__contains=[{'type': block_type, 'card_codes': [card.code]}],
+    ).values_list('id', flat=True))
+    category_ids.update(CategoryMembership.objects.filter(
+        **{f'{card_type}_card_id': card.id},
+    ).values_list('category_id', flat=True))
+
+    categories = Category.objects.filter(id__in=category_ids).only('id', 'cards')
+    for category in categories:
+        sync_category_memberships(category)
+    return len(categories)
+
+
+def rebuild_category_memberships(
+        basic_model=BasicCard, cluster_model=ClusterCard,
+        category_model=Category, membership_model=CategoryMembership):
+    """
+    Rearma la tabla entera (despues de importar el catalogo). Las
+    migraciones pasan sus modelos historicos.
+
+    Returns:
+    int: Cantidad de filas.
+    """
+    basic_ids = card_ids(basic_model)
+    cluster_ids = card_ids(cluster_model)
+
+    rows = []
+    for category in category_model.objects.only('id', 'cards'):
+        for slot, (card_type, card_id) in category_slots(category, basic_ids, cluster_ids).items():
+            rows.append(membership(category, *slot, card_type, card_id, membership_model))
+
+    with transaction.atomic():
+        membership_model.objects.all().delete()
+        membership_model.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def reorder_category_block(category_code, block, card_codes):
+    """
+    Cambia el orden de las cards de un bloque. Tiene que tener los mismos
+    codigos que ya tiene; el save de la categoria actualiza solo las
+    posiciones que se movieron.
+
+    Raises:
+    Category.DoesNotExist: Si la categoria no existe.
+    ValueError: Si el bloque no es de cards o los codigos no coinciden.
+    """
+    category = Category.objects.get(code=category_code, status=StatusModel.ACTIVE)
+    blocks = category.cards or []
+
+    if block >= len(blocks) or blocks[block]['type'] not in CARD_BLOCKS:
+        raise ValueError(f'Block {block} is not a card block')
+    if sorted(blocks[block]['card_codes']) != sorted(card_codes):
+        raise ValueError('card_codes must contain the same cards as the block')
+
+    blocks[block]['card_codes'] = list(card_codes)
+    category.cards = blocks
+    category.save(update_fields=['cards', 'updated'])
+    return category
+
+
+def load_memberships(category_ids):
+    """
+    Cards de los bloques de esas categorias con un solo join ordenado.
+
+    Returns:
+    dict: (category_id, block) -> lista de CategoryMembership con su card
+    cargada, en orden.
+    """
+    rows = CategoryMembership.objects.filter(
+        category_id__in=category_ids,
+    ).select_related('basic_card', 'cluster_card').only(
+        'category_id', 'block', 'position', 'card_type',
+        'basic_card__code', 'basic_card__phrase', 'basic_card__cover_url', 'basic_card__images',
+        'cluster_card__code', 'cluster_card__cover_url', 'cluster_card__images',
+    ).order_by('category_id', 'block', 'position')
+
+    blocks = {}
+    for row in rows:
+        blocks.setdefault((row.category_id, row.block), []).append(row)
+    return blocks
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.6 on 2026-10-19 13:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0008_category_tab_height'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='basiccard',
+            name='images',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='clustercard',
+            name='images',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
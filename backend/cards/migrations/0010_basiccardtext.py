@@ -0,0 +1,39 @@
+# Generated by Django 4.0.6 on 2026-10-19 13:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from cards.translations import rebuild_card_texts
+
+
+def fill_card_texts(apps, schema_editor):
+    # Sin esto CARD_CONTENT_STORAGE = 'normalized' y la busqueda no ven
+    # las cards que ya estaban cargadas
+    rebuild_card_texts(
+        card_model=apps.get_model('cards', 'BasicCard'),
+        text_model=apps.get_model('cards', 'BasicCardText'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0009_basiccard_images_clustercard_images'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BasicCardText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lang', models.CharField(max_length=10)),
+                ('content', models.JSONField()),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='texts', to='cards.basiccard')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='basiccardtext',
+            constraint=models.UniqueConstraint(fields=('card', 'lang'), name='basiccardtext_card_lang'),
+        ),
+        migrations.RunPython(fill_card_texts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.0.6 on 2026-10-19 13:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from cards.memberships import rebuild_category_memberships
+
+
+def fill_memberships(apps, schema_editor):
+    # El feed lee los bloques de cards solo de esta tabla
+    rebuild_category_memberships(
+        basic_model=apps.get_model('cards', 'BasicCard'),
+        cluster_model=apps.get_model('cards', 'ClusterCard'),
+        category_model=apps.get_model('cards', 'Category'),
+        membership_model=apps.get_model('cards', 'CategoryMembership'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0010_basiccardtext'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('block', models.PositiveSmallIntegerField()),
+                ('position', models.PositiveSmallIntegerField()),
+                ('card_type', models.CharField(max_length=10)),
+                ('basic_card', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='cards.basiccard')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='cards.category')),
+                ('cluster_card', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='cards.clustercard')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='categorymembership',
+            constraint=models.UniqueConstraint(fields=('category', 'block', 'position'), name='categorymembership_slot'),
+        ),
+        migrations.RunPython(fill_memberships, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.0.6 on 2026-10-19 13:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0011_categorymembership'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedCard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_cards', to='cards.basiccard')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cards.basiccard')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='relatedcard',
+            constraint=models.UniqueConstraint(fields=('card', 'rank'), name='relatedcard_rank'),
+        ),
+    ]
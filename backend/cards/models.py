@@ -24,15 +24,35 @@ class BasicCard(BaseModel):
     explanations = models.JSONField(blank=True, null=True)
     vocabs = models.JSONField(blank=True, null=True)
     compare = models.JSONField(blank=True, null=True)
+    images = models.JSONField(blank=True, null=True)
     objects = models.Manager()
 
 
+class BasicCardText(models.Model):
+    # Contenido de una basic card en un idioma (ver cards.translations).
+    # lang '' guarda las partes que no dependen del idioma.
+    card = models.ForeignKey(
+        BasicCard,
+        related_name='texts',
+        on_delete=models.CASCADE
+    )
+    lang = models.CharField(max_length=10)
+    content = models.JSONField()
+    objects = models.Manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['card', 'lang'], name='basiccardtext_card_lang'),
+        ]
+
+
 class ClusterCard(BaseModel):
     title = models.CharField(max_length=50)
     image_url = models.TextField()
     cover_url = models.TextField()
     code = models.CharField(max_length=20)
     cluster = models.JSONField()
+    images = models.JSONField(blank=True, null=True)
     objects = models.Manager()
 
 
@@ -58,3 +78,56 @@ class Category(BaseModel):
     cluster_cards = models.ManyToManyField(ClusterCard)
     extras = models.JSONField(blank=True, null=True)
     objects = models.Manager()
+
+
+class CategoryMembership(models.Model):
+    # Cards de los bloques basic_cards/cluster_cards de Category.cards, en
+    # orden (ver cards.memberships). block es el indice en Category.cards.
+    category = models.ForeignKey(
+        Category,
+        related_name='memberships',
+        on_delete=models.CASCADE
+    )
+    block = models.PositiveSmallIntegerField()
+    position = models.PositiveSmallIntegerField()
+    card_type = models.CharField(max_length=10)
+    basic_card = models.ForeignKey(
+        BasicCard,
+        null=True,
+        on_delete=models.CASCADE
+    )
+    cluster_card = models.ForeignKey(
+        ClusterCard,
+        null=True,
+        on_delete=models.CASCADE
+    )
+    objects = models.Manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['category', 'block', 'position'], name='categorymembership_slot'),
+        ]
+
+
+class RelatedCard(models.Model):
+    # Basic cards parecidas a una basic card, de la mas parecida (rank 0)
+    # a la menos. Las arma el job build_related_cards (ver cards.related).
+    card = models.ForeignKey(
+        BasicCard,
+        related_name='related_cards',
+        on_delete=models.CASCADE
+    )
+    related = models.ForeignKey(
+        BasicCard,
+        related_name='+',
+        on_delete=models.CASCADE
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    objects = models.Manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['card', 'rank'], name='relatedcard_rank'),
+        ]
@@ -0,0 +1,264 @@
+"""
+Cards relacionadas.
+
+Un job offline (build_related_cards) pasa el texto en ingles de cada basic
+card activa (frase, significado, ejemplos y vocabulario) por nltk: tokens,
+sin stopwords y lematizados con WordNet, asi 'took off' y 'take off'
+comparten terminos. Con eso arma un vector TF-IDF por card y guarda en
+RelatedCard las cards mas parecidas (coseno) de cada una. El endpoint solo
+lee esa tabla.
+
+Los vectores son ralos (dict termino -> peso) y normalizados; el coseno sale
+de recorrer un indice invertido, asi cada card solo suma contra las cards
+con las que comparte algun termino, sin armar la matriz de N x N. Se hace
+en Python puro: numpy no es una dependencia del proyecto.
+
+Este modulo solo lo importa el job; la API lee la tabla desde
+cards.services, sin cargar nltk.
+"""
+
+import bisect
+import heapq
+import logging
+import math
+
+from django.conf import settings
+from django.db import transaction
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+from nltk.tokenize import RegexpTokenizer
+
+from cards.models import BasicCard, RelatedCard
+from cards.translations import translation_text
+from common.content import bump_content_version
+from common.models import Status as StatusModel
+
+logger = logging.getLogger('api_v1')
+
+
+FIELD_WEIGHTS = {
+    'phrase': 3.0,
+    'vocabs': 2.0,
+    'meaning': 1.0,
+    'examples': 1.0,
+}
+
+# Corpus de nltk que usa el job (ver build_related_cards --download)
+NLTK_CORPORA = ('wordnet', 'omw-1.4', 'stopwords')
+
+# Si no esta el corpus 'stopwords'
+FALLBACK_STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'do', 'for', 'from',
+    'he', 'her', 'his', 'i', 'if', 'in', 'is', 'it', 'its', 'me', 'my', 'not',
+    'of', 'on', 'or', 'our', 'she', 'so', 'that', 'the', 'their', 'them', 'they',
+    'this', 'to', 'was', 'we', 'were', 'what', 'when', 'with', 'you', 'your',
+))
+
+_tokenizer = RegexpTokenizer(r"[a-z]+(?:'[a-z]+)?")
+
+
+class TextAnalyzer:
+    """
+    Texto -> lemas. Sin los corpus de nltk sigue funcionando con una lista
+    corta de stopwords y sin lematizar, y lo avisa en el log.
+    """
+
+    def __init__(self):
+        try:
+            self.stopwords = frozenset(stopwords.words('english'))
+        except LookupError:
+            logger.warning('nltk stopwords corpus not found, using a built-in list')
+            self.stopwords = FALLBACK_STOPWORDS
+
+        self.lemmatizer = WordNetLemmatizer()
+        try:
+            self.lemmatizer.lemmatize('cards')
+        except LookupError:
+            logger.warning('nltk wordnet corpus not found, related cards are built without lemmas')
+            self.lemmatizer = None
+
+        # El vocabulario es chico: cada palabra se lematiza una sola vez
+        self._lemmas = {}
+
+    def lemma(self, word):
+        lemma = self._lemmas.get(word)
+        if lemma is None:
+            lemma = word
+            if self.lemmatizer is not None:
+                # Sin etiquetado gramatical: primero como verbo y despues
+                # como sustantivo ('took' -> 'take', 'ideas' -> 'idea')
+                lemma = self.lemmatizer.lemmatize(self.lemmatizer.lemmatize(word, 'v'), 'n')
+            self._lemmas[word] = lemma
+        return lemma
+
+    def terms(self, text):
+        if not text:
+            return []
+        return [
+            self.lemma(word) for word in _tokenizer.tokenize(text.lower())
+            if len(word) > 1 and word not in self.stopwords
+        ]
+
+
+def card_fields(card):
+    """
+    Textos en ingles de una card por campo de FIELD_WEIGHTS.
+    """
+    return {
+        'phrase': [translation_text(card.phrase, 'en')],
+        'meaning': [translation_text(card.meaning, 'en')],
+        'examples': [translation_text(example['example'], 'en') for example in card.examples or []],
+        'vocabs': [
+            text for vocab in card.vocabs or []
+            for text in (translation_text(vocab['phrase'], 'en'), vocab.get('meaning'))
+            if isinstance(text, str)
+        ],
+    }
+
+
+def term_frequencies(analyzer, fields):
+    frequencies = {}
+    for field, texts in fields.items():
+        weight = FIELD_WEIGHTS[field]
+        for text in texts:
+            for term in analyzer.terms(text):
+                frequencies[term] = frequencies.get(term, 0) + weight
+    return frequencies
+
+
+def tfidf_vectors(documents, max_df=0.5):
+    """
+    Vectores TF-IDF normalizados.
+
+    Args:
+    documents (list): dict termino -> frecuencia (ponderada) por documento.
+    max_df (float): Los terminos que aparecen en mas de esta fraccion de
+    los documentos no distinguen nada y se descartan.
+
+    Returns:
+    list: dict termino -> peso por documento, con norma 1 (vacio si no le
+    queda ningun termino).
+    """
+    total = len(documents)
+    df = {}
+    for frequencies in documents:
+        for term in frequencies:
+            df[term] = df.get(term, 0) + 1
+
+    limit = max_df * total
+    idf = {
+        term: math.log((1 + total) / (1 + count)) + 1
+        for term, count in df.items() if count <= limit
+    }
+
+    vectors = []
+    for frequencies in documents:
+        vector = {
+            term: (1 + math.log(frequency)) * idf[term]
+            for term, frequency in frequencies.items()
+            if term in idf
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        vectors.append({term: weight / norm for term, weight in vector.items()} if norm else {})
+    return vectors
+
+
+def nearest_neighbours(vectors, top_k, min_score=0.0):
+    """
+    Para cada vector, los `top_k` mas parecidos por coseno.
+
+    El coseno es simetrico, asi que cada par se calcula una sola vez: un
+    documento acumula solo contra los que vienen despues (los postings estan
+    ordenados por documento) y el score entra en el top de los dos.
+
+    Returns:
+    list: Por documento, lista de (indice, score) de mayor a menor.
+    """
+    documents, weights = {}, {}
+    for doc_id, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            documents.setdefault(term, []).append(doc_id)
+            weights.setdefault(term, []).append(weight)
+
+    # Un termino de un solo documento no relaciona a nadie
+    shared = {term for term, docs in documents.items() if len(docs) > 1}
+
+    # Heaps de (score, -indice) con los top_k de cada documento; a igual
+    # score queda el de menor indice
+    best = [[] for _ in vectors]
+    scores = [0.0] * len(vectors)
+
+    for doc_id, vector in enumerate(vectors):
+        touched = []
+        for term, weight in vector.items():
+            if term not in shared:
+                continue
+            docs = documents[term]
+            start = bisect.bisect_right(docs, doc_id)
+            for other, other_weight in zip(docs[start:], weights[term][start:]):
+                # Los pesos son positivos: 0 es "todavia no sumo"
+                if not scores[other]:
+                    touched.append(other)
+                scores[other] += weight * other_weight
+
+        for other in touched:
+            score, scores[other] = scores[other], 0.0
+            if score < min_score:
+                continue
+            for heap, entry in ((best[doc_id], (score, -other)), (best[other], (score, -doc_id))):
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+    return [
+        [(-other, score) for score, other in sorted(heap, reverse=True)]
+        for heap in best
+    ]
+
+
+def build_related_cards(top_k=None, min_score=None, max_df=None, log=None):
+    """
+    Rearma RelatedCard con todas las basic cards activas.
+
+    Args:
+    top_k, min_score, max_df: Por defecto los de RELATED_CARDS.
+    log (callable): Recibe las lineas de progreso.
+
+    Returns:
+    dict: cards procesadas, terms (vocabulario usado) y rows escritas.
+    """
+    config = settings.RELATED_CARDS
+    top_k = top_k or config['TOP_K']
+    min_score = config['MIN_SCORE'] if min_score is None else min_score
+    max_df = max_df or config['MAX_DF']
+    log = log or (lambda msg: None)
+
+    cards = list(BasicCard.objects.filter(status=StatusModel.ACTIVE).only(
+        'id', 'phrase', 'meaning', 'examples', 'vocabs').order_by('id'))
+
+    analyzer = TextAnalyzer()
+    documents = [term_frequencies(analyzer, card_fields(card)) for card in cards]
+    vectors = tfidf_vectors(documents, max_df)
+    terms = len({term for vector in vectors for term in vector})
+    log(f'{len(cards)} cards, {terms} terms')
+
+    neighbours = nearest_neighbours(vectors, top_k, min_score)
+
+    rows = [
+        RelatedCard(card_id=card.id, related_id=cards[other].id, rank=rank, score=round(score, 4))
+        for card, related in zip(cards, neighbours)
+        for rank, (other, score) in enumerate(related)
+    ]
+
+    with transaction.atomic():
+        RelatedCard.objects.all().delete()
+        RelatedCard.objects.bulk_create(rows, batch_size=1000)
+    bump_content_version('related')
+
+    return {
+        'cards': len(cards),
+        'terms': terms,
+        'rows': len(rows),
+    }
+
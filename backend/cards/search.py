@@ -0,0 +1,340 @@
+"""
+Busqueda de cards por texto.
+
+Cada proceso arma en memoria un indice invertido por idioma (token ->
+cards) con las frases, significados y vocabulario de las basic cards en
+ingles y en ese idioma, leidos de BasicCardText (ver cards.translations).
+El indice se rearma cuando cambia la version de contenido 'cards', o sea
+despues de cada populate o cambio de una card.
+
+La consulta se parte en tokens igual que el texto indexado. Cada token
+busca coincidencias exactas, el ultimo tambien por prefijo (para buscar
+mientras se escribe) y los de MIN_FUZZY_LENGTH letras o mas tambien con
+errores de tipeo (distancia de edicion 1, o 2 desde FUZZY_2_LENGTH; una
+transposicion cuenta como 1). Los candidatos salen de un mapa de borrados
+precalculado (SymSpell): dos palabras a distancia d o menos comparten una
+variante con hasta d letras borradas de cada lado, asi que los tokens que
+pueden estar a distancia 2 de una consulta se indexan con sus borrados de
+hasta dos letras. Una card tiene que coincidir con todos los tokens; el
+puntaje suma el peso del campo por la calidad de la coincidencia.
+
+Las custom cards de un device son pocas y cambian seguido: se recorren
+directamente con el mismo criterio.
+"""
+
+import bisect
+import heapq
+import logging
+import re
+import threading
+import unicodedata
+
+from cards.models import BasicCard, BasicCardText, CustomCard
+from cards.translations import NEUTRAL_LANG, translation_text
+from common.content import ContentMemo
+from common.models import Status as StatusModel
+
+
+FIELD_WEIGHTS = {
+    'phrase': 3.0,
+    'vocabs': 2.0,
+    'meaning': 1.0,
+}
+
+EXACT, PREFIX, FUZZY = 1.0, 0.7, 0.5
+
+MIN_PREFIX_LENGTH = 2
+MIN_FUZZY_LENGTH = 4
+FUZZY_2_LENGTH = 8
+MAX_QUERY_TOKENS = 8
+
+_TOKEN_RE = re.compile(r'\w+')
+
+logger = logging.getLogger('api_v1')
+
+
+def normalize(text):
+    # Minusculas y sin acentos: 'Canción' y 'cancion' son el mismo token
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    if not text:
+        return []
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def deletes(token, depth=1):
+    """
+    Variantes de `token` con entre 1 y `depth` letras borradas.
+    """
+    variants = set()
+    frontier = {token}
+    for _ in range(depth):
+        frontier = {
+            variant[:i] + variant[i + 1:]
+            for variant in frontier for i in range(len(variant))
+        }
+        variants |= frontier
+    return variants
+
+
+def max_distance(token):
+    if len(token) >= FUZZY_2_LENGTH:
+        return 2
+    return 1 if len(token) >= MIN_FUZZY_LENGTH else 0
+
+
+def edit_distance(a, b, limit):
+    """
+    Distancia de edicion entre a y b contando la transposicion de dos
+    letras vecinas como un solo error (OSA). Corta en cuanto supera `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    before, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            value = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                value = min(value, before[j - 2] + 1)
+            current.append(value)
+        # La transposicion mira dos filas atras: se corta si ambas superan
+        if min(current) > limit and min(previous) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class SearchIndex:
+    """
+    Indice invertido de un idioma.
+
+    Args:
+    documents (list): Tuplas (resultado, {campo: [textos]}); el resultado
+    es lo que devuelve `search` para esa card.
+    """
+
+    def __init__(self, documents):
+        self.results = []
+        self.postings = {}
+
+        for doc_id, (result, fields) in enumerate(documents):
+            self.results.append(result)
+            for field, texts in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for text in texts:
+                    for token in tokenize(text):
+                        docs = self.postings.setdefault(token, {})
+                        if docs.get(doc_id, 0) < weight:
+                            docs[doc_id] = weight
+
+        self.tokens = sorted(self.postings)
+
+        # Borrados -> tokens que los generan (SymSpell). Un token esta a
+        # distancia 2 de una consulta de FUZZY_2_LENGTH letras o mas solo
+        # si tiene al menos FUZZY_2_LENGTH - 2; los mas cortos solo
+        # necesitan los borrados de una letra
+        self.deletes = {}
+        for token in self.tokens:
+            if len(token) >= FUZZY_2_LENGTH - 2:
+                depth = 2
+            elif len(token) >= MIN_FUZZY_LENGTH - 1:
+                depth = 1
+            else:
+                continue
+            for variant in deletes(token, depth):
+                self.deletes.setdefault(variant, []).append(token)
+
+    def prefix_tokens(self, prefix):
+        start = bisect.bisect_left(self.tokens, prefix)
+        for token in self.tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            yield token
+
+    def fuzzy_tokens(self, term):
+        limit = max_distance(term)
+        if not limit:
+            return set()
+
+        candidates = set()
+        for variant in deletes(term, limit) | {term}:
+            if variant in self.postings:
+                candidates.add(variant)
+            candidates.update(self.deletes.get(variant, ()))
+        candidates.discard(term)
+
+        return {token for token in candidates if edit_distance(term, token, limit) <= limit}
+
+    def term_scores(self, term, prefix=False):
+        """
+        card -> mejor puntaje del termino en esa card.
+        """
+        matches = [(term, EXACT)] if term in self.postings else []
+        if prefix and len(term) >= MIN_PREFIX_LENGTH:
+            matches.extend((token, PREFIX) for token in self.prefix_tokens(term) if token != term)
+        matches.extend((token, FUZZY) for token in self.fuzzy_tokens(term))
+
+        scores = {}
+        for token, quality in matches:
+            for doc_id, weight in self.postings[token].items():
+                score = weight * quality
+                if scores.get(doc_id, 0) < score:
+                    scores[doc_id] = score
+        return scores
+
+    def search(self, query, limit=20):
+        terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TOKENS]
+        if not terms:
+            return []
+
+        per_term = [
+            self.term_scores(term, prefix=i == len(terms) - 1)
+            for i, term in enumerate(terms)
+        ]
+        # Se intersecta empezando por el termino con menos cards
+        per_term.sort(key=len)
+        total = dict(per_term[0])
+        for scores in per_term[1:]:
+            total = {doc_id: score + scores[doc_id] for doc_id, score in total.items() if doc_id in scores}
+            if not total:
+                return []
+
+        best = heapq.nlargest(limit, total.items(), key=lambda item: (item[1], -item[0]))
+        return [
+            dict(self.results[doc_id], score=round(score, 2))
+            for doc_id, score in best
+        ]
+
+
+def card_texts(content, section):
+    return [text for text in content.get(section) or [] if text]
+
+
+def card_texts_from_columns(lang_code):
+    """
+    Los mismos textos que load_search_index, leidos de las columnas JSON de
+    BasicCard. Solo se usa si BasicCardText esta vacia (ver
+    `manage.py build_card_texts`), para no responder siempre sin resultados.
+    """
+    cards = BasicCard.objects.filter(status=StatusModel.ACTIVE).only(
+        'id', 'code', 'phrase', 'meaning', 'vocabs', 'cover_url', 'images')
+
+    by_card = {}
+    for card in cards:
+        texts = by_card[(card.id, card.code)] = {
+            NEUTRAL_LANG: {
+                'cover_url': card.cover_url,
+                'cover_variants': (card.images or {}).get('cover'),
+            },
+        }
+        for lang in {'en', lang_code}:
+            texts[lang] = {
+                'phrase': translation_text(card.phrase, lang),
+                'meaning': translation_text(card.meaning, lang),
+                'vocabs': [translation_text(vocab['phrase'], lang) for vocab in card.vocabs or []],
+            }
+
+    if by_card:
+        logger.warning('BasicCardText is empty, search index built from BasicCard columns')
+    return by_card
+
+
+def load_search_index(lang_code):
+    """
+    Arma el indice de un idioma con un solo query sobre BasicCardText.
+    """
+    # Solo las claves del JSON que se usan, no el contenido entero
+    rows = BasicCardText.objects.filter(
+        card__status=StatusModel.ACTIVE,
+        lang__in={NEUTRAL_LANG, 'en', lang_code},
+    ).values_list(
+        'card_id', 'card__code', 'lang', 'content__phrase', 'content__meaning',
+        'content__vocabs', 'content__cover_url', 'content__images__cover',
+    ).order_by('card_id')
+
+    by_card = {}
+    for card_id, code, lang, phrase, meaning, vocabs, cover_url, cover_variants in rows:
+        by_card.setdefault((card_id, code), {})[lang] = {
+            'phrase': phrase,
+            'meaning': meaning,
+            'vocabs': vocabs,
+            'cover_url': cover_url,
+            'cover_variants': cover_variants,
+        }
+
+    if not by_card:
+        by_card = card_texts_from_columns(lang_code)
+
+    documents = []
+    for (card_id, code), texts in by_card.items():
+        neutral = texts.get(NEUTRAL_LANG)
+        if neutral is None:
+            continue
+        english = texts.get('en', {})
+        languages = [english] if lang_code == 'en' else [english, texts.get(lang_code, {})]
+
+        documents.append(({
+            'type': 'basic',
+            'code': code,
+            'phrase': english.get('phrase'),
+            'cover_url': neutral['cover_url'],
+            'cover_variants': neutral['cover_variants'],
+        }, {
+            'phrase': [content.get('phrase') for content in languages if content.get('phrase')],
+            'meaning': [content.get('meaning') for content in languages if content.get('meaning')],
+            'vocabs': [text for content in languages for text in card_texts(content, 'vocabs')],
+        }))
+
+    return SearchIndex(documents)
+
+
+_indexes = {}
+_indexes_guard = threading.Lock()
+
+
+def get_search_index(lang_code):
+    with _indexes_guard:
+        memo = _indexes.get(lang_code)
+        if memo is None:
+            memo = _indexes[lang_code] = ContentMemo('cards', lambda: load_search_index(lang_code))
+    return memo.get()
+
+
+def search_basic_cards(query, lang_code, limit=20):
+    return get_search_index(lang_code).search(query, limit)
+
+
+def search_custom_cards(query, device_id, limit=20, cover_for=None):
+    """
+    Custom cards activas de un device que coinciden con `query`.
+
+    Args:
+    cover_for (callable): sticker_code -> cover_url.
+    """
+    cards = CustomCard.objects.filter(
+        device_id=device_id,
+        status=StatusModel.ACTIVE,
+    ).only('id', 'phrase', 'meaning', 'sticker_code').order_by('-id')
+
+    documents = [({
+        'type': 'custom',
+        'id': card.id,
+        'phrase': card.phrase,
+        'cover_url': cover_for(card.sticker_code) if cover_for else None,
+    }, {
+        'phrase': [card.phrase] if isinstance(card.phrase, str) else [],
+        'meaning': [card.meaning] if isinstance(card.meaning, str) else [],
+    }) for card in cards]
+
+    return SearchIndex(documents).search(query, limit)
@@ -2,19 +2,40 @@
 
 import json
 import logging
+from collections import namedtuple
+
+from django.conf import settings
+
+from assets.signing import sign_voice
 
 from cards.models import (
     ClusterCard,
     CustomCard,
     BasicCard,
+    Category,
+    RelatedCard,
     Sticker,
 )
 
+from cards.memberships import load_memberships
+from cards.translations import load_card_texts
+
+from common.cache import get_or_compute
+from common.content import ContentMemo
 from common.models import Status as StatusModel
+from common.payloads import PayloadCache, build_payload
+
+from global_settings.services import get_cards_settings
 
 logger = logging.getLogger('api_v1')
 
 
+StickerEntry = namedtuple(
+    'StickerEntry',
+    ['id', 'code', 'image_url', 'cover_url', 'active', 'visible'],
+)
+
+
 # def create_card(title, description, user):
 #     card = Card(title=title, description=description, created_by=user)
 #     card.save()
@@ -66,30 +87,70 @@ def get_cluster_card_by_code(code, lang_code):
     except ClusterCard.DoesNotExist:
         return None
 
+    members = get_basic_cards(cluster_member_codes(card), lang_code, sections=())
+    return format_cluster_card(card, lang_code, members)
+
+
+def cluster_member_codes(card):
+    return [item['code'] for item in card.cluster or [] if 'code' in item]
+
+
+def format_cluster_card(card, lang_code, members=None):
+    """
+    Documento de detalle de una cluster card. Con `members` (code ->
+    resumen de la basic card, ver get_basic_cards) cada item del cluster
+    trae su card resuelta en 'card', o None si ya no existe; sin `members`
+    el cluster va tal cual (ver cards.bundles).
+    """
+    cluster = card.cluster
+    if members is not None:
+        cluster = [dict(item, card=members.get(item.get('code'))) for item in card.cluster or []]
+
     return {
         'id': card.id,
         'image_url': card.image_url,
-        'cluster': card.cluster,
+        'images': card.images,
+        'cluster': cluster,
     }
 
 
-def get_basic_card_by_code(code, lang_code):
+def get_basic_card_by_code(code, lang_code, sections=None):
+    if settings.CARD_CONTENT_STORAGE == 'normalized':
+        return with_signed_voice(
+            get_basic_cards_from_texts([code], lang_code, sections).get(code))
+
     try:
-        card = BasicCard.objects.get(
+        card = BasicCard.objects.defer(*deferred_sections(sections)).get(
             code=code,
             status=StatusModel.ACTIVE,
         )
     except BasicCard.DoesNotExist:
         return None
 
+    return with_signed_voice(format_basic_card(card, lang_code, sections))
+
+
+def with_signed_voice(document):
+    # Solo en las respuestas de detalle: los bundles y el delta sync se
+    # guardan en el dispositivo y no pueden llevar URLs que vencen
+    if document is not None:
+        document['voice'] = sign_voice(document['voice'])
+    return document
+
+
+def format_examples(card, lang_code):
     examples = []
     for example in card.examples or []:
         example_transl = get_translation(example['example'], lang_code)
         examples.append({
             'example': example_transl,
-            'image_url': example['image_url']
+            'image_url': example['image_url'],
+            'image_variants': example.get('image_variants'),
         })
+    return examples
+
 
+def format_scenarios(card, lang_code):
     scenarios = []
     for scenario in card.scenarios or []:
         title = get_translation(scenario['title'], lang_code)
@@ -102,14 +163,13 @@ def get_basic_card_by_code(code, lang_code):
         scenarios.append({
             'title': title,
             'image_url': scenario['image_url'],
+            'image_variants': scenario.get('image_variants'),
             'answers': answers
         })
+    return scenarios
 
-    exaplantion_items = []
-    for expl_item in card.explanations or []:
-        expl_transl = get_translation(expl_item, lang_code)
-        exaplantion_items.append(expl_transl)
 
+def format_vocabs(card, lang_code):
     vocab_items = []
     for vocab in card.vocabs or []:
         vocab_items.append({
@@ -118,29 +178,207 @@ def get_basic_card_by_code(code, lang_code):
             'meaning': vocab['meaning'],
             'examples': vocab['examples'],
         })
+    return vocab_items
+
 
+def format_compare(card, lang_code):
     compare_items = []
     for compare in card.compare or []:
         compare_items.append({
             'text': get_translation(compare['text'], lang_code),
             'bold': compare['bold'],
         })
+    return compare_items
 
-    return {
+
+def format_explanations(card, lang_code):
+    exaplantion_items = []
+    for expl_item in card.explanations or []:
+        expl_transl = get_translation(expl_item, lang_code)
+        exaplantion_items.append(expl_transl)
+    return exaplantion_items
+
+
+# Secciones de la basic card que la app muestra en tabs aparte, en el orden
+# del documento completo. Cada una es una columna JSON propia.
+BASIC_CARD_SECTIONS = {
+    'examples': format_examples,
+    'scenarios': format_scenarios,
+    'vocabs': format_vocabs,
+    'compare': format_compare,
+    'explanations': format_explanations,
+}
+
+
+def parse_sections(value):
+    """
+    Convierte el parametro `sections` ('examples,vocabs') en una tupla en
+    el orden de BASIC_CARD_SECTIONS, asi cada combinacion tiene una sola
+    clave de cache.
+
+    Args:
+    value (str): Secciones separadas por coma; None = todas y '' = ninguna.
+
+    Returns:
+    tuple: Secciones pedidas, o None si son todas.
+
+    Raises:
+    ValueError: Si alguna seccion no existe.
+    """
+    if value is None:
+        return None
+
+    requested = {section for section in value.split(',') if section}
+    unknown = requested - set(BASIC_CARD_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+
+    if requested == set(BASIC_CARD_SECTIONS):
+        return None
+    return tuple(section for section in BASIC_CARD_SECTIONS if section in requested)
+
+
+def deferred_sections(sections):
+    # Columnas que no se leen de la base de datos
+    if sections is None:
+        return ()
+    return tuple(section for section in BASIC_CARD_SECTIONS if section not in sections)
+
+
+def format_basic_card(card, lang_code, sections=None):
+    """
+    Documento de detalle de una basic card en un idioma. No hace queries,
+    asi se puede aplicar a cards ya cargadas (ver cards.bundles).
+
+    Con `sections` solo se arman esas secciones (ver parse_sections); las
+    demas no aparecen en el documento.
+    """
+    document = {
         'id': card.id,
         'phrase': get_translation(card.phrase, lang_code),
         'image_url': card.image_url,
         'cover_url': card.cover_url,
+        'images': card.images,
         'voice': card.voice,
         'meaning': get_translation(card.meaning, lang_code),
-        'examples': examples,
-        'scenarios': scenarios,
-        'vocabs': vocab_items,
-        'compare': compare_items,
-        'explanations': exaplantion_items,
+    }
+
+    for section, format_section in BASIC_CARD_SECTIONS.items():
+        if sections is None or section in sections:
+            document[section] = format_section(card, lang_code)
+
+    return document
+
+
+def item_text(texts, section, index, key=None):
+    # Texto de la posicion `index` de una seccion, None si el idioma no lo tiene
+    items = texts.get(section) or []
+    if index >= len(items):
+        return None
+    return items[index] if key is None else (items[index] or {}).get(key)
+
+
+def text_pair(english, translated):
+    return {
+        'text': english,
+        'translation': translated,
     }
 
 
+def format_basic_card_texts(neutral, english, translated, lang_code, sections=None):
+    """
+    Mismo documento que format_basic_card, armado desde las filas por
+    idioma de BasicCardText (ver cards.translations).
+    """
+    def pair(section, index, key=None):
+        return text_pair(
+            item_text(english, section, index, key), item_text(translated, section, index, key))
+
+    document = {
+        'id': neutral['id'],
+        'phrase': text_pair(english.get('phrase'), translated.get('phrase')),
+        'image_url': neutral['image_url'],
+        'cover_url': neutral['cover_url'],
+        'images': neutral['images'],
+        'voice': neutral['voice'],
+        'meaning': text_pair(english.get('meaning'), translated.get('meaning')),
+    }
+
+    def include(section):
+        return sections is None or section in sections
+
+    if include('examples'):
+        document['examples'] = [{
+            'example': pair('examples', i),
+            'image_url': example['image_url'],
+            'image_variants': example['image_variants'],
+        } for i, example in enumerate(neutral['examples'])]
+
+    if include('scenarios'):
+        scenarios = []
+        for i, scenario in enumerate(neutral['scenarios']):
+            english_answers = item_text(english, 'scenarios', i, 'answers') or []
+            translated_answers = item_text(translated, 'scenarios', i, 'answers') or []
+            scenarios.append({
+                'title': pair('scenarios', i, 'title'),
+                'image_url': scenario['image_url'],
+                'image_variants': scenario['image_variants'],
+                'answers': [text_pair(
+                    english_answers[j] if j < len(english_answers) else None,
+                    translated_answers[j] if j < len(translated_answers) else None,
+                ) for j in range(scenario['answers'])],
+            })
+        document['scenarios'] = scenarios
+
+    if include('vocabs'):
+        document['vocabs'] = [{
+            'phrase': pair('vocabs', i),
+            'matches': vocab['matches'],
+            'meaning': vocab['meaning'],
+            'examples': vocab['examples'],
+        } for i, vocab in enumerate(neutral['vocabs'])]
+
+    if include('compare'):
+        document['compare'] = [{
+            'text': pair('compare', i),
+            'bold': compare['bold'],
+        } for i, compare in enumerate(neutral['compare'])]
+
+    if include('explanations'):
+        document['explanations'] = [pair('explanations', i) for i in range(neutral['explanations'])]
+
+    return document
+
+
+def get_basic_cards_from_texts(codes, lang_code, sections=None):
+    """
+    Detalle de varias basic cards desde BasicCardText: un query que trae
+    solo ingles y el idioma pedido.
+
+    Returns:
+    dict: code -> documento (solo las cards activas).
+    """
+    return {
+        code: format_basic_card_texts(neutral, english, translated, lang_code, sections)
+        for code, (neutral, english, translated) in load_card_texts(codes, lang_code).items()
+    }
+
+
+# Detalle ya renderizado y comprimido por (code, lang) y version de 'cards'.
+# Los clusters incluyen sus miembros, que tambien invalidan 'cards'.
+_basic_card_payloads = PayloadCache('cards', get_basic_card_by_code)
+_cluster_card_payloads = PayloadCache('cards', get_cluster_card_by_code)
+
+
+def get_basic_card_payload(code, lang_code, sections=None):
+    # Cada combinacion de secciones es una entrada propia del cache
+    return _basic_card_payloads.get(code, lang_code, sections)
+
+
+def get_cluster_card_payload(code, lang_code):
+    return _cluster_card_payloads.get(code, lang_code)
+
+
 def get_custom_card_by_id(card_id):
     try:
         card = CustomCard.objects.get(
@@ -150,18 +388,89 @@ def get_custom_card_by_id(card_id):
     except CustomCard.DoesNotExist:
         return None
 
-    sticker = Sticker.objects.get(code=card.sticker_code)
+    return format_custom_card(card)
+
+
+def format_custom_card(card):
+    sticker = get_sticker_by_code(card.sticker_code)
 
     return {
         'id': card.id,
         'phrase': card.phrase,
         'sticker_code': card.sticker_code,
-        'image_url': sticker.image_url,
-        'cover_url': sticker.cover_url,
+        'image_url': sticker.image_url if sticker else None,
+        'cover_url': sticker.cover_url if sticker else None,
         'meaning': card.meaning,
     }
 
 
+def get_basic_cards(codes, lang_code, sections=None):
+    """
+    Detalle de varias basic cards en un query, desde el almacenamiento
+    configurado en CARD_CONTENT_STORAGE. Con sections=() es el resumen que
+    se usa para los miembros de los clusters.
+
+    Returns:
+    dict: code -> documento (solo las cards activas).
+    """
+    if not codes:
+        return {}
+
+    if settings.CARD_CONTENT_STORAGE == 'normalized':
+        documents = get_basic_cards_from_texts(codes, lang_code, sections)
+    else:
+        cards = BasicCard.objects.filter(
+            code__in=codes, status=StatusModel.ACTIVE).defer(*deferred_sections(sections))
+        documents = {card.code: format_basic_card(card, lang_code, sections) for card in cards}
+
+    for document in documents.values():
+        with_signed_voice(document)
+    return documents
+
+
+def get_cards_batch(basic_codes, cluster_codes, custom_ids, lang_code, sections=None, device_id=None):
+    """
+    Detalle de varias cards de distinto tipo con un query por tipo.
+
+    Args:
+    basic_codes (list): Codigos de basic cards.
+    cluster_codes (list): Codigos de cluster cards.
+    custom_ids (list): Ids (int) de custom cards.
+    lang_code (str): Idioma de las basic y cluster cards.
+    sections (tuple): Secciones de las basic cards (ver parse_sections).
+    device_id (str): Device dueno de las custom cards; las de otros
+    devices quedan en None.
+
+    Returns:
+    dict: basic, cluster y custom, cada uno identificador -> detalle (None
+    si no existe o no esta activa).
+    """
+    result = {
+        'basic': dict.fromkeys(basic_codes),
+        'cluster': dict.fromkeys(cluster_codes),
+        'custom': dict.fromkeys(str(card_id) for card_id in custom_ids),
+    }
+
+    if basic_codes:
+        result['basic'].update(get_basic_cards(basic_codes, lang_code, sections))
+
+    if cluster_codes:
+        clusters = list(ClusterCard.objects.filter(code__in=cluster_codes, status=StatusModel.ACTIVE))
+        # Los miembros de todos los clusters en un solo query
+        member_codes = {code for card in clusters for code in cluster_member_codes(card)}
+        members = get_basic_cards(list(member_codes), lang_code, sections=())
+        for card in clusters:
+            result['cluster'][card.code] = format_cluster_card(card, lang_code, members)
+
+    if custom_ids and device_id:
+        custom_cards = CustomCard.objects.filter(
+            id__in=custom_ids, device_id=device_id, status=StatusModel.ACTIVE)
+        for card in custom_cards:
+            result['custom'][str(card.id)] = format_custom_card(card)
+
+    return result
+
+
 def get_cover_basic_card_by_code(code):
     try:
         card = BasicCard.objects.get(
@@ -170,12 +479,18 @@ def get_cover_basic_card_by_code(code):
     except BasicCard.DoesNotExist:
         return None
     
+    return format_cover_basic_card(card)
+
+
+def format_cover_basic_card(card):
     return {
-        'code': code,
+        'code': card.code,
         'phrase': get_english_text(card.phrase),
         'cover_url': card.cover_url,
+        'cover_variants': (card.images or {}).get('cover'),
     }
 
+
 def get_cover_cluster_card_by_code(code):
     try:
         card = ClusterCard.objects.get(
@@ -184,13 +499,163 @@ def get_cover_cluster_card_by_code(code):
     except ClusterCard.DoesNotExist:
         return None
     
+    return format_cover_cluster_card(card)
+
+
+def format_cover_cluster_card(card):
     return {
-        'code': code,
+        'code': card.code,
         'cover_url': card.cover_url,
+        'cover_variants': (card.images or {}).get('cover'),
     }
 
-def get_sticker_by_code(code):
-    try:
-        return Sticker.objects.get(code=code)
-    except Sticker.DoesNotExist:
+
+def load_related_cards(code):
+    """
+    Cards relacionadas de una basic card activa (precalculadas por
+    cards.related) con un solo join, o None si la card no existe.
+    """
+    rows = RelatedCard.objects.filter(
+        card__code=code,
+        card__status=StatusModel.ACTIVE,
+        related__status=StatusModel.ACTIVE,
+    ).select_related('related').only(
+        'score', 'related__code', 'related__phrase', 'related__cover_url', 'related__images',
+    ).order_by('rank')
+
+    related = [dict(format_cover_basic_card(row.related), score=row.score) for row in rows]
+    if not related and not BasicCard.objects.filter(code=code, status=StatusModel.ACTIVE).exists():
+        return None
+    return related
+
+
+def get_related_cards(code, limit=None):
+    # Cambia cuando se rearma la tabla ('related') o las covers ('cards')
+    related = get_or_compute(('cards', 'related'), ('related_cards', code), lambda: load_related_cards(code))
+    if related is None:
+        return None
+    return related[:limit] if limit else related
+
+
+def load_category_feed():
+    categories = Category.objects.filter(status=StatusModel.ACTIVE).only(
+        'id', 'code', 'name', 'tab_height', 'cards')
+    card_settings = get_cards_settings()
+
+    sorted_categories = []
+    for sort_code in card_settings.extras['category_order']:
+        for cat in categories:
+            if cat.code == sort_code:
+                sorted_categories.append(cat)
+
+    logger.info([cat.name for cat in sorted_categories])
+
+    # Las cards de todos los bloques salen de un solo join ordenado
+    memberships = load_memberships([cat.id for cat in sorted_categories])
+
+    category_cards_list = []
+    for category in sorted_categories:
+        cat_cards = []
+        for block, cat_item in enumerate(category.cards):
+            members = memberships.get((category.id, block), [])
+
+            if cat_item['type'] == 'basic_cards':
+                basic_cards = [format_cover_basic_card(member.basic_card) for member in members]
+                cat_cards.append({
+                    'type': 'basic_cards',
+                    'basic_cards': basic_cards
+                })
+
+            if cat_item['type'] == 'collections':
+                cat_cards.append({
+                    'type': 'collections',
+                    'collections': cat_item['collections'],
+                })
+
+            if cat_item['type'] == 'cluster_cards':
+                cluster_cards = [format_cover_cluster_card(member.cluster_card) for member in members]
+                cat_cards.append({
+                    'type': 'cluster_cards',
+                    'cluster_cards': cluster_cards
+                })
+
+        if len(cat_cards) > 0:
+            category_cards_list.append({
+                'name': category.name,
+                'tab_height': category.tab_height,
+                'blocks': cat_cards,
+            })
+
+    return category_cards_list
+
+
+def get_category_feed():
+    """
+    Categorias del feed (todo menos las custom cards del device). Es igual
+    para todos los devices, asi que se arma una vez por version de 'cards'
+    y 'settings' y se comparte entre workers.
+    """
+    return get_or_compute(('cards', 'settings'), ('category_feed',), load_category_feed)
+
+
+def load_sticker_index():
+    rows = Sticker.objects.order_by('id').values_list(
+        'id', 'code', 'image_url', 'cover_url', 'status', 'visible')
+
+    return {
+        code: StickerEntry(
+            id=sticker_id,
+            code=code,
+            image_url=image_url,
+            cover_url=cover_url,
+            active=sticker_status == StatusModel.ACTIVE,
+            visible=visible,
+        )
+        for sticker_id, code, image_url, cover_url, sticker_status, visible in rows
+    }
+
+
+_sticker_index = ContentMemo('stickers', load_sticker_index)
+
+
+def get_sticker_index():
+    """
+    Indice code -> StickerEntry de todos los stickers, cargado con un solo
+    query y mantenido en memoria hasta que cambia la version de contenido
+    'stickers'.
+    """
+    return _sticker_index.get()
+
+
+def get_sticker_by_code(code, active_only=False):
+    sticker = get_sticker_index().get(code)
+    if sticker is None or (active_only and not sticker.active):
         return None
+    return sticker
+
+
+def load_sticker_catalogue():
+    stickers = [
+        {
+            'id': sticker.id,
+            'code': sticker.code,
+            'image_url': sticker.image_url,
+            'cover_url': sticker.cover_url,
+        }
+        for sticker in get_sticker_index().values()
+        if sticker.active and sticker.visible
+    ]
+
+    return build_payload(stickers)
+
+
+_sticker_catalogue = ContentMemo('stickers', load_sticker_catalogue)
+
+
+def get_sticker_catalogue():
+    """
+    Catalogo de stickers visibles ya renderizado y comprimido. Se
+    reconstruye solo cuando cambia la tabla (version de contenido
+    'stickers').
+    """
+    return _sticker_catalogue.get()
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from cards.models import BasicCard, Category, ClusterCard, Sticker
+from cards.memberships import sync_card_memberships, sync_category_memberships
+from cards.translations import save_card_texts
+from common.content import bump_content_version
+
+
+@receiver([post_save, post_delete], sender=Sticker)
+def sticker_changed(sender, **kwargs):
+    bump_content_version('stickers')
+
+
+@receiver([post_save, post_delete], sender=BasicCard)
+@receiver([post_save, post_delete], sender=ClusterCard)
+@receiver([post_save, post_delete], sender=Category)
+def card_changed(sender, **kwargs):
+    bump_content_version('cards')
+
+
+@receiver(post_save, sender=BasicCard)
+def basic_card_saved(sender, instance, **kwargs):
+    # Copia por idioma para CARD_CONTENT_STORAGE = 'normalized'
+    save_card_texts(instance)
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, **kwargs):
+    sync_category_memberships(instance)
+
+
+@receiver([post_save, post_delete], sender=BasicCard)
+@receiver([post_save, post_delete], sender=ClusterCard)
+def card_membership_changed(sender, instance, update_fields=None, **kwargs):
+    # Una card nueva, borrada o con otro codigo o estado cambia las filas
+    # de las categorias que la nombran
+    if update_fields is not None and not {'code', 'status'} & set(update_fields):
+        return
+    sync_card_memberships(instance)
@@ -1,3 +1,69 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from cards.search import SearchIndex, deletes, edit_distance
+
+
+class SearchIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = SearchIndex([
+            ({'code': 'c1'}, {'phrase': ['Understanding the basics']}),
+            ({'code': 'c2'}, {'phrase': ['Break a leg'], 'meaning': ['Good luck']}),
+            ({'code': 'c3'}, {'phrase': ['Canción'], 'vocabs': ['house']}),
+        ])
+
+    def codes(self, query):
+        return [result['code'] for result in self.index.search(query)]
+
+    def test_exact(self):
+        self.assertEqual(self.codes('break'), ['c2'])
+        self.assertEqual(self.index.search('break')[0]['score'], 3.0)
+
+    def test_accents_and_case(self):
+        self.assertEqual(self.codes('CANCION'), ['c3'])
+
+    def test_prefix_only_on_last_term(self):
+        self.assertEqual(self.codes('unde'), ['c1'])
+        self.assertEqual(self.codes('leg lu'), ['c2'])
+        self.assertEqual(self.codes('lu leg'), [])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.codes('leg luck'), ['c2'])
+        self.assertEqual(self.codes('leg house'), [])
+
+    def test_one_typo(self):
+        self.assertEqual(self.codes('brek'), ['c2'])
+        self.assertEqual(self.codes('hoose'), ['c3'])
+
+    def test_transposition(self):
+        self.assertEqual(self.codes('hosue'), ['c3'])
+        self.assertEqual(self.codes('understnading'), ['c1'])
+
+    def test_two_typos_on_long_terms(self):
+        self.assertEqual(self.codes('undrstnding'), ['c1'])
+        self.assertEqual(self.codes('xnderstandinx'), ['c1'])
+        # Los terminos cortos solo admiten un error
+        self.assertEqual(self.codes('hxusx'), [])
+
+    def test_short_terms_are_not_fuzzy(self):
+        self.assertEqual(self.codes('lex'), [])
+
+    def test_exact_scores_above_fuzzy(self):
+        exact = self.index.search('break')[0]['score']
+        fuzzy = self.index.search('brek')[0]['score']
+        self.assertGreater(exact, fuzzy)
+
+
+class EditDistanceTests(SimpleTestCase):
+    def test_distance(self):
+        self.assertEqual(edit_distance('house', 'house', 2), 0)
+        self.assertEqual(edit_distance('house', 'hose', 2), 1)
+        self.assertEqual(edit_distance('house', 'hosue', 2), 1)
+        self.assertEqual(edit_distance('understanding', 'undrstnding', 2), 2)
+
+    def test_limit(self):
+        self.assertEqual(edit_distance('house', 'mouse', 0), 1)
+        self.assertEqual(edit_distance('house', 'understanding', 2), 3)
+
+    def test_deletes(self):
+        self.assertEqual(deletes('abc'), {'bc', 'ac', 'ab'})
+        self.assertEqual(deletes('abc', 2), {'bc', 'ac', 'ab', 'a', 'b', 'c'})
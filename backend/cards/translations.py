@@ -0,0 +1,153 @@
+"""
+Almacenamiento normalizado del contenido multilingue de las basic cards.
+
+En BasicCard cada columna JSON (phrase, examples, scenarios, ...) trae
+todos los idiomas, asi que leer una card en un idioma transfiere todos.
+BasicCardText guarda la misma card partida en una fila por idioma, con
+solo los textos de ese idioma, y una fila con lang '' para lo que no
+depende del idioma (ids, URLs, variantes, vocabulario, ...). Leer una card
+es traer tres filas chicas: '', 'en' y el idioma pedido.
+
+Las filas se reescriben en cada save de una BasicCard (ver cards.signals);
+`rebuild_card_texts` las arma en bloque para cargas con bulk_create.
+"""
+
+from django.db import transaction
+
+from cards.models import BasicCard, BasicCardText
+from common.models import Status as StatusModel
+
+
+NEUTRAL_LANG = ''
+
+
+def translation_text(obj_list, lang_code):
+    # Mismo criterio que cards.services.get_translation
+    text = None
+    for item in obj_list or []:
+        if item['code'] == lang_code:
+            text = item['text']
+    return text
+
+
+def card_languages(card):
+    languages = {item['code'] for item in (card.phrase or []) + (card.meaning or [])}
+    for example in card.examples or []:
+        languages.update(item['code'] for item in example['example'])
+    for scenario in card.scenarios or []:
+        languages.update(item['code'] for item in scenario['title'])
+    for explanation in card.explanations or []:
+        languages.update(item['code'] for item in explanation)
+    for vocab in card.vocabs or []:
+        languages.update(item['code'] for item in vocab['phrase'])
+    for compare in card.compare or []:
+        languages.update(item['code'] for item in compare['text'])
+    return languages
+
+
+def neutral_content(card):
+    return {
+        'id': card.id,
+        'image_url': card.image_url,
+        'cover_url': card.cover_url,
+        'images': card.images,
+        'voice': card.voice,
+        'examples': [{
+            'image_url': example['image_url'],
+            'image_variants': example.get('image_variants'),
+        } for example in card.examples or []],
+        'scenarios': [{
+            'image_url': scenario['image_url'],
+            'image_variants': scenario.get('image_variants'),
+            'answers': len(scenario['answers']),
+        } for scenario in card.scenarios or []],
+        'vocabs': [{
+            'matches': vocab['matches'],
+            'meaning': vocab['meaning'],
+            'examples': vocab['examples'],
+        } for vocab in card.vocabs or []],
+        'compare': [{'bold': compare['bold']} for compare in card.compare or []],
+        'explanations': len(card.explanations or []),
+    }
+
+
+def language_content(card, lang_code):
+    # Listas alineadas con las de neutral_content; None si falta el texto
+    return {
+        'phrase': translation_text(card.phrase, lang_code),
+        'meaning': translation_text(card.meaning, lang_code),
+        'examples': [
+            translation_text(example['example'], lang_code) for example in card.examples or []],
+        'scenarios': [{
+            'title': translation_text(scenario['title'], lang_code),
+            'answers': [translation_text(answer, lang_code) for answer in scenario['answers']],
+        } for scenario in card.scenarios or []],
+        'vocabs': [translation_text(vocab['phrase'], lang_code) for vocab in card.vocabs or []],
+        'compare': [translation_text(compare['text'], lang_code) for compare in card.compare or []],
+        'explanations': [
+            translation_text(explanation, lang_code) for explanation in card.explanations or []],
+    }
+
+
+def split_card(card, text_model=BasicCardText):
+    """
+    Filas de BasicCardText (sin guardar) de una card.
+    """
+    rows = [text_model(card=card, lang=NEUTRAL_LANG, content=neutral_content(card))]
+    for lang_code in sorted(card_languages(card)):
+        rows.append(text_model(card=card, lang=lang_code, content=language_content(card, lang_code)))
+    return rows
+
+
+def save_card_texts(card):
+    with transaction.atomic():
+        BasicCardText.objects.filter(card=card).delete()
+        BasicCardText.objects.bulk_create(split_card(card))
+
+
+def rebuild_card_texts(batch_size=200, card_model=BasicCard, text_model=BasicCardText):
+    """
+    Rearma la tabla entera desde las columnas JSON de BasicCard. Las
+    migraciones pasan sus modelos historicos en `card_model` y
+    `text_model`.
+
+    Returns:
+    int: Cantidad de cards procesadas.
+    """
+    total = 0
+    with transaction.atomic():
+        text_model.objects.all().delete()
+        rows = []
+        for card in card_model.objects.order_by('id').iterator(chunk_size=batch_size):
+            rows.extend(split_card(card, text_model))
+            total += 1
+            if len(rows) >= batch_size:
+                text_model.objects.bulk_create(rows)
+                rows = []
+        text_model.objects.bulk_create(rows)
+    return total
+
+
+def load_card_texts(codes, lang_code):
+    """
+    Filas de las cards activas con esos codigos en un solo query, sin
+    tocar las columnas JSON de BasicCard.
+
+    Returns:
+    dict: code -> (neutral, english, translated); los dos ultimos son {} si
+    la card no tiene ese idioma.
+    """
+    rows = BasicCardText.objects.filter(
+        card__code__in=codes,
+        card__status=StatusModel.ACTIVE,
+        lang__in={NEUTRAL_LANG, 'en', lang_code},
+    ).values_list('card__code', 'lang', 'content')
+
+    by_code = {}
+    for code, lang, content in rows:
+        by_code.setdefault(code, {})[lang] = content
+
+    return {
+        code: (texts[NEUTRAL_LANG], texts.get('en', {}), texts.get(lang_code, {}))
+        for code, texts in by_code.items() if NEUTRAL_LANG in texts
+    }
@@ -9,10 +9,14 @@ urlpatterns = [
     # re_path(r'^(?P<identifier>[a-zA-Z0-9]+)\/?$', card_detail_view),
     # re_path(r'^(?P<identifier>.+)\/?$', card_detail_view),
     re_path(r'^detail/(?P<identifier>[a-zA-Z0-9]+)\/?$', card_detail_view),
+    re_path(r'^detail-batch\/?$', card_batch_detail_view),
     re_path(r'^create\/?$', card_create_view),
     re_path(r'^update\/?$', card_update_view),
     re_path(r'^delete\/?$', card_delete_view),
     re_path(r'^category-cards\/?$', category_card_list_view),
     re_path(r'^stickers\/?$', sticker_list_view),
+    re_path(r'^bundles\/?$', bundle_list_view),
+    re_path(r'^search\/?$', card_search_view),
+    re_path(r'^related/(?P<code>[a-zA-Z0-9]+)\/?$', card_related_view),
     re_path(r'^hola\/?$', hello_world),
 ]
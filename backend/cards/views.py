@@ -2,49 +2,50 @@
 import logging
 
 # Framework
+from django.conf import settings
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import api_view
-from django.db import connections
-from django.db.utils import OperationalError
 
 # Models
 from cards.models import (
     BasicCard,
     CustomCard,
     ClusterCard,
-    Category,
-    Sticker,
 )
 
+from common.constants import AppMsg
 from common.models import Status as StatusModel
 
 # Serializers
 from cards.serializers import (
     CustomCardModelSerializer,
-    StickerModelSerializer,
 )
 
 # Custom
 from common.decorators import track_and_report
+from common.payloads import payload_response
 
 # Services
+from cards.bundles import get_bundles
+from cards.search import search_basic_cards, search_custom_cards
 from cards.services import (
-    get_cluster_card_by_code,
-    get_basic_card_by_code,
+    get_cluster_card_payload,
+    get_basic_card_payload,
     get_custom_card_by_id,
+    get_cards_batch,
+    parse_sections,
     get_sticker_by_code,
-    get_cover_basic_card_by_code,
-    get_cover_cluster_card_by_code,
+    get_category_feed,
+    get_related_cards,
+    get_sticker_catalogue,
 )
 
 from devices.services import (
-    get_device_by_id,
+    is_device_active,
 )
 
-from global_settings.services import (
-    get_cards_settings,
-)
+from global_settings.services import check_language_exist
 
 logger = logging.getLogger('api_v1')
 
@@ -60,12 +61,10 @@ def card_create_view(request):
     if not phrase or not device_id:
         return Response({}, status=status.HTTP_400_BAD_REQUEST)
 
-    if get_device_by_id(device_id) is None:
+    if not is_device_active(device_id):
         return Response([], status=status.HTTP_404_NOT_FOUND)
 
-    try:
-        Sticker.objects.get(code=sticker_code, status=StatusModel.ACTIVE)
-    except Sticker.DoesNotExist:
+    if get_sticker_by_code(sticker_code, active_only=True) is None:
         return Response([], status=status.HTTP_404_NOT_FOUND)
 
     serializer = CustomCardModelSerializer(data={
@@ -159,7 +158,7 @@ def card_delete_view(request):
 def category_card_list_view(request):
     device_id = request.GET.get('device_id', None)
 
-    if get_device_by_id(device_id) is None:
+    if not is_device_active(device_id):
         return Response({}, status=status.HTTP_404_NOT_FOUND)
 
     category_cards_list = []
@@ -171,14 +170,11 @@ def category_card_list_view(request):
 
     processed_cards = []
     for card in custom_cards:
-        sticker = Sticker.objects.get(
-            code=card.sticker_code,
-            status=StatusModel.ACTIVE
-        )
+        sticker = get_sticker_by_code(card.sticker_code, active_only=True)
         processed_cards.append({
             'id': card.id,
             'phrase': card.phrase,
-            'cover_url': sticker.cover_url
+            'cover_url': sticker.cover_url if sticker else None
         })
 
     if len(processed_cards) > 0:
@@ -190,52 +186,7 @@ def category_card_list_view(request):
             }]
         })
 
-    categories = Category.objects.filter(status=StatusModel.ACTIVE)
-    card_settings = get_cards_settings()
-
-    sorted_categories = []
-    for sort_code in card_settings.extras['category_order']:
-        for cat in categories:
-            if cat.code == sort_code:
-                sorted_categories.append(cat)
-
-    logger.info([cat.name for cat in sorted_categories])
-
-    for category in sorted_categories:
-        cat_cards = []
-        for cat_item in category.cards:            
-            if cat_item['type'] == 'basic_cards':
-                basic_cards = []
-                for code in cat_item['card_codes']:
-                    card = get_cover_basic_card_by_code(code)
-                    basic_cards.append(card)
-                cat_cards.append({
-                    'type': 'basic_cards',
-                    'basic_cards': basic_cards
-                })
-
-            if cat_item['type'] == 'collections':
-                cat_cards.append({
-                    'type': 'collections',
-                    'collections': cat_item['collections'],
-                })
-
-            if cat_item['type'] == 'cluster_cards':
-                cluster_cards = []
-                for code in cat_item['card_codes']:
-                    card = get_cover_cluster_card_by_code(code)
-                    cluster_cards.append(card)
-                cat_cards.append({
-                    'type': 'cluster_cards',
-                    'cluster_cards': cluster_cards
-                })
-
-        if len(cat_cards) > 0:
-            category_cards_list.append({
-                'name': category.name,
-                'tab_height': category.tab_height,
-                'blocks': cat_cards,
-            })
+    category_cards_list.extend(get_category_feed())
 
     return Response(category_cards_list, status=status.HTTP_200_OK)
 
@@ -255,58 +206,154 @@ def card_detail_view(request, identifier):
         return Response(card, status=status.HTTP_200_OK)
     except ValueError:
         if card_type == 'cluster' and lang_code:
-            card = get_cluster_card_by_code(identifier, lang_code)
+            payload = get_cluster_card_payload(identifier, lang_code)
         elif card_type == 'basic' and lang_code:
-            card = get_basic_card_by_code(identifier, lang_code)
+            try:
+                sections = parse_sections(request.GET.get('sections', None))
+            except ValueError:
+                return Response(AppMsg.INVALID_DATA, status=status.HTTP_400_BAD_REQUEST)
+            payload = get_basic_card_payload(identifier, lang_code, sections)
         else:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        if card is None:
+        if payload is None:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        return Response(card, status=status.HTTP_200_OK)
+        return payload_response(request, payload)
+
+
+@api_view(['GET'])
+@track_and_report
+def card_batch_detail_view(request):
+    lang_code = request.GET.get('lang', None)
+    device_id = request.GET.get('device_id', None)
+
+    def identifiers(name):
+        values = request.GET.get(name, None)
+        return list(dict.fromkeys(item for item in (values or '').split(',') if item))
+
+    basic_codes = identifiers('basic')
+    cluster_codes = identifiers('cluster')
+
+    try:
+        custom_ids = [int(card_id) for card_id in identifiers('custom')]
+        sections = parse_sections(request.GET.get('sections', None))
+    except ValueError:
+        return Response(AppMsg.INVALID_DATA, status=status.HTTP_400_BAD_REQUEST)
+
+    if not any([basic_codes, cluster_codes, custom_ids]):
+        return Response(AppMsg.MISSING_FIELDS, status=status.HTTP_400_BAD_REQUEST)
+
+    if (basic_codes or cluster_codes) and not lang_code:
+        return Response(AppMsg.MISSING_FIELDS, status=status.HTTP_400_BAD_REQUEST)
+
+    # Las custom cards son del device que las creo
+    if custom_ids and not device_id:
+        return Response(AppMsg.MISSING_FIELDS, status=status.HTTP_400_BAD_REQUEST)
+
+    if len(basic_codes) + len(cluster_codes) + len(custom_ids) > settings.CARD_BATCH_MAX_ITEMS:
+        return Response(AppMsg.TOO_MANY_ITEMS, status=status.HTTP_400_BAD_REQUEST)
+
+    if custom_ids and not is_device_active(device_id):
+        return Response({}, status=status.HTTP_404_NOT_FOUND)
+
+    cards = get_cards_batch(
+        basic_codes, cluster_codes, custom_ids, lang_code, sections, device_id=device_id)
+
+    return Response(cards, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
 @track_and_report
 def sticker_list_view(request):
-    stickers = Sticker.objects.filter(status=StatusModel.ACTIVE, visible=True)
-    serializer = StickerModelSerializer(stickers, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    return payload_response(request, get_sticker_catalogue())
 
 
 @api_view(['GET'])
 @track_and_report
-def hello_world(request):
-    logger.info(request.app_version)
-    logger.info(f'request_id: {request.request_id}')
+def bundle_list_view(request):
+    lang_code = request.GET.get('lang', None)
+
+    if not lang_code:
+        return Response({}, status=status.HTTP_400_BAD_REQUEST)
+
+    bundles = get_bundles(lang_code)
+    if not bundles:
+        return Response({}, status=status.HTTP_404_NOT_FOUND)
+
     return Response({
-        'hello': 'world!',
+        'lang': lang_code,
+        'bundles': bundles,
     }, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
 @track_and_report
-def health(request):
-    # Verificar la conexión a la base de datos
-    # 'default' se refiere a la base de datos predeterminada.
-    db_conn = connections['default']
+def card_search_view(request):
+    query = request.GET.get('q', '').strip()
+    lang_code = request.GET.get('lang', None)
+    device_id = request.GET.get('device_id', None)
+
     try:
-        db_conn.cursor()
-    except OperationalError:
-        # Si hay un error de operación, significa que algo está mal con la base de datos.
-        logger.error('Health check failed: Unable to connect to the database.')
-        return Response({
-            'message': 'Unable to connect to the database.',
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-    # Aquí podrías agregar más comprobaciones, como:
-    # - Conexión con sistemas de caché
-    # - Conexiones a servicios externos (APIs, sistemas de archivos, etc.)
-    # - Verificar la disponibilidad de recursos críticos o archivos de configuración
-
-    # Si todo está bien, devolver una respuesta positiva
-    logger.info('Health check passed: server up and running')
+        limit = min(int(request.GET.get('limit', 20)), settings.CARD_SEARCH_MAX_RESULTS)
+    except ValueError:
+        return Response(AppMsg.INVALID_DATA, status=status.HTTP_400_BAD_REQUEST)
+
+    if not query or not lang_code or limit < 1:
+        return Response(AppMsg.MISSING_FIELDS, status=status.HTTP_400_BAD_REQUEST)
+
+    if len(query) > settings.CARD_SEARCH_MAX_QUERY_LENGTH:
+        return Response(AppMsg.INVALID_DATA, status=status.HTTP_400_BAD_REQUEST)
+
+    # Cada idioma tiene su propio indice en memoria: solo los configurados
+    if not check_language_exist(lang_code):
+        return Response(AppMsg.INVALID_DATA, status=status.HTTP_400_BAD_REQUEST)
+
+    results = []
+    if device_id and is_device_active(device_id):
+        results.extend(search_custom_cards(query, device_id, limit, cover_for=sticker_cover))
+    results.extend(search_basic_cards(query, lang_code, limit))
+    # Primero las del usuario con el mismo puntaje
+    results.sort(key=lambda result: -result['score'])
+
     return Response({
-        'message': 'Server up and running',
+        'query': query,
+        'results': results[:limit],
+    }, status=status.HTTP_200_OK)
+
+
+def sticker_cover(sticker_code):
+    sticker = get_sticker_by_code(sticker_code, active_only=True)
+    return sticker.cover_url if sticker else None
+
+
+@api_view(['GET'])
+@track_and_report
+def card_related_view(request, code):
+    try:
+        limit = min(int(request.GET.get('limit', settings.RELATED_CARDS['TOP_K'])),
+                    settings.RELATED_CARDS['TOP_K'])
+    except ValueError:
+        return Response(AppMsg.INVALID_DATA, status=status.HTTP_400_BAD_REQUEST)
+
+    if limit < 1:
+        return Response(AppMsg.INVALID_DATA, status=status.HTTP_400_BAD_REQUEST)
+
+    related = get_related_cards(code, limit)
+    if related is None:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    return Response({
+        'code': code,
+        'related': related,
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@track_and_report
+def hello_world(request):
+    logger.info(request.app_version)
+    logger.info(f'request_id: {request.request_id}')
+    return Response({
+        'hello': 'world!',
     }, status=status.HTTP_200_OK)
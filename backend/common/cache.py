@@ -0,0 +1,154 @@
+"""
+Capa de cache compartida entre workers (ver CACHES en settings).
+
+Las claves llevan la version de contenido de sus scopes, asi al cambiar el
+contenido las entradas viejas quedan huerfanas y expiran solas, sin tener
+que borrarlas una por una. `get_or_compute` evita la estampida: cuando una
+clave falta, un solo worker la recalcula y el resto espera el resultado.
+"""
+
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from common.content import get_content_version
+
+
+_MISSING = object()
+
+
+class CacheStats:
+    """
+    Contadores por scope de este proceso: hits, misses (recalculos
+    propios), waits (esperas a otro worker) y fallbacks (esperas que
+    vencieron y recalcularon igual).
+    """
+
+    def __init__(self):
+        self._counters = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def incr(self, scope, name):
+        with self._lock:
+            self._counters[scope][name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                scope: dict(counters, hit_rate=round(
+                    counters['hits'] / max(counters['hits'] + counters['misses'], 1), 3))
+                for scope, counters in self._counters.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+stats = CacheStats()
+
+# Un lock por clave para el single-flight dentro del proceso
+_key_locks = {}
+_key_locks_guard = threading.Lock()
+
+
+def scope_label(scope):
+    return scope if isinstance(scope, str) else '+'.join(scope)
+
+
+def versioned_key(scope, *parts):
+    """
+    Clave namespaced por la version de contenido de uno o varios scopes.
+
+    Args:
+    scope (str | tuple): Scope ('cards') o scopes (('cards', 'settings'))
+    de los que depende el valor.
+    parts: Resto de la clave.
+
+    Returns:
+    str: Ej. 'cards.v12:cover:basic:abc'.
+    """
+    scopes = (scope,) if isinstance(scope, str) else scope
+    namespace = '+'.join(f'{name}.v{get_content_version(name)}' for name in scopes)
+    return ':'.join([namespace] + [str(part) for part in parts])
+
+
+def invalidate(scope, *parts):
+    cache.delete(versioned_key(scope, *parts))
+
+
+def get_or_compute(scope, parts, compute, timeout=None):
+    """
+    Devuelve el valor cacheado o lo calcula una sola vez entre todos los
+    hilos y workers que lo pidan al mismo tiempo.
+
+    Args:
+    scope (str | tuple): Scope(s) de contenido del valor.
+    parts (tuple): Resto de la clave.
+    compute (callable): Calcula el valor (puede devolver None, tambien se
+    cachea).
+    timeout (int): Segundos de vida (por defecto el TIMEOUT de CACHES).
+
+    Returns:
+    El valor cacheado o recien calculado.
+    """
+    label = scope_label(scope)
+    key = versioned_key(scope, *parts)
+
+    # Se guarda envuelto en una tupla para poder cachear None
+    cached = cache.get(key, _MISSING)
+    if cached is not _MISSING:
+        stats.incr(label, 'hits')
+        return cached[0]
+
+    with _key_locks_guard:
+        local_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with local_lock:
+        try:
+            # Otro hilo del proceso pudo haberlo calculado mientras se esperaba
+            cached = cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                stats.incr(label, 'hits')
+                return cached[0]
+
+            return _compute_single_flight(label, key, compute, timeout)
+        finally:
+            with _key_locks_guard:
+                _key_locks.pop(key, None)
+
+
+def _compute_single_flight(label, key, compute, timeout):
+    lock_key = f'lock:{key}'
+    lock_timeout = settings.CACHE_SINGLE_FLIGHT['LOCK_TIMEOUT']
+
+    if not cache.add(lock_key, 1, lock_timeout):
+        # Otro worker lo esta calculando: se espera su resultado
+        stats.incr(label, 'waits')
+        deadline = time.monotonic() + settings.CACHE_SINGLE_FLIGHT['WAIT']
+        while time.monotonic() < deadline:
+            time.sleep(settings.CACHE_SINGLE_FLIGHT['POLL_INTERVAL'])
+            cached = cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                stats.incr(label, 'hits')
+                return cached[0]
+        # El otro worker tardo demasiado (o murio): se calcula igual
+        stats.incr(label, 'fallbacks')
+
+    stats.incr(label, 'misses')
+    try:
+        value = compute()
+        if timeout is None:
+            cache.set(key, (value,))
+        else:
+            cache.set(key, (value,), timeout)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def get_cache_stats():
+    return stats.snapshot()
@@ -31,3 +31,7 @@ class AppMsg:
         'error_code': 'ERR0006',
         'message': 'Request contains too many items'
     }
+    UPGRADE_REQUIRED = {
+        'error_code': 'ERR0007',
+        'message': 'App version is no longer supported'
+    }
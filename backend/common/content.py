@@ -0,0 +1,73 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import F
+
+from common.models import ContentVersion
+
+
+# scope -> (version, momento de la lectura)
+_versions = {}
+
+
+def get_content_version(scope):
+    """
+    Devuelve la version de contenido de un scope ('settings', 'stickers',
+    'cards', ...). Cada proceso la relee de la base de datos como maximo
+    cada CONTENT_VERSION_TTL segundos.
+    """
+    now = time.monotonic()
+    cached = _versions.get(scope)
+    if cached and now - cached[1] < settings.CONTENT_VERSION_TTL:
+        return cached[0]
+
+    version = ContentVersion.objects.filter(
+        scope=scope).values_list('version', flat=True).first() or 0
+    _versions[scope] = (version, now)
+    return version
+
+
+def bump_content_version(scope):
+    """
+    Incrementa la version de un scope. Los valores en memoria que dependen
+    de el se recalculan en cada proceso al notar el cambio.
+    """
+    updated = ContentVersion.objects.filter(
+        scope=scope).update(version=F('version') + 1)
+    if not updated:
+        ContentVersion.objects.get_or_create(scope=scope, defaults={'version': 1})
+
+    _versions.pop(scope, None)
+
+
+class ContentMemo:
+    """
+    Valor calculado una vez por proceso y por version de contenido.
+
+    `loader` se vuelve a ejecutar solo cuando cambia la version del scope,
+    de lo contrario `get()` responde desde memoria.
+    """
+
+    def __init__(self, scope, loader):
+        self.scope = scope
+        self.loader = loader
+        self._version = None
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        version = get_content_version(self.scope)
+        if self._version == version:
+            return self._value
+
+        with self._lock:
+            if self._version != version:
+                self._value = self.loader()
+                self._version = version
+        return self._value
+
+    def clear(self):
+        with self._lock:
+            self._version = None
+            self._value = None
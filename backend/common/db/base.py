@@ -0,0 +1,52 @@
+"""
+Backend de PostgreSQL con health checks para conexiones persistentes.
+
+Django 4.0 reutiliza la conexion mientras no supere CONN_MAX_AGE, pero no
+detecta si el servidor (o pgbouncer) la cerro mientras estaba inactiva; el
+primer query del request falla. Este backend hace un `SELECT 1` la primera
+vez que se usa la conexion en cada request y la reabre si ya no sirve, el
+mismo comportamiento que CONN_HEALTH_CHECKS de Django 4.1.
+
+Se activa con ENGINE = 'common.db' y la key CONN_HEALTH_CHECKS en
+DATABASES.
+"""
+
+from django.db.backends.postgresql import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    health_check_done = False
+
+    @property
+    def health_check_enabled(self):
+        return (
+            self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+            and self.settings_dict['CONN_MAX_AGE'] != 0
+        )
+
+    def connect(self):
+        super().connect()
+        # Una conexion recien abierta no necesita el SELECT 1
+        self.health_check_done = True
+
+    def close_if_unusable_or_obsolete(self):
+        # Se llama al inicio y al final de cada request
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def close_if_health_check_failed(self):
+        if (
+            self.connection is None
+            or not self.health_check_enabled
+            or self.health_check_done
+            or self.in_atomic_block
+        ):
+            return
+
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
@@ -1,22 +1,101 @@
 # from django.conf import settings
+import gzip
 import logging
-from django.http import HttpResponseBadRequest
+from django.conf import settings
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from common.constants import AppMsg
+from common.payloads import accepted_encodings, brotli
+from common.versions import parse_version
+from global_settings.services import get_version_policy
 
 log = logging.getLogger('api_v1')
 
+# Rutas que no vienen de la app movil (paginas web, sondas del orquestador,
+# reproductores de audio con URL firmada)
+EXEMPT_PATHS = ('/general/', '/health/', '/assets/')
+
+# La app debe poder consultar si necesita actualizarse aunque ya no este
+# soportada.
+UPGRADE_EXEMPT_PATHS = ('/global-settings/check-app-update',)
+
 
 class AppVersionMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        if request.path.startswith('/general/'):
+        if request.path.startswith(EXEMPT_PATHS):
             return self.get_response(request)
-        
-        version = request.headers.get('App-Version')
-        if not version:
+
+        raw_version = request.headers.get('App-Version')
+        if not raw_version:
             return HttpResponseBadRequest("APP version is required.")
 
+        # Un header que no se puede parsear deja la version como desconocida
+        # (None); no se bloquea, las apps publicadas pueden mandar formatos
+        # que no conocemos
+        version = parse_version(raw_version)
         request.app_version = version
+        request.app_version_raw = raw_version
+
+        if version is not None and not request.path.startswith(UPGRADE_EXEMPT_PATHS):
+            minimum = get_version_policy().minimum
+            if minimum is not None and version < minimum:
+                return JsonResponse(AppMsg.UPGRADE_REQUIRED, status=426)
+
         response = self.get_response(request)
         return response
+
+
+class CompressionMiddleware:
+    """
+    Comprime las respuestas JSON de la API con brotli (si esta instalado)
+    o gzip segun Accept-Encoding. Las respuestas chicas, las que ya vienen
+    comprimidas (ver common.payloads) y las de streaming pasan sin cambios.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = settings.COMPRESSION['MIN_SIZE']
+        self.brotli_quality = settings.COMPRESSION['BROTLI_QUALITY']
+        self.gzip_level = settings.COMPRESSION['GZIP_LEVEL']
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith('application/json'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if len(response.content) < self.min_size:
+            return response
+
+        encodings = accepted_encodings(request)
+        if brotli is not None and 'br' in encodings:
+            encoding = 'br'
+            compressed = brotli.compress(response.content, quality=self.brotli_quality)
+        elif 'gzip' in encodings:
+            encoding = 'gzip'
+            compressed = gzip.compress(response.content, compresslevel=self.gzip_level, mtime=0)
+        else:
+            return response
+
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+
+        # Mismo criterio que GZipMiddleware: el ETag fuerte deja de
+        # describir los bytes enviados
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        return response
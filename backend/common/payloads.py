@@ -0,0 +1,135 @@
+import gzip
+import hashlib
+from collections import namedtuple
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+from common.content import get_content_version
+from common.helpers import TTLCache
+from common.renderers import dumps
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+Payload = namedtuple('Payload', ['body', 'gzip', 'br', 'etag'])
+
+
+def accepted_encodings(request):
+    """
+    Codificaciones que acepta el cliente segun Accept-Encoding, sin las
+    marcadas con q=0.
+    """
+    accepted = set()
+    for item in request.headers.get('Accept-Encoding', '').split(','):
+        coding, _, params = item.strip().partition(';')
+        params = params.replace(' ', '')
+        try:
+            quality = float(params[2:]) if params.startswith('q=') else 1
+        except ValueError:
+            continue
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def etag_matches(request, etag):
+    """
+    Compara `etag` con la lista de If-None-Match usando comparacion debil
+    (sin el prefijo W/), como pide el RFC 9110 para ese header. '*'
+    coincide con cualquier ETag.
+    """
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+
+    tags = parse_etags(header)
+    if '*' in tags:
+        return True
+
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    return any((tag[2:] if tag.startswith('W/') else tag) == opaque for tag in tags)
+
+
+def build_payload(data):
+    """
+    Serializa `data` a JSON una sola vez y guarda tambien las versiones
+    comprimidas (gzip y, si esta instalado, brotli) y su ETag, para
+    responder sin volver a renderizar ni comprimir.
+
+    Se arma dentro del request que no encontro el payload en cache, por
+    eso usa los mismos niveles que CompressionMiddleware y no los maximos.
+    """
+    body = dumps(data)
+    etag = 'W/"%s"' % hashlib.sha1(body).hexdigest()
+    levels = settings.COMPRESSION
+    return Payload(
+        body=body,
+        gzip=gzip.compress(body, compresslevel=levels['GZIP_LEVEL'], mtime=0),
+        br=brotli.compress(body, quality=levels['BROTLI_QUALITY']) if brotli else None,
+        etag=etag,
+    )
+
+
+def payload_response(request, payload, status=200):
+    """
+    Responde un Payload ya renderizado: 304 si el cliente tiene el mismo
+    ETag, brotli o gzip si los acepta y el body plano en otro caso.
+    """
+    if etag_matches(request, payload.etag):
+        response = HttpResponseNotModified()
+        response['ETag'] = payload.etag
+        return response
+
+    encodings = accepted_encodings(request)
+    if payload.br is not None and 'br' in encodings:
+        response = HttpResponse(
+            payload.br, content_type='application/json', status=status)
+        response['Content-Encoding'] = 'br'
+    elif 'gzip' in encodings:
+        response = HttpResponse(
+            payload.gzip, content_type='application/json', status=status)
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(
+            payload.body, content_type='application/json', status=status)
+
+    response['ETag'] = payload.etag
+    response['Cache-Control'] = 'no-cache'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+class PayloadCache:
+    """
+    Payloads renderizados y comprimidos por clave, validos mientras no
+    cambie la version de contenido del scope.
+
+    `loader(*key)` devuelve los datos a serializar o None si no existen
+    (los None no se cachean).
+    """
+
+    def __init__(self, scope, loader):
+        self.scope = scope
+        self.loader = loader
+        self._cache = TTLCache(settings.PAYLOAD_CACHE['MAX_SIZE'])
+
+    def get(self, *key):
+        cache_key = (get_content_version(self.scope),) + key
+        payload = self._cache.get(cache_key)
+        if payload is not None:
+            return payload
+
+        data = self.loader(*key)
+        if data is None:
+            return None
+
+        payload = build_payload(data)
+        # Las entradas de versiones viejas salen por LRU o por TTL
+        self._cache.set(cache_key, payload, settings.PAYLOAD_CACHE['TTL'])
+        return payload
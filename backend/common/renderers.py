@@ -0,0 +1,90 @@
+"""
+Renderer y parser JSON de DRF sobre orjson.
+
+Respetan el contrato de los de DRF: JSON compacto, UTF-8 sin escapar,
+U+2028/U+2029 escapados y los tipos que orjson no conoce (datetime,
+Decimal, QuerySet, ...) convertidos con el mismo JSONEncoder de DRF. Si
+orjson no esta instalado, o el dato no se puede serializar con el (por
+ejemplo, enteros de mas de 64 bits), se usa el camino de la libreria
+estandar. A diferencia de DRF, NaN e Infinity salen como null en vez de
+fallar.
+"""
+
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    # Los datetime pasan por el encoder de DRF (formato 'Z' para UTC)
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+_encoder = JSONEncoder()
+
+
+def escape_line_separators(content):
+    # Igual que DRF: la salida tiene que ser un subconjunto valido de JS
+    if b'\xe2\x80' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+def dumps(data):
+    """
+    Serializa `data` a JSON compacto en bytes.
+
+    Args:
+    data: Estructura a serializar.
+
+    Returns:
+    bytes: El JSON en UTF-8.
+    """
+    if orjson is not None:
+        try:
+            return escape_line_separators(
+                orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS))
+        except orjson.JSONEncodeError:
+            pass
+
+    content = json.dumps(
+        data, cls=JSONEncoder, ensure_ascii=False, allow_nan=False, separators=(',', ':'))
+    return escape_line_separators(content.encode('utf-8'))
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        # Con indentacion (API navegable, `; indent=4`) no importa la
+        # velocidad: se usa el renderer original
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None \
+                or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -1,3 +1,23 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from common.versions import parse_version
+
+
+class ParseVersionTests(SimpleTestCase):
+    def test_padding(self):
+        self.assertEqual(parse_version('1.4'), (1, 4, 0, 0))
+        self.assertEqual(parse_version('1.2.3'), parse_version('1.2.3.0'))
+        self.assertFalse(parse_version('1.2.3') < parse_version('1.2.3.0'))
+        self.assertLess(parse_version('1.2.3'), parse_version('1.2.3.1'))
+
+    def test_prefixes_and_suffixes(self):
+        self.assertEqual(parse_version('v1.4.2'), (1, 4, 2, 0))
+        self.assertEqual(parse_version('1.4.2-beta'), (1, 4, 2, 0))
+        self.assertEqual(parse_version('1.4.2+7'), (1, 4, 2, 0))
+        self.assertEqual(parse_version('1.0.0 (45)'), (1, 0, 0, 0))
+
+    def test_invalid(self):
+        self.assertIsNone(parse_version(''))
+        self.assertIsNone(parse_version('   '))
+        self.assertIsNone(parse_version('abc'))
+        self.assertIsNone(parse_version('1.2.3.4.5'))
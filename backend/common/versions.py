@@ -0,0 +1,40 @@
+import functools
+
+
+# Componentes de una version: major.minor.patch.build
+VERSION_LENGTH = 4
+
+@functools.lru_cache(maxsize=256)
+def parse_version(raw):
+    """
+    Convierte un string de version ('1.4', 'v1.4.2', '1.4.2-beta',
+    '1.4.2 (45)') en una tupla comparable de 4 enteros, ej (1, 4, 0, 0).
+    Siempre se completa a 4 componentes, asi '1.2.3' y '1.2.3.0' son la
+    misma version.
+
+    El resultado se cachea por valor, asi todos los requests con el mismo
+    header comparten la misma tupla.
+
+    Returns:
+    tuple: La version parseada, o None si el string no es valido.
+    """
+    if not raw:
+        return None
+
+    parts = raw.split()
+    if not parts:
+        return None
+
+    # Lo que sigue al primer espacio es el numero de build, ej '1.0.0 (45)'
+    clean = parts[0].lstrip('vV').split('+', 1)[0].split('-', 1)[0]
+
+    try:
+        numbers = tuple(int(part) for part in clean.split('.'))
+    except ValueError:
+        return None
+
+    if len(numbers) > VERSION_LENGTH:
+        return None
+
+    return numbers + (0,) * (VERSION_LENGTH - len(numbers))
+
@@ -0,0 +1,72 @@
+"""
+Perfil de gunicorn para el contenedor de produccion.
+
+Uso (desde /app):
+    gunicorn -c config/gunicorn.py
+
+Cada valor se puede sobrescribir con las variables de entorno GUNICORN_*,
+asi el mismo archivo sirve para hosts chicos y grandes.
+"""
+
+import gc
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+_cpus = multiprocessing.cpu_count()
+
+# 'gthread' (por defecto) o 'uvicorn'. El worker de uvicorn sirve la app
+# ASGI y requiere instalar el paquete uvicorn en la imagen.
+_worker_model = os.getenv('GUNICORN_WORKER_MODEL', 'gthread')
+
+if _worker_model == 'uvicorn':
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+    threads = 1
+else:
+    wsgi_app = 'config.wsgi:application'
+    worker_class = 'gthread'
+    threads = _env_int('GUNICORN_THREADS', 4)
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = _env_int('GUNICORN_WORKERS', _cpus + 1)
+
+# Django se carga una sola vez en el master y los workers comparten esas
+# paginas de memoria via copy-on-write despues del fork.
+preload_app = True
+
+# Reciclar workers cada N requests acota el crecimiento de memoria. El
+# jitter evita que todos los workers se reinicien al mismo tiempo.
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+# nginx reutiliza conexiones por poco tiempo; unos segundos bastan.
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# Archivos de heartbeat en tmpfs en vez del overlay del contenedor.
+worker_tmp_dir = '/dev/shm'
+
+forwarded_allow_ips = '*'
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    # Todo lo creado durante el preload pasa a la generacion permanente, asi
+    # el GC de los workers no recorre (ni copia) esas paginas.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Las conexiones abiertas durante el preload no se deben compartir entre
+    # procesos; cada worker abre las suyas.
+    from django.db import connections
+    connections.close_all()
@@ -51,6 +51,10 @@ PROJECT_APPS = [
     'devices',
     'cards',
     'general',
+    'health',
+    'assets',
+    'benchmarks',
+    'sync',
 ]
 
 THIRD_PARTY_APPS = [
@@ -63,12 +67,22 @@ INSTALLED_APPS = DJANGO_APPS + PROJECT_APPS + THIRD_PARTY_APPS
 REST_FRAMEWORK = {
     'COERCE_DECIMAL_TO_STRING': False,
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'users.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'common.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'common.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'common.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -76,8 +90,88 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'common.middleware.AppVersionMiddleware',
+    'users.middleware.RequestIntrospectionMiddleware',
 ]
 
+# Cache compartida entre workers (ver common.cache). Por defecto es
+# local-memory (una por proceso); CACHE_BACKEND=redis|memcached|file activa
+# un backend compartido, ej: CACHE_URL=redis://redis:6379/1
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+}
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        # En 'file', un directorio en tmpfs (/dev/shm) se comparte entre los
+        # workers del contenedor sin servicios extra
+        'LOCATION': os.getenv('CACHE_URL', '/dev/shm/card_cache' if CACHE_BACKEND == 'file' else ''),
+        'KEY_PREFIX': 'cards',
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', 3600)),
+    }
+}
+
+CACHE_SINGLE_FLIGHT = {
+    # Segundos que dura el lock de quien recalcula una clave
+    'LOCK_TIMEOUT': 30,
+    # Segundos que los demas esperan el resultado antes de calcularlo igual
+    'WAIT': 5,
+    'POLL_INTERVAL': 0.05,
+}
+
+# Compresion de respuestas JSON (ver common.middleware.CompressionMiddleware)
+COMPRESSION = {
+    'MIN_SIZE': int(os.getenv('COMPRESSION_MIN_SIZE', 1024)),
+    'BROTLI_QUALITY': int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4)),
+    'GZIP_LEVEL': int(os.getenv('COMPRESSION_GZIP_LEVEL', 6)),
+}
+
+# Payloads renderizados y comprimidos por version de contenido (ver
+# common.payloads.PayloadCache)
+PAYLOAD_CACHE = {
+    'MAX_SIZE': int(os.getenv('PAYLOAD_CACHE_SIZE', 2048)),
+    'TTL': int(os.getenv('PAYLOAD_CACHE_TTL', 3600)),
+}
+
+# De donde sale el detalle de las basic cards: 'blob' (columnas JSON de
+# BasicCard, con todos los idiomas) o 'normalized' (una fila por idioma en
+# BasicCardText, ver cards.translations)
+CARD_CONTENT_STORAGE = os.getenv('CARD_CONTENT_STORAGE', 'blob')
+
+# Maximo de cards (de todos los tipos) por request de /cards/detail-batch
+CARD_BATCH_MAX_ITEMS = int(os.getenv('CARD_BATCH_MAX_ITEMS', 100))
+
+# Busqueda de cards (ver cards.search)
+CARD_SEARCH_MAX_RESULTS = int(os.getenv('CARD_SEARCH_MAX_RESULTS', 50))
+CARD_SEARCH_MAX_QUERY_LENGTH = 100
+
+# Cards relacionadas (ver cards.related): cuantas se guardan por card, score
+# minimo (coseno) y fraccion de cards a partir de la cual un termino se
+# descarta por comun
+RELATED_CARDS = {
+    'TOP_K': int(os.getenv('RELATED_CARDS_TOP_K', 10)),
+    'MIN_SCORE': 0.05,
+    'MAX_DF': 0.5,
+}
+
+# Sincronizacion incremental (ver sync.services): maximo de items por
+# respuesta de /sync/changes
+SYNC = {
+    'PAGE_SIZE': int(os.getenv('SYNC_PAGE_SIZE', 500)),
+}
+
+# Log muestreado de requests para depuracion (ver users.middleware)
+REQUEST_INTROSPECTION = {
+    'ENABLED': os.getenv('REQUEST_INTROSPECTION', 'False') == 'True',
+    'SAMPLE_RATE': float(os.getenv('REQUEST_INTROSPECTION_SAMPLE_RATE', 0.01)),
+    'HEADERS': ('App-Version', 'User-Agent', 'Content-Type', 'Content-Length'),
+}
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -105,14 +199,28 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'common.db',
         'HOST': os.getenv('DB_HOST'),
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASS'),
+        # Conexiones persistentes: segundos que una conexion se reutiliza
+        # entre requests (0 = cerrar al final de cada request).
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        # Verifica que la conexion persistente siga viva la primera vez que
+        # se usa en cada request (ver common.db).
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
     }
 }
 
+# 'pgbouncer' cuando DB_HOST apunta a un pooler en modo transaction.
+DB_POOLER = os.getenv('DB_POOLER', '')
+
+if DB_POOLER == 'pgbouncer':
+    # En modo transaction los cursores con nombre no sobreviven entre
+    # transacciones.
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
 AUTH_USER_MODEL = 'users.User'
 
 
@@ -156,8 +264,30 @@ STATIC_URL = 'static/'
 MEDIA_ROOT = '/media/'
 MEDIA_URL = 'media/'
 
+# Originales de las imagenes; los derivados se generan en MEDIA_ROOT con
+# `manage.py build_images` (ver assets.images)
+MEDIA_SOURCE_ROOT = os.getenv('MEDIA_SOURCE_ROOT', os.path.join(BASE_DIR, 'data/media_sources'))
+
 SITE_DOMAIN = os.getenv('SITE_DOMAIN')
 
+# Con nginx adelante, los archivos de /assets/ se entregan con
+# X-Accel-Redirect (ver assets.serving)
+MEDIA_ACCEL_REDIRECT = os.getenv('MEDIA_ACCEL_REDIRECT', 'False') == 'True'
+
+# Con MEDIA_SIGNED_AUDIO el detalle de las cards entrega voice_url firmada
+# hacia /assets/audio/ en vez de la URL publica de /media/. Las firmas
+# duran al menos MEDIA_SIGNATURE_TTL segundos, que no debe ser menor que
+# PAYLOAD_CACHE['TTL'] (ver assets.signing)
+MEDIA_SIGNED_AUDIO = os.getenv('MEDIA_SIGNED_AUDIO', 'False') == 'True'
+MEDIA_SIGNATURE_TTL = int(os.getenv('MEDIA_SIGNATURE_TTL', 3600))
+
+# Segundos que un proceso confia en la version de contenido que ya leyo
+# antes de volver a consultarla (ver common.content)
+CONTENT_VERSION_TTL = int(os.getenv('CONTENT_VERSION_TTL', 5))
+
+# Segundos entre cada vuelta de los checks de readiness (ver health.checks)
+HEALTH_CHECK_INTERVAL = int(os.getenv('HEALTH_CHECK_INTERVAL', 10))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
 
@@ -23,4 +23,7 @@ urlpatterns = [
     path('devices/', include('devices.urls', namespace='devices')),
     path('global-settings/', include('global_settings.urls', namespace='global_settings')),
     path('general/', include('general.urls', namespace='general')),
+    path('health/', include('health.urls', namespace='health')),
+    path('assets/', include('assets.urls', namespace='assets')),
+    path('sync/', include('sync.urls', namespace='sync')),
 ]
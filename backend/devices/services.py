@@ -1,9 +1,13 @@
+import uuid
+
 from devices.models import (
     Device, 
     Profile, 
     ScreenFlow,
 )
 
+from common.cache import get_or_compute, invalidate
+from common.content import bump_content_version
 from common.models import Status as StatusModel
 
 
@@ -17,6 +21,47 @@ def validate_device(device_id):
         return False
 
 
+def normalize_device_id(device_id):
+    """
+    Forma canonica del UUID ('a1b2...-...' en minusculas), asi el mismo
+    device escrito distinto usa una sola entrada de cache.
+
+    Returns:
+    str: El id normalizado, o None si no es un UUID valido.
+    """
+    try:
+        return str(uuid.UUID(str(device_id)))
+    except ValueError:
+        return None
+
+
+def is_device_active(device_id):
+    """
+    Igual que validate_device, pero cacheado entre workers. Los cambios de
+    un Device suben la version de 'devices' (ver devices.signals), asi
+    todos los workers dejan de usar sus entradas aunque el cache no sea
+    compartido (locmem).
+    """
+    device_id = normalize_device_id(device_id)
+    if device_id is None:
+        return False
+
+    return get_or_compute(
+        'devices', ('active', device_id), lambda: validate_device(device_id))
+
+
+def invalidate_device(device_id):
+    # Solo borra la entrada en este proceso (o en el cache compartido)
+    device_id = normalize_device_id(device_id)
+    if device_id is not None:
+        invalidate('devices', 'active', device_id)
+
+
+def invalidate_devices():
+    # Cambia las claves de todos los devices en todos los workers
+    bump_content_version('devices')
+
+
 def create_device():
     device = Device()
     device.save()
@@ -26,6 +71,8 @@ def create_device():
 
 def update_device(device_id, **kwargs):
     device = Device.objects.filter(id=device_id).update(**kwargs)
+    # update() no dispara post_save
+    invalidate_devices()
     return device
 
 
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from devices.models import Device
+from devices.services import invalidate_device, invalidate_devices
+
+
+@receiver([post_save, post_delete], sender=Device)
+def device_changed(sender, instance, created=False, **kwargs):
+    if created:
+        # Un device nuevo no puede estar cacheado como activo en otro worker
+        invalidate_device(instance.id)
+    else:
+        invalidate_devices()
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'global_settings'
+
+    def ready(self):
+        from global_settings import signals  # noqa
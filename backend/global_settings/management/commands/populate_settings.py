@@ -3,6 +3,8 @@ from django.conf import settings as djangoSettings
 from django.db import transaction
 from global_settings.models import GlobalSetting
 from common.helpers import console, read_JSON_file as read_JSON
+from assets.versioning import VersionedMediaURLs
+from sync.services import suspend_tracking, sync_changes
 import traceback
 
 
@@ -28,7 +30,12 @@ class Command(BaseCommand):
 
         try:
             self.work_dir = 'data/populate'
-            self.populate_settings()
+            self.media_urls = VersionedMediaURLs()
+            with suspend_tracking():
+                self.populate_settings()
+            self.media_urls.save()
+            changed = sync_changes(['setting'])['setting']
+            console.info(f'[x] Change log (setting): {changed} changed')
             console.info('Done')
 
         except Exception as e:
@@ -97,5 +104,4 @@ class Command(BaseCommand):
     #     console.info('[x] Deleted existing stickers')
 
     def create_url(self, chunk):
-        media = djangoSettings.SITE_DOMAIN + '/media'
-        return f"{media}/{chunk}" if chunk else None
+        return self.media_urls.url(chunk)
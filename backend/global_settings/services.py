@@ -1,20 +1,25 @@
 # services.py
 
+from collections import namedtuple
+
 from global_settings.models import (
     GlobalSetting,
 )
 
+from common.cache import get_or_compute
+from common.content import ContentMemo
+from common.versions import parse_version
 
-def check_language_exist(lang_code):
-    data = GlobalSetting.objects.get(type='languages_settings')
-    found = False
 
-    for lang in data.extras['languages']:
-        if lang['code'] == lang_code:
-            found = True
-            break
+VersionPolicy = namedtuple('VersionPolicy', ['current', 'minimum'])
 
-    return found
+
+def check_language_exist(lang_code):
+    # Desde el cache de settings, asi se puede usar en cada request
+    for lang in get_languages_info()['languages']:
+        if lang['code'] == lang_code:
+            return True
+    return False
 
 
 def get_cards_settings():
@@ -22,7 +27,7 @@ def get_cards_settings():
     return data
 
 
-def get_languages_info():
+def load_languages_info():
     data = GlobalSetting.objects.get(type='languages_settings')
     return {
         'language_version': data.extras['language_version'],
@@ -30,13 +35,41 @@ def get_languages_info():
     }
 
 
-def list_languages():
+def get_languages_info():
+    return get_or_compute('settings', ('languages_info',), load_languages_info)
+
+
+def load_languages():
     data = GlobalSetting.objects.get(type='languages_settings')
     languages = data.extras['languages']
     sorted_languages = sorted(languages, key=lambda x: x['name'])
     return sorted_languages
 
 
+def list_languages():
+    return get_or_compute('settings', ('languages',), load_languages)
+
+
 def get_mobile_app_info():
     data = GlobalSetting.objects.get(type='mobile_settings')
     return data.extras
+
+
+def load_version_policy():
+    data = GlobalSetting.objects.filter(type='mobile_settings').first()
+    extras = (data.extras if data else None) or {}
+    return VersionPolicy(
+        current=parse_version(extras.get('current_version')),
+        minimum=parse_version(extras.get('min_version')),
+    )
+
+
+_version_policy = ContentMemo('settings', load_version_policy)
+
+
+def get_version_policy():
+    """
+    Version actual y minima soportada de la app, en memoria del proceso.
+    Se recarga solo cuando cambia la version de contenido 'settings'.
+    """
+    return _version_policy.get()
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.content import bump_content_version
+from global_settings.models import GlobalSetting
+
+
+@receiver([post_save, post_delete], sender=GlobalSetting)
+def global_setting_changed(sender, **kwargs):
+    bump_content_version('settings')
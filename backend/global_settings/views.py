@@ -6,12 +6,12 @@ from rest_framework import status
 from rest_framework.decorators import (
     api_view, renderer_classes
 )
-from rest_framework.renderers import JSONRenderer
 
 from common.decorators import track_and_report
+from common.renderers import FastJSONRenderer
 
 from global_settings.services import (
-    get_mobile_app_info,
+    get_version_policy,
     get_languages_info,
     list_languages,
 )
@@ -20,25 +20,32 @@ logger = logging.getLogger('api_v1')
 
 
 @api_view(['GET'])
-@renderer_classes([JSONRenderer])
+@renderer_classes([FastJSONRenderer])
 @track_and_report
 def app_update_check_view(request):
-    logger.info(f'[{request.request_id}] fetching app info')
-    app_info = get_mobile_app_info()
+    policy = get_version_policy()
+    version = request.app_version
 
-    update_bool = app_info['current_version'] != request.app_version
+    if version is None:
+        # Version desconocida: se sugiere actualizar, pero no se fuerza
+        update_bool = policy.current is not None
+        force_bool = False
+    else:
+        update_bool = policy.current is not None and version < policy.current
+        force_bool = policy.minimum is not None and version < policy.minimum
 
     logger.info(f'[{request.request_id}] update_required: {update_bool}')
 
     data = {
         'update_required': update_bool,
+        'force_update': force_bool,
     }
 
     return Response(data, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
-@renderer_classes([JSONRenderer])
+@renderer_classes([FastJSONRenderer])
 @track_and_report
 def language_update_check_view(request):
     lang_version = request.GET.get('lang_version', None)
@@ -56,7 +63,7 @@ def language_update_check_view(request):
 
 
 @api_view(['GET'])
-@renderer_classes([JSONRenderer])
+@renderer_classes([FastJSONRenderer])
 @track_and_report
 def languages_list_view(request):
 
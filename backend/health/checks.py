@@ -0,0 +1,132 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger('api_v1')
+
+
+def check_database():
+    db = connections['default']
+    # El hilo del monitor no pasa por request_started, asi que aplica
+    # CONN_MAX_AGE a mano.
+    db.close_if_unusable_or_obsolete()
+    with db.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+def check_cache():
+    value = str(time.time())
+    cache.set('health:ping', value, 30)
+    if cache.get('health:ping') != value:
+        raise RuntimeError('Cache read does not match written value')
+
+
+def check_media():
+    if not os.path.isdir(settings.MEDIA_ROOT):
+        raise RuntimeError(f'{settings.MEDIA_ROOT} does not exist')
+    if not os.access(settings.MEDIA_ROOT, os.R_OK):
+        raise RuntimeError(f'{settings.MEDIA_ROOT} is not readable')
+
+
+CHECKS = {
+    'database': check_database,
+    'cache': check_cache,
+    'media': check_media,
+}
+
+
+class HealthMonitor:
+    """
+    Corre los checks de dependencias en un hilo de fondo cada `interval`
+    segundos y guarda el ultimo resultado, asi las sondas de readiness solo
+    leen memoria.
+
+    El hilo se inicia en el primer request de cada proceso (los hilos no
+    sobreviven al fork de gunicorn).
+    """
+
+    def __init__(self, checks, interval):
+        self.checks = checks
+        self.interval = interval
+        self.snapshot = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def run_checks(self):
+        results = {}
+        for name, check in self.checks.items():
+            start = time.perf_counter()
+            try:
+                check()
+                error = None
+            except Exception as e:
+                error = str(e)
+            results[name] = {
+                'ok': error is None,
+                'latency_ms': round((time.perf_counter() - start) * 1000, 3),
+            }
+            if error:
+                results[name]['error'] = error
+
+        snapshot = {
+            'status': 'ok' if all(r['ok'] for r in results.values()) else 'error',
+            'checked_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'checks': results,
+            'timestamp': time.monotonic(),
+        }
+
+        previous = self.snapshot
+        self.snapshot = snapshot
+
+        # Solo se loguean los cambios de estado, no cada sonda
+        if previous is None or previous['status'] != snapshot['status']:
+            failed = [n for n, r in results.items() if not r['ok']]
+            if failed:
+                logger.error(f'Health check failed: {failed} {results}')
+            elif previous is not None:
+                logger.info('Health check recovered')
+
+        return snapshot
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.snapshot = None
+            thread = threading.Thread(
+                target=self._loop, name='health-monitor', daemon=True)
+            thread.start()
+            self._pid = os.getpid()
+
+    def _loop(self):
+        while True:
+            try:
+                self.run_checks()
+            except Exception:
+                logger.exception('Health monitor iteration failed')
+            time.sleep(self.interval)
+
+    def get_snapshot(self):
+        self.ensure_started()
+        snapshot = self.snapshot
+        if snapshot is None:
+            # Primera sonda del proceso: el hilo aun no termina su primera
+            # vuelta, se corre una vez en linea.
+            with self._lock:
+                snapshot = self.snapshot or self.run_checks()
+        return snapshot
+
+    def is_stale(self, snapshot):
+        # Si el hilo se colgo, el resultado guardado deja de ser confiable
+        return time.monotonic() - snapshot['timestamp'] > self.interval * 3
+
+
+monitor = HealthMonitor(CHECKS, settings.HEALTH_CHECK_INTERVAL)
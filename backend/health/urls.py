@@ -0,0 +1,9 @@
+from django.urls import re_path
+from .views import liveness_view, readiness_view
+
+app_name = 'health'
+
+urlpatterns = [
+    re_path(r'^live\/?$', liveness_view, name='live'),
+    re_path(r'^ready\/?$', readiness_view, name='ready'),
+]
@@ -0,0 +1,21 @@
+from django.http import JsonResponse
+
+from health.checks import monitor
+
+
+def liveness_view(request):
+    # Sin I/O: solo confirma que el proceso responde
+    return JsonResponse({'status': 'ok'})
+
+
+def readiness_view(request):
+    snapshot = monitor.get_snapshot()
+    stale = monitor.is_stale(snapshot)
+    ready = snapshot['status'] == 'ok' and not stale
+
+    return JsonResponse({
+        'status': 'ok' if ready else 'error',
+        'stale': stale,
+        'checked_at': snapshot['checked_at'],
+        'checks': snapshot['checks'],
+    }, status=200 if ready else 503)
@@ -1,18 +1,26 @@
-from pydub import AudioSegment
-
-def combine_mp3(files):
-    # Crea un segmento de audio vacio
-    combined = AudioSegment.empty()
-    
-    # Itera sobre la lista de archivos MP3
-    for file in files:
-        # Carga el archivo MP3
-        audio = AudioSegment.from_mp3(file)
-        # Combina el audio actual con el acumulado
-        combined += audio
-    
-    # Exporta el resultado combinado a un nuevo archivo MP3
-    combined.export("combined_output.mp3", format="mp3")
+"""
+Prueba manual de armado de pistas. Usa el mismo codigo que
+`manage.py build_voice_tracks` (assets.audio): une los frames MP3 sin
+decodificar y solo si las partes no son compatibles decodifica con pydub.
+
+Uso: python combine.py [-o salida.mp3] a01.mp3 a02.mp3 ...
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from assets.audio import concat_decoded, concat_frames  # noqa: E402
+
+
+def combine_mp3(files, output):
+    result = concat_frames(files, output)
+    if result is None:
+        result = concat_decoded(files, output)
+    return result
+
 
 # Lista de archivos MP3 a combinar
 files = [
@@ -23,5 +31,11 @@ files = [
     'a05.mp3',
 ]
 
-# Llama a la función con la lista de archivos
-combine_mp3(files)
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('files', nargs='*', default=files)
+    parser.add_argument('-o', '--output', default='combined_output.mp3')
+    args = parser.parse_args()
+
+    result = combine_mp3(args.files, os.path.abspath(args.output))
+    print(f"{args.output}: {result['duration']}s")
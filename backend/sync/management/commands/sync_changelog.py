@@ -0,0 +1,29 @@
+import traceback
+
+from django.core.management.base import BaseCommand
+
+from common.helpers import console
+from sync.services import TRACKED_KINDS, sync_changes
+
+
+class Command(BaseCommand):
+    help = 'Compara el catalogo con el change log y registra lo que cambio'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', action='append', choices=list(TRACKED_KINDS),
+                            help='Solo este tipo de item (se puede repetir).')
+
+    def handle(self, *args, **options):
+        console.info('--------------------------------')
+        console.info('    SYNC CHANGELOG              ')
+        console.info('--------------------------------')
+
+        try:
+            result = sync_changes(options['kind'])
+            for kind, changed in result.items():
+                console.info(f'{kind}: {changed} changed')
+            console.info('Done')
+
+        except Exception as e:
+            traceback.print_exc()
+            console.error('Process Failed!')
@@ -0,0 +1,30 @@
+# Generated by Django 4.0.6 on 2026-10-19 13:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('code', models.CharField(max_length=50)),
+                ('deleted', models.BooleanField(default=False)),
+                ('digest', models.CharField(max_length=40)),
+                ('version', models.PositiveBigIntegerField(db_index=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='changelog',
+            constraint=models.UniqueConstraint(fields=('kind', 'code'), name='changelog_kind_code'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class ChangeLog(models.Model):
+    """
+    Ultimo cambio de cada item del catalogo. Hay una sola fila por
+    (kind, code): al volver a cambiar, la fila se actualiza con una version
+    nueva, asi la tabla no crece con el historial.
+    """
+    kind = models.CharField(max_length=20)
+    code = models.CharField(max_length=50)
+    deleted = models.BooleanField(default=False)
+    digest = models.CharField(max_length=40)
+    version = models.PositiveBigIntegerField(db_index=True)
+    updated = models.DateTimeField(auto_now=True)
+    objects = models.Manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'code'], name='changelog_kind_code'),
+        ]
@@ -0,0 +1,306 @@
+# services.py
+
+"""
+Change log del catalogo para la sincronizacion incremental de la app.
+
+Cada item (basic card, cluster card, categoria, sticker, setting) tiene una
+fila en ChangeLog con el hash de su contenido y la version de su ultimo
+cambio. Las versiones salen de un contador global (ContentVersion 'sync')
+que solo crece, asi un cliente guarda la ultima version que vio y pide
+`changes?since=<version>` para bajar solo lo que cambio desde entonces.
+
+Los cambios se registran desde los signals (un save suelto, ej. el admin)
+y desde los populate, que apagan el registro por signals mientras
+reescriben las tablas y al final comparan el resultado contra el log con
+`sync_changes`: un item que se borro y se volvio a crear igual no cuenta
+como cambio.
+"""
+
+import hashlib
+import json
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from cards.models import (
+    BasicCard,
+    Category,
+    ClusterCard,
+    Sticker,
+)
+from cards.services import format_basic_card, format_cluster_card
+
+from common.content import get_content_version
+from common.models import ContentVersion
+from common.models import Status as StatusModel
+
+from global_settings.models import GlobalSetting
+
+from sync.models import ChangeLog
+
+
+SYNC_SCOPE = 'sync'
+
+TrackedKind = namedtuple(
+    'TrackedKind',
+    ['model', 'key', 'fields', 'alive', 'group'],
+)
+
+# kind -> como se identifica, que campos cuentan como contenido, que filtro
+# lo hace visible para la app y en que grupo de la respuesta va
+TRACKED_KINDS = {
+    'basic_card': TrackedKind(
+        BasicCard, 'code',
+        ('phrase', 'meaning', 'image_url', 'cover_url', 'images', 'voice', 'examples',
+         'scenarios', 'explanations', 'vocabs', 'compare', 'visible'),
+        {'status': StatusModel.ACTIVE}, 'basic_cards'),
+    'cluster_card': TrackedKind(
+        ClusterCard, 'code',
+        ('title', 'image_url', 'cover_url', 'images', 'cluster'),
+        {'status': StatusModel.ACTIVE}, 'cluster_cards'),
+    'category': TrackedKind(
+        Category, 'code',
+        ('name', 'tab_height', 'cards', 'extras'),
+        {'status': StatusModel.ACTIVE}, 'categories'),
+    'sticker': TrackedKind(
+        Sticker, 'code',
+        ('image_url', 'cover_url'),
+        {'status': StatusModel.ACTIVE, 'visible': True}, 'stickers'),
+    'setting': TrackedKind(
+        GlobalSetting, 'type',
+        ('extras',),
+        {'status': StatusModel.ACTIVE}, 'settings'),
+}
+
+_state = threading.local()
+
+
+def kind_for_model(model):
+    for kind, tracked in TRACKED_KINDS.items():
+        if tracked.model is model:
+            return kind
+    return None
+
+
+def content_digest(values):
+    # Claves ordenadas: jsonb no conserva el orden de las claves
+    content = json.dumps(values, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def item_state(kind, instance):
+    """
+    (code, deleted, digest) de una instancia tal como la ve la app.
+    """
+    tracked = TRACKED_KINDS[kind]
+    alive = all(getattr(instance, field) == value for field, value in tracked.alive.items())
+    digest = content_digest({field: getattr(instance, field) for field in tracked.fields})
+    return getattr(instance, tracked.key), not alive, digest
+
+
+def allocate_versions(count):
+    """
+    Reserva `count` versiones consecutivas del contador 'sync' y devuelve
+    la primera. El lock sobre el contador dura hasta el commit, asi las
+    versiones se hacen visibles en orden.
+    """
+    counter, _ = ContentVersion.objects.select_for_update().get_or_create(
+        scope=SYNC_SCOPE, defaults={'version': 0})
+    first = counter.version + 1
+    counter.version += count
+    counter.save(update_fields=['version', 'updated'])
+    return first
+
+
+def record_changes(kind, states):
+    """
+    Registra los items de `states` cuyo estado cambio respecto al log.
+
+    Args:
+    kind (str): Clave de TRACKED_KINDS.
+    states (list): Tuplas (code, deleted, digest).
+
+    Returns:
+    int: Cantidad de items con una version nueva.
+    """
+    if not states:
+        return 0
+
+    with transaction.atomic():
+        existing = {
+            entry.code: entry for entry in ChangeLog.objects.filter(
+                kind=kind, code__in=[code for code, _, _ in states])
+        }
+
+        changed = []
+        for code, deleted, digest in states:
+            entry = existing.get(code)
+            if entry is None:
+                # Un item que nunca se publico no hace falta borrarlo
+                if not deleted:
+                    changed.append(ChangeLog(kind=kind, code=code, deleted=False, digest=digest))
+            elif entry.deleted != deleted or (not deleted and entry.digest != digest):
+                entry.deleted = deleted
+                entry.digest = '' if deleted else digest
+                changed.append(entry)
+
+        if not changed:
+            return 0
+
+        version = allocate_versions(len(changed))
+        now = timezone.now()
+        for offset, entry in enumerate(changed):
+            entry.version = version + offset
+            # bulk_update no aplica auto_now
+            entry.updated = now
+
+        ChangeLog.objects.bulk_create([entry for entry in changed if entry.pk is None])
+        ChangeLog.objects.bulk_update(
+            [entry for entry in changed if entry.pk is not None],
+            ['deleted', 'digest', 'version', 'updated'])
+
+    return len(changed)
+
+
+@contextmanager
+def suspend_tracking():
+    """
+    Apaga el registro por signals en este hilo. Lo usan los populate, que
+    borran y recrean tablas enteras y despues llaman a `sync_changes`.
+    """
+    previous = getattr(_state, 'suspended', False)
+    _state.suspended = True
+    try:
+        yield
+    finally:
+        _state.suspended = previous
+
+
+def track_instance(kind, instance, deleted=False):
+    if getattr(_state, 'suspended', False):
+        return
+
+    code, dead, digest = item_state(kind, instance)
+    record_changes(kind, [(code, deleted or dead, digest)])
+
+
+def snapshot(kind):
+    """
+    Estado actual de todos los items de un kind, en un solo query.
+    """
+    tracked = TRACKED_KINDS[kind]
+    filters = tuple(tracked.alive)
+    rows = tracked.model.objects.values(tracked.key, *filters, *tracked.fields)
+
+    states = {}
+    for row in rows:
+        alive = all(row[field] == value for field, value in tracked.alive.items())
+        code = row[tracked.key]
+        # Si hay codigos repetidos gana el que esta visible
+        if alive or code not in states:
+            states[code] = (code, not alive, content_digest(
+                {field: row[field] for field in tracked.fields}))
+    return states
+
+
+def sync_changes(kinds=None):
+    """
+    Compara las tablas con el log y registra lo que cambio, incluidos los
+    items que ya no existen.
+
+    Args:
+    kinds (list): Kinds a comparar (por defecto todos).
+
+    Returns:
+    dict: kind -> cantidad de items con una version nueva.
+    """
+    result = {}
+    for kind in kinds or TRACKED_KINDS:
+        states = snapshot(kind)
+        gone = ChangeLog.objects.filter(kind=kind, deleted=False).exclude(
+            code__in=list(states)).values_list('code', flat=True)
+        states.update({code: (code, True, '') for code in gone})
+        result[kind] = record_changes(kind, list(states.values()))
+    return result
+
+
+def format_item(kind, item, lang_code):
+    if kind == 'basic_card':
+        return dict(format_basic_card(item, lang_code), code=item.code)
+    if kind == 'cluster_card':
+        return dict(format_cluster_card(item, lang_code), code=item.code)
+    if kind == 'category':
+        return {
+            'code': item.code,
+            'name': item.name,
+            'tab_height': item.tab_height,
+            'cards': item.cards,
+            'extras': item.extras,
+        }
+    if kind == 'sticker':
+        return {
+            'id': item.id,
+            'code': item.code,
+            'image_url': item.image_url,
+            'cover_url': item.cover_url,
+        }
+    return {
+        'type': item.type,
+        'extras': item.extras,
+    }
+
+
+def get_changes(since, lang_code, limit=None):
+    """
+    Cambios posteriores a `since`, del mas viejo al mas nuevo.
+
+    Args:
+    since (int): Ultima version que tiene el cliente (0 = todo).
+    lang_code (str): Idioma de las cards.
+    limit (int): Maximo de items (tope SYNC['PAGE_SIZE']).
+
+    Returns:
+    dict: version (la que el cliente debe guardar), has_more, upserted y
+    deleted agrupados por tipo.
+    """
+    page_size = settings.SYNC['PAGE_SIZE']
+    limit = min(limit or page_size, page_size)
+
+    upserted = {tracked.group: [] for tracked in TRACKED_KINDS.values()}
+    deleted = {tracked.group: [] for tracked in TRACKED_KINDS.values()}
+    result = {'version': since, 'has_more': False, 'upserted': upserted, 'deleted': deleted}
+
+    # Sin cambios no hace falta ir al log (la version puede llegar con
+    # hasta CONTENT_VERSION_TTL de atraso, el cliente lo ve en el siguiente)
+    if since >= get_content_version(SYNC_SCOPE):
+        return result
+
+    entries = list(ChangeLog.objects.filter(version__gt=since).order_by('version')[:limit + 1])
+    if len(entries) > limit:
+        entries = entries[:limit]
+        result['has_more'] = True
+    if not entries:
+        return result
+    result['version'] = entries[-1].version
+
+    codes = {}
+    for entry in entries:
+        if entry.deleted:
+            deleted[TRACKED_KINDS[entry.kind].group].append(entry.code)
+        else:
+            codes.setdefault(entry.kind, []).append(entry.code)
+
+    # Un query por kind con cambios
+    for kind, kind_codes in codes.items():
+        tracked = TRACKED_KINDS[kind]
+        items = tracked.model.objects.filter(
+            **{f'{tracked.key}__in': kind_codes}, **tracked.alive)
+        by_code = {getattr(item, tracked.key): item for item in items}
+        upserted[tracked.group].extend(
+            format_item(kind, by_code[code], lang_code) for code in kind_codes if code in by_code)
+
+    return result
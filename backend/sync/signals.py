@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from cards.models import BasicCard, Category, ClusterCard, Sticker
+from global_settings.models import GlobalSetting
+from sync.services import kind_for_model, track_instance
+
+
+@receiver(post_save, sender=BasicCard)
+@receiver(post_save, sender=ClusterCard)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Sticker)
+@receiver(post_save, sender=GlobalSetting)
+def item_saved(sender, instance, **kwargs):
+    track_instance(kind_for_model(sender), instance)
+
+
+@receiver(post_delete, sender=BasicCard)
+@receiver(post_delete, sender=ClusterCard)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Sticker)
+@receiver(post_delete, sender=GlobalSetting)
+def item_deleted(sender, instance, **kwargs):
+    track_instance(kind_for_model(sender), instance, deleted=True)
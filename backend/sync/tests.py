@@ -0,0 +1,113 @@
+from django.test import TestCase, override_settings
+
+from cards.models import BasicCard
+from common.models import Status as StatusModel
+from sync.models import ChangeLog
+from sync.services import get_changes, suspend_tracking, sync_changes
+
+
+def create_basic_card(code, phrase='hello'):
+    return BasicCard.objects.create(
+        code=code,
+        phrase=[{'code': 'en', 'text': phrase}],
+        meaning=[{'code': 'en', 'text': phrase}],
+        image_url=f'/media/{code}.webp',
+        cover_url=f'/media/{code}_cover.webp',
+        visible=True,
+    )
+
+
+def upserted_codes(changes):
+    return [item['code'] for item in changes['upserted']['basic_cards']]
+
+
+# Sin TTL, get_changes relee la version de 'sync' en cada llamada
+@override_settings(CONTENT_VERSION_TTL=0)
+class ChangesTests(TestCase):
+    def setUp(self):
+        for code in ('c1', 'c2', 'c3'):
+            create_basic_card(code)
+        self.version = get_changes(0, 'es')['version']
+
+    def test_initial_changes(self):
+        changes = get_changes(0, 'es')
+        self.assertEqual(upserted_codes(changes), ['c1', 'c2', 'c3'])
+        self.assertEqual(changes['version'], self.version)
+        self.assertFalse(changes['has_more'])
+
+    def test_repopulate_without_changes(self):
+        # Igual que un populate: se borra y se recrea la tabla sin signals
+        with suspend_tracking():
+            BasicCard.objects.all().delete()
+            for code in ('c1', 'c2', 'c3'):
+                create_basic_card(code)
+
+        self.assertEqual(sync_changes(['basic_card']), {'basic_card': 0})
+
+        changes = get_changes(self.version, 'es')
+        self.assertEqual(changes['version'], self.version)
+        self.assertEqual(upserted_codes(changes), [])
+        self.assertEqual(changes['deleted']['basic_cards'], [])
+
+    def test_repopulate_with_one_change(self):
+        with suspend_tracking():
+            BasicCard.objects.all().delete()
+            create_basic_card('c1')
+            create_basic_card('c2', phrase='changed')
+            create_basic_card('c3')
+
+        self.assertEqual(sync_changes(['basic_card']), {'basic_card': 1})
+        self.assertEqual(upserted_codes(get_changes(self.version, 'es')), ['c2'])
+
+    def test_delete_then_recreate(self):
+        BasicCard.objects.get(code='c2').delete()
+
+        changes = get_changes(self.version, 'es')
+        self.assertEqual(changes['deleted']['basic_cards'], ['c2'])
+        self.assertEqual(upserted_codes(changes), [])
+        deleted_version = changes['version']
+        self.assertGreater(deleted_version, self.version)
+
+        create_basic_card('c2')
+
+        changes = get_changes(deleted_version, 'es')
+        self.assertEqual(upserted_codes(changes), ['c2'])
+        self.assertEqual(changes['deleted']['basic_cards'], [])
+        self.assertGreater(changes['version'], deleted_version)
+
+        # Una sola fila por item, con la ultima version
+        entry = ChangeLog.objects.get(kind='basic_card', code='c2')
+        self.assertFalse(entry.deleted)
+        self.assertEqual(entry.version, changes['version'])
+
+    def test_status_flip_to_inactive(self):
+        card = BasicCard.objects.get(code='c1')
+        card.status = StatusModel.DELETED
+        card.save()
+
+        changes = get_changes(self.version, 'es')
+        self.assertEqual(changes['deleted']['basic_cards'], ['c1'])
+        self.assertEqual(upserted_codes(changes), [])
+
+        # Guardarla de nuevo inactiva no es un cambio
+        card.save()
+        self.assertEqual(get_changes(changes['version'], 'es')['version'], changes['version'])
+
+        card.status = StatusModel.ACTIVE
+        card.save()
+        self.assertEqual(upserted_codes(get_changes(changes['version'], 'es')), ['c1'])
+
+    def test_page_boundary_at_limit(self):
+        changes = get_changes(0, 'es', limit=3)
+        self.assertEqual(upserted_codes(changes), ['c1', 'c2', 'c3'])
+        self.assertFalse(changes['has_more'])
+        self.assertEqual(changes['version'], self.version)
+
+        changes = get_changes(0, 'es', limit=2)
+        self.assertEqual(upserted_codes(changes), ['c1', 'c2'])
+        self.assertTrue(changes['has_more'])
+
+        changes = get_changes(changes['version'], 'es', limit=2)
+        self.assertEqual(upserted_codes(changes), ['c3'])
+        self.assertFalse(changes['has_more'])
+        self.assertEqual(changes['version'], self.version)
@@ -0,0 +1,9 @@
+from django.urls import re_path
+
+from .views import *
+
+app_name = 'sync'
+
+urlpatterns = [
+    re_path(r'^changes\/?$', changes_view),
+]
@@ -0,0 +1,32 @@
+# Python
+import logging
+
+# Framework
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.decorators import api_view
+
+# Custom
+from common.decorators import track_and_report
+
+# Services
+from sync.services import get_changes
+
+logger = logging.getLogger('api_v1')
+
+
+@api_view(['GET'])
+@track_and_report
+def changes_view(request):
+    lang_code = request.GET.get('lang', None)
+
+    try:
+        since = int(request.GET.get('since', 0))
+        limit = int(request.GET.get('limit', 0))
+    except ValueError:
+        return Response({}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not lang_code or since < 0 or limit < 0:
+        return Response({}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(get_changes(since, lang_code, limit), status=status.HTTP_200_OK)
@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from common.helpers import TTLCache
+
+
+_token_cache = TTLCache(maxsize=settings.JWT_USER_CACHE_SIZE)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que recuerda, por token, el usuario ya validado.
+
+    Los requests repetidos con el mismo token no vuelven a decodificar el
+    JWT ni a consultar users.User. La entrada vive JWT_USER_CACHE_TTL
+    segundos como maximo y nunca mas alla de la expiracion del token.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        cached = _token_cache.get(raw_token)
+        if cached is not None:
+            return cached
+
+        validated_token = self.get_validated_token(raw_token)
+        result = (self.get_user(validated_token), validated_token)
+
+        ttl = min(
+            settings.JWT_USER_CACHE_TTL,
+            validated_token.get('exp', 0) - time.time(),
+        )
+        if ttl > 0:
+            _token_cache.set(raw_token, result, ttl)
+
+        return result
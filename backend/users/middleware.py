@@ -1,37 +1,59 @@
-# from django.conf import settings
 import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from users.authentication import CachedJWTAuthentication
+
 log = logging.getLogger('api_v1')
-from users.models import User
 
-class CustomMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
 
-    def __call__(self, request):
-        print('HEADERSSSSS')
-        log.debug('LLEGOOOOooooo!!! <-------')
-        print(request.headers)
-        log.debug('LLEGOOOOooooo!!! <-------')
+class RequestIntrospectionMiddleware:
+    """
+    Loguea headers, usuario y tiempo de respuesta de una muestra de los
+    requests, para depurar la app sin tocar el codigo.
 
+    Desactivado por defecto (REQUEST_INTROSPECTION['ENABLED']); en ese caso
+    Django lo saca de la cadena y no agrega costo a ningun request.
+    """
 
-        print('USSERRRR')
-        print(request.user)
+    def __init__(self, get_response):
+        config = settings.REQUEST_INTROSPECTION
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed()
 
-        print(request.user.is_authenticated)
+        self.get_response = get_response
+        self.sample_rate = config['SAMPLE_RATE']
+        self.headers = config['HEADERS']
+        self.authenticator = CachedJWTAuthentication()
 
-        
-        if request.user.is_authenticated:
-            print('emaillllll')
-            print(request.user.email)
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
 
-        # user = User.objects.get(id=2)
-        print("custom middleware before next middleware/view !!!!!")
-        # Code to be executed for each request before
-        # the view (and later middleware) are called.
+        start = time.perf_counter()
         response = self.get_response(request)
-
-	    # Code to be executed for each response after the view is called
-        # 
-        print("custom middleware after response or previous middleware")
-        
-        return response
\ No newline at end of file
+        elapsed = (time.perf_counter() - start) * 1000
+
+        headers = {name: request.headers.get(name) for name in self.headers}
+        headers['Authorization'] = 'present' if 'Authorization' in request.headers else None
+
+        log.debug(
+            f'[introspection] {request.method} {request.path} '
+            f'status={response.status_code} time={elapsed:.1f}ms '
+            f'user={self.resolve_user(request)} headers={headers}')
+
+        return response
+
+    def resolve_user(self, request):
+        # Solo para los requests muestreados; usa la misma cache por token
+        # que la autenticacion de DRF.
+        try:
+            result = self.authenticator.authenticate(request)
+        except Exception as e:
+            return f'invalid token ({e.__class__.__name__})'
+        if result is None:
+            return None
+        return result[0].pk
@@ -0,0 +1,13 @@
+#!/bin/bash
+
+# Corre la prueba de carga dentro del contenedor contra el servidor local.
+# Los argumentos se pasan tal cual al script, ej:
+#   ./bin/load-test.sh --concurrency 16 --output /app/logs/gunicorn.json
+
+CONTAINER_NAME=card_django
+
+source ./bin/commands.sh
+
+CMD_PREFIX=$(detectar_os)
+
+${CMD_PREFIX} docker exec -it $CONTAINER_NAME python -m benchmarks.load_test "$@"
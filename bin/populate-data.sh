@@ -14,9 +14,14 @@ fi
 COMMANDS=(
     "python manage.py makemigrations"
     "python manage.py migrate"
+    "python manage.py build_images"
+    "python manage.py build_voice_tracks"
+    "python manage.py index_audio"
     "python manage.py populate_cards $FORCE_FLAG"
     "python manage.py populate_stickers $FORCE_FLAG"
     "python manage.py populate_settings $FORCE_FLAG"
+    "python manage.py build_bundles"
+    "python manage.py build_related_cards --download"
 )
 
 # Detectar el sistema operativo y preparar el prefijo del comando
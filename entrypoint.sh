@@ -1,8 +1,12 @@
 #!/bin/sh
 
-python manage.py runserver 0.0.0.0:8000
+# APP_SERVER=runserver mantiene el servidor de desarrollo con autoreload,
+# cualquier otro valor levanta el perfil de produccion de gunicorn.
+if [ "$APP_SERVER" = "runserver" ]; then
+    exec python manage.py runserver 0.0.0.0:8000
+fi
+
 # python manage.py migrate --no-input
 # python manage.py collectstatic --no-input
 
-# gunicorn eng_django.wsgi:application --bind 0.0.0.0:8000
-# gunicorn eng_django.wsgi:application --bind 0.0.0.0:8000 --reload
\ No newline at end of file
+exec gunicorn -c config/gunicorn.py